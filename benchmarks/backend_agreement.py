@@ -0,0 +1,50 @@
+# benchmarks/backend_agreement.py
+# 컴파일된 RHS 백엔드의 수치 검증: 작은 체인에서 cython, mass_matrix + cython, lambdify 우변이
+# 'rhs' 형식의 lambdify 결과와 일치하는지 확인한다 (일치하지 않으면 종료 코드 1).
+# 사용법 (저장소 루트에서): python -m benchmarks.backend_agreement --bodies 1 2 3
+import argparse
+import sys
+import tempfile
+import numpy as np
+
+from dynamics.codegen import compile_cython_rhs
+from dynamics.equations import chain_topology, derive_equations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the compiled RHS backends agree with lambdify.")
+    parser.add_argument('--bodies', type=int, nargs='+', default=[1, 2, 3])
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--rtol', type=float, default=1e-8)
+    parser.add_argument('--atol', type=float, default=1e-10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    failed = False
+    print(f"{'bodies':>6} {'variant':>20} {'max abs error':>14}")
+    with tempfile.TemporaryDirectory() as build_dir:
+        for num_bodies in args.bodies:
+            forms = {form: derive_equations(chain_topology(num_bodies, form)) for form in ('rhs', 'mass_matrix')}
+            for form, eom in forms.items():
+                # 공용 캐시를 거치지 않고 직접 컴파일한다 (Cython이 없으면 대체 경로 없이 실패)
+                eom.compiled_modules['cython'] = compile_cython_rhs(eom, f'{build_dir}/{form}_{num_bodies}')
+            # 두 형식의 파라미터 순서는 같다 (m, izz, l, T, g)
+            parameters = rng.uniform(0.5, 2.0, len(forms['rhs'].parameters))
+            reference = forms['rhs'].rhs_evaluator(parameters, 'lambdify')
+            variants = {'rhs + cython': forms['rhs'].rhs_evaluator(parameters, 'cython'),
+                        'mass_matrix + lambdify': forms['mass_matrix'].rhs_evaluator(parameters, 'lambdify'),
+                        'mass_matrix + cython': forms['mass_matrix'].rhs_evaluator(parameters, 'cython')}
+            states = rng.uniform(-np.pi, np.pi, (args.samples, 2 * num_bodies))
+            expected = np.array([reference(y, 0.0) for y in states])
+            for name, evaluator in variants.items():
+                actual = np.array([np.array(evaluator(y, 0.0)) for y in states])
+                error = np.abs(actual - expected)
+                ok = np.all(error <= args.atol + args.rtol * np.abs(expected))
+                failed |= not ok
+                print(f"{num_bodies:>6} {name:>20} {error.max():>14.3e}{'' if ok else '  MISMATCH'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
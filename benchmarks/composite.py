@@ -0,0 +1,48 @@
+# benchmarks/composite.py
+# Fixed 조인트 축약의 효과: 같은 체인을 모두 Hinge로 둔 경우와 일부를 Fixed로 용접한 경우의
+# 자유도, 준비(유도) 시간, 적분 시간을 비교한다. 두 모델은 위상이 달라 캐시를 공유하지 않으므로
+# 새 임시 캐시 디렉터리 하나에서 각각 처음부터 유도된다.
+# 사용법 (저장소 루트에서): python -m benchmarks.composite --bodies 6 --welded 4
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.models import make_chain_model
+
+
+def run(model, engine, form):
+    from dynamics.simulation import Simulation
+
+    simulation = Simulation({'time_step': 0.01, 'duration': 2.0, 'engine': engine, 'eom_form': form}, model=model)
+    start = time.perf_counter()
+    simulation.solve()
+    elapsed = time.perf_counter() - start
+    return simulation.reduction.num_bodies, simulation.metrics.stage_time('equations'), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hinged and Fixed-welded chains.")
+    parser.add_argument('--bodies', type=int, default=6)
+    parser.add_argument('--welded', type=int, default=4, help="number of joints (after the first) made Fixed")
+    parser.add_argument('--engine', default='symbolic', choices=['symbolic', 'articulated'])
+    parser.add_argument('--form', default='mass_matrix', choices=['rhs', 'mass_matrix'])
+    args = parser.parse_args()
+    cache_dir = tempfile.TemporaryDirectory()
+    os.environ['MBD_EOM_CACHE_DIR'] = cache_dir.name
+
+    hinged = make_chain_model(args.bodies)
+    hinged.add_load(0, 1.0)
+    welded = make_chain_model(args.bodies)
+    welded.add_load(0, 1.0)
+    welded.joints['joint_type'][1:args.welded + 1] = 'Fixed'
+
+    print(f"{'model':>8} {'coordinates':>12} {'setup [s]':>10} {'total [s]':>10}")
+    for name, model in (('hinged', hinged), ('welded', welded)):
+        coordinates, setup, total = run(model, args.engine, args.form)
+        print(f"{name:>8} {coordinates:>12} {setup:>10.3f} {total:>10.3f}")
+    cache_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
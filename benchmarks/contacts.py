@@ -0,0 +1,72 @@
+# benchmarks/contacts.py
+# 링크 접촉의 넓은 단계: 균일 격자 후보 쌍과 모든 쌍 검사 비교, 바디 수에 따른 접촉 토크 평가 시간
+# --long-link로 첫 링크만 길게 하면 칸 크기가 한 링크에 끌려가지 않는지 (후보 수와 시간이 그대로인지) 볼 수 있다.
+# 사용법 (저장소 루트에서): python -m benchmarks.contacts --bodies 100 1000 10000 --long-link 100
+import argparse
+import time
+import numpy as np
+
+from benchmarks.models import make_chain_model
+from dynamics.composite import CompositeReduction
+from dynamics.contact import ContactModel
+
+
+def all_pairs(lower, upper):
+    # 기존 방식의 기준값: 모든 쌍의 경계 상자를 비교 (O(n^2) 메모리를 피하려고 행 단위)
+    count = 0
+    for i in range(len(lower) - 1):
+        overlap = (lower[i + 1:] <= upper[i]).all(axis=1) & (lower[i] <= upper[i + 1:]).all(axis=1)
+        count += int(overlap.sum())
+    return count
+
+
+def folded_state(num_bodies, rng):
+    # 바닥에 구겨진 체인처럼 무작위로 접힌 자세 (상대각이 크므로 서로 가까운 링크 쌍이 생긴다)
+    q = rng.uniform(-2.5, 2.5, num_bodies)
+    q[0] = -np.pi / 2
+    return np.concatenate((q, rng.normal(size=num_bodies)))
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the contact broad phase against all-pairs testing.")
+    parser.add_argument('--bodies', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--long-link', type=float, default=1.0, help="scale the first link length by this factor")
+    parser.add_argument('--all-pairs-limit', type=int, default=5000, help="skip the all-pairs baseline above this")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'bodies':>7} {'candidates':>10} {'loaded':>7} {'grid ms':>8} {'all-pairs ms':>13} {'torques ms':>11}")
+    for num_bodies in args.bodies:
+        model = make_chain_model(num_bodies)
+        model.bodies['length'][0] *= args.long_link
+        tree = model.tree()
+        contacts = ContactModel(tree.parents, model.bodies['length'], CompositeReduction.from_model(model, tree),
+                                floor_height=-5.0, self_collision=True)
+        y = folded_state(num_bodies, rng)
+        pivots, segments, _, _ = contacts.kinematics(y)
+        tips = pivots + segments
+        lower = np.minimum(pivots, tips) - contacts.radius
+        upper = np.maximum(pivots, tips) + contacts.radius
+
+        grid_time, (a, _) = timed(lambda: contacts.candidate_pairs(pivots, segments), args.repeat)
+        torque_time, _ = timed(lambda: contacts(y), args.repeat)
+        baseline = '-'
+        if num_bodies <= args.all_pairs_limit:
+            baseline_time, _ = timed(lambda: all_pairs(lower, upper), 1)
+            baseline = f'{baseline_time * 1e3:.2f}'
+        # loaded: 접촉 토크를 받는 축약 바디 수
+        loaded = np.count_nonzero(contacts(y))
+        print(f"{num_bodies:7d} {len(a):10d} {loaded:7d} {grid_time * 1e3:8.2f} {baseline:>13} "
+              f"{torque_time * 1e3:11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/ensemble_scaling.py
+# EnsembleRunner의 1..N 코어 확장성 측정
+# 사용법 (저장소 루트에서): python -m benchmarks.ensemble_scaling --variants 2000 --bodies 5
+import argparse
+import os
+import time
+import numpy as np
+
+from benchmarks.models import make_chain_model
+from dynamics.ensemble import EnsembleRunner
+from dynamics.simulation import Simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure EnsembleRunner scaling from 1 to N workers.")
+    parser.add_argument('--variants', type=int, default=2000)
+    parser.add_argument('--bodies', type=int, default=5)
+    parser.add_argument('--duration', type=float, default=2.0)
+    parser.add_argument('--engine', default='articulated', choices=['articulated', 'symbolic'])
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=64)
+    args = parser.parse_args()
+
+    settings = {'time_step': 0.01, 'duration': args.duration, 'engine': args.engine, 'eom_form': 'mass_matrix'}
+    simulation = Simulation(settings, model=make_chain_model(args.bodies))
+    rng = np.random.default_rng(0)
+    parameter_sets = {
+        'masses': rng.uniform(0.5, 2.0, (args.variants, args.bodies)),
+        'torques': rng.uniform(-1.0, 1.0, (args.variants, args.bodies)),
+    }
+
+    print(f"{'workers':>7} {'time [s]':>9} {'variants/s':>11} {'speedup':>8}")
+    baseline = None
+    worker_counts = sorted({min(2**k, args.max_workers) for k in range(args.max_workers.bit_length() + 1)})
+    for workers in worker_counts:
+        runner = EnsembleRunner(simulation, max_workers=workers, chunk_size=args.chunk_size)
+        start = time.perf_counter()
+        runner.run(parameter_sets)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>9.2f} {args.variants / elapsed:>11.1f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
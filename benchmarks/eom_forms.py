@@ -0,0 +1,55 @@
+# benchmarks/eom_forms.py
+# 'rhs' 형식과 'mass_matrix' 형식의 준비 시간과 스텝당 평가 속도를 비교한다.
+# 사용법 (저장소 루트에서): python -m benchmarks.eom_forms --max-bodies 5
+import argparse
+import time
+import numpy as np
+
+from dynamics.equations import EOM_FORMS, chain_topology, derive_equations
+
+
+def evaluation_rate(evaluator, num_states, min_time=0.5):
+    y = np.random.default_rng(0).uniform(-1.0, 1.0, num_states)
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(100):
+            evaluator(y, 0.0)
+        calls += 100
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare EOM forms for n-link chains.")
+    parser.add_argument('--max-bodies', type=int, default=4)
+    parser.add_argument('--forms', nargs='+', default=list(EOM_FORMS), choices=EOM_FORMS)
+    args = parser.parse_args()
+
+    print(f"{'bodies':>6} {'form':>12} {'setup [s]':>10} {'evals/s':>12}")
+    results = {}
+    for num_bodies in range(1, args.max_bodies + 1):
+        for form in args.forms:
+            start = time.perf_counter()
+            eom = derive_equations(chain_topology(num_bodies, form))
+            setup = time.perf_counter() - start
+            parameters = np.random.default_rng(1).uniform(0.5, 2.0, len(eom.parameters))
+            rate = evaluation_rate(eom.rhs_evaluator(parameters), 2 * num_bodies)
+            results[num_bodies, form] = (setup, rate)
+            print(f"{num_bodies:>6} {form:>12} {setup:>10.3f} {rate:>12.0f}")
+
+    # 'mass_matrix' 형식이 준비 시간과 평가 속도 모두에서 앞서기 시작하는 바디 수
+    if set(EOM_FORMS) <= set(args.forms):
+        for num_bodies in range(1, args.max_bodies + 1):
+            rhs_setup, rhs_rate = results[num_bodies, 'rhs']
+            mm_setup, mm_rate = results[num_bodies, 'mass_matrix']
+            if mm_setup < rhs_setup and mm_rate > rhs_rate:
+                print(f"crossover: mass_matrix is faster from {num_bodies} bodies")
+                break
+        else:
+            print("crossover: not reached")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/hit_testing.py
+# 작업 공간 클릭 판정: 공간 인덱스(SpatialGrid)와 기존 선형 탐색 비교
+# 사용법 (저장소 루트에서): python -m benchmarks.hit_testing --bodies 10000
+import argparse
+import os
+import time
+import numpy as np
+
+from benchmarks.models import make_chain_model
+
+
+def linear_pick(items, position, x, y, threshold):
+    # 이전 Workspace 구현과 같은 방식: 모든 항목과의 거리를 계산해 첫 번째로 가까운 항목
+    for item in items:
+        point = position(item)
+        if ((point.x() - x)**2 + (point.y() - y)**2)**0.5 < threshold:
+            return item
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare spatial-index picking with a linear scan.")
+    parser.add_argument('--bodies', type=int, default=10000)
+    parser.add_argument('--clicks', type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication
+    from visualization.workspace import Workspace
+
+    app = QApplication.instance() or QApplication([])
+    workspace = Workspace()
+    start = time.perf_counter()
+    workspace.load_model(make_chain_model(args.bodies, link_length=50.0))
+    print(f"load {args.bodies} bodies: {time.perf_counter() - start:.3f} s")
+
+    rng = np.random.default_rng(0)
+    clicks = np.column_stack((rng.uniform(0.0, 50.0 * args.bodies, args.clicks),
+                              rng.uniform(-8.0, 8.0, args.clicks))).tolist()
+    threshold = 10
+
+    start = time.perf_counter()
+    linear = [linear_pick(workspace.bodies, lambda item: item.body.center, x, y, threshold) for x, y in clicks]
+    linear_time = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [workspace.body_index.nearest(x, y, threshold) for x, y in clicks]
+    indexed_time = time.perf_counter() - start
+
+    hits = sum(item is not None for item in indexed)
+    agree = all((a is None) == (b is None) for a, b in zip(linear, indexed))
+    print(f"linear scan: {args.clicks / linear_time:10.0f} picks/s")
+    print(f"grid index:  {args.clicks / indexed_time:10.0f} picks/s ({hits} hits, same hit/miss: {agree})")
+
+
+if __name__ == '__main__':
+    main()
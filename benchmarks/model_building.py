@@ -0,0 +1,56 @@
+# benchmarks/model_building.py
+# 모델 구성 시간: 행 단위 add_body/add_joint/add_load (용량을 두 배씩 늘리는 분할 상환 추가)와
+# 배열을 한 번에 넣는 add_bodies/add_joints/add_loads를 비교한다. 행 단위 시간은 바디 수에 비례해야 한다.
+# 사용법 (저장소 루트에서): python -m benchmarks.model_building --bodies 1000 10000 100000
+import argparse
+import time
+import numpy as np
+
+from benchmarks.models import make_chain_model
+from dynamics.model import LOAD_DTYPE, Model
+
+
+def build_rowwise(num_bodies):
+    model = Model()
+    for i in range(num_bodies):
+        model.add_body((float(i), 0.0), (i + 1.0, 0.0), 1.0, 1.0 / 12)
+    model.add_joint(0, 0, (0.0, 0.0))
+    for i in range(1, num_bodies):
+        model.add_joint(i - 1, i, (float(i), 0.0))
+    for i in range(num_bodies):
+        model.add_load(i, 1.0)
+    return model
+
+
+def build_bulk(num_bodies):
+    chain = make_chain_model(num_bodies)
+    loads = np.zeros(num_bodies, LOAD_DTYPE)
+    loads['joint'] = np.arange(num_bodies)
+    loads['torque'] = 1.0
+    model = Model()
+    model.add_bodies(chain.bodies)
+    model.add_joints(chain.joints)
+    model.add_loads(loads)
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare row-by-row and bulk model construction.")
+    parser.add_argument('--bodies', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'bodies':>7} {'rowwise s':>10} {'us/body':>8} {'bulk s':>8} {'same':>5}")
+    for num_bodies in args.bodies:
+        start = time.perf_counter()
+        rowwise = build_rowwise(num_bodies)
+        rowwise_time = time.perf_counter() - start
+        start = time.perf_counter()
+        bulk = build_bulk(num_bodies)
+        bulk_time = time.perf_counter() - start
+        same = rowwise.content_hash() == bulk.content_hash()
+        print(f"{num_bodies:7d} {rowwise_time:10.3f} {rowwise_time / num_bodies * 1e6:8.2f} {bulk_time:8.4f} "
+              f"{'yes' if same else 'NO':>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/models.py
+# 벤치마크용 합성 n-링크 체인 (GUI 없이 모델만 생성)
+import numpy as np
+
+from dynamics.model import BODY_DTYPE, JOINT_DTYPE, Model
+
+
+def make_chain_model(num_bodies, link_length=1.0, mass=1.0):
+    # 행 단위 add_* 대신 배열을 한 번에 채워 수만 개 바디도 바로 만든다
+    x = np.arange(num_bodies + 1) * link_length
+    bodies = np.zeros(num_bodies, BODY_DTYPE)
+    bodies['x1'] = x[:-1]
+    bodies['x2'] = x[1:]
+    bodies['cx'] = (x[:-1] + x[1:]) / 2
+    bodies['mass'] = mass
+    # 가는 막대의 관성 m l^2 / 12
+    bodies['inertia'] = mass * link_length**2 / 12
+    bodies['length'] = link_length
+
+    # 첫 조인트는 지면과 첫 바디 사이의 고정점, 이후는 이웃한 바디 사이
+    joints = np.zeros(num_bodies, JOINT_DTYPE)
+    joints['body1'] = np.maximum(np.arange(num_bodies) - 1, 0)
+    joints['body2'] = np.arange(num_bodies)
+    joints['x'] = x[:-1]
+    joints['joint_type'] = 'Hinge'
+    return Model(bodies, joints)
+
+
+def make_chain(num_bodies, link_length=1.0, mass=1.0):
+    # 작업 공간과 같은 BodyItem/Joint 객체 (PySide6 필요)
+    bodies, joints, _ = make_chain_model(num_bodies, link_length, mass).to_items()
+    return bodies, joints
+
+
+def make_tree_model(depth, branching=2, link_length=1.0, mass=1.0):
+    # 완전 트리: 루트 하나(지면 조인트)에 각 바디가 branching개의 자식을 가진다. 바디 수는 sum(branching^k)
+    num_bodies = sum(branching**level for level in range(depth))
+    # 너비 우선 번호: 바디 i의 부모는 (i - 1) // branching
+    parents = (np.arange(num_bodies) - 1) // branching
+    parents[0] = -1
+    bodies = np.zeros(num_bodies, BODY_DTYPE)
+    bodies['x2'] = link_length
+    bodies['cx'] = link_length / 2
+    bodies['mass'] = mass
+    bodies['inertia'] = mass * link_length**2 / 12
+    bodies['length'] = link_length
+
+    joints = np.zeros(num_bodies, JOINT_DTYPE)
+    joints['body1'] = np.maximum(parents, 0)
+    joints['body2'] = np.arange(num_bodies)
+    joints['joint_type'] = 'Hinge'
+    return Model(bodies, joints)
@@ -0,0 +1,53 @@
+# benchmarks/playback.py
+# 결과 재생 성능: 프레임 솎아내기 + 벡터화 순기구학 준비 시간과 프레임 갱신 속도
+# 사용법 (저장소 루트에서): python -m benchmarks.playback --bodies 1000 --samples 1000000
+import argparse
+import os
+import time
+import numpy as np
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure playback preparation time and frame rate.")
+    parser.add_argument('--bodies', type=int, default=1000)
+    parser.add_argument('--samples', type=int, default=1000000)
+    parser.add_argument('--duration', type=float, default=100.0, help="simulated seconds")
+    parser.add_argument('--frames', type=int, default=600, help="frames to draw for the frame-rate test")
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication
+    from visualization.playback import ChainPlayback
+
+    # 합성 궤적은 메모리 맵으로 만들어 실제 결과 파일과 같은 조건에서 읽는다
+    path = os.path.join(os.environ.get('TMPDIR', '/tmp'), 'playback_benchmark.npy')
+    solution = np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=(args.samples, args.bodies))
+    t = np.linspace(0.0, args.duration, args.samples)
+    rows = 65536
+    for start in range(0, args.samples, rows):
+        phase = t[start:start + rows, np.newaxis]
+        solution[start:start + rows] = 0.3 * np.sin(phase + np.linspace(0.0, 3.0, args.bodies))
+    solution.flush()
+    lengths = np.full(args.bodies, 1.0 / args.bodies)
+
+    app = QApplication.instance() or QApplication([])
+    playback = ChainPlayback()
+    playback.resize(800, 600)
+    playback.show()
+    start = time.perf_counter()
+    playback.load(t, np.load(path, mmap_mode='r'), lengths)
+    print(f"load: {time.perf_counter() - start:.3f} s for {len(playback.times)} frames "
+          f"({args.samples} samples x {args.bodies} bodies)")
+
+    frames = min(args.frames, len(playback.times))
+    start = time.perf_counter()
+    for index in range(frames):
+        playback.show_frame(index)
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    print(f"draw: {frames / elapsed:.0f} frames/s (target 60)")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/scene_loading.py
+# 큰 모델의 장면 구성과 다시 그리기: 일괄 로드와 항목별 추가 비교, 축소 화면에서 상세 표시와 합친 경로(LOD) 비교
+# 사용법 (저장소 루트에서): python -m benchmarks.scene_loading --bodies 1000 10000
+import argparse
+import os
+import time
+
+from benchmarks.models import make_chain_model
+
+
+def itemwise_load(workspace, model):
+    # 이전 Workspace.load_model과 같은 방식: 인덱스와 화면 갱신을 켠 채 항목마다 펜을 새로 만들어 추가
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QPen, QBrush
+    workspace.scene.clear()
+    workspace.overview_item = None
+    workspace.bodies, workspace.joints, workspace.loads = model.to_items()
+    for body_item in workspace.bodies:
+        body = body_item.body
+        center = body.center
+        workspace.scene.addEllipse(center.x() - 3, center.y() - 3, 6, 6, QPen(Qt.blue), QBrush(Qt.blue))
+        body_item.graphics = workspace.scene.addLine(body.point1.x(), body.point1.y(),
+                                                     body.point2.x(), body.point2.y(), QPen(Qt.black))
+    for joint in workspace.joints:
+        joint.graphics = workspace.scene.addEllipse(joint.position.x() - 3, joint.position.y() - 3, 6, 6,
+                                                    QPen(Qt.darkGreen), QBrush(Qt.darkGreen))
+    # 인덱스가 실제로 만들어지도록 한 번 조회
+    workspace.scene.items(workspace.scene.itemsBoundingRect())
+
+
+def timed_repaint(workspace, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        workspace.viewport().grab()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bulk scene loading and level-of-detail repaint time.")
+    parser.add_argument('--bodies', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication
+    from visualization.workspace import Workspace
+
+    app = QApplication.instance() or QApplication([])
+    print(f"{'bodies':>7} {'itemwise s':>11} {'bulk s':>7} {'detail ms':>10} {'overview ms':>12}")
+    for num_bodies in args.bodies:
+        model = make_chain_model(num_bodies, link_length=50.0)
+        workspace = Workspace()
+        workspace.resize(1200, 800)
+        start = time.perf_counter()
+        itemwise_load(workspace, model)
+        itemwise_time = time.perf_counter() - start
+
+        workspace = Workspace()
+        workspace.resize(1200, 800)
+        start = time.perf_counter()
+        workspace.load_model(model)
+        bulk_time = time.perf_counter() - start
+
+        # 전체 모델이 보이도록 축소한 뒤, 같은 배율에서 상세 표시와 합친 경로를 각각 그린다
+        workspace.fitInView(workspace.scene.itemsBoundingRect())
+        workspace.update_level_of_detail()
+        overview_time = timed_repaint(workspace, args.repeat)
+        workspace.set_details_visible(True)
+        if workspace.overview_item is not None:
+            workspace.overview_item.setVisible(False)
+        detail_time = timed_repaint(workspace, args.repeat)
+        overview = f'{overview_time * 1e3:.1f}' if workspace.overview_mode else '-'
+        print(f"{num_bodies:7d} {itemwise_time:11.3f} {bulk_time:7.3f} {detail_time * 1e3:10.1f} {overview:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/signal_inputs.py
+# 시간에 따라 변하는 하중의 비용: 상수 하중과 표 신호(표본 수를 바꿔 가며), 식 신호를 준 같은 체인의
+# 우변 평가 시간과 전체 적분 시간을 비교한다. 표 신호의 구간 탐색 비용은 표본 수와 무관해야 한다.
+# 사용법 (저장소 루트에서): python -m benchmarks.signal_inputs --bodies 3 --samples 1000 1000000 10000000
+import argparse
+import time
+import numpy as np
+
+from benchmarks.eom_forms import evaluation_rate
+from benchmarks.models import make_chain_model
+from dynamics.signals import ExpressionSignal, TabulatedSignal
+
+
+def run(model, engine, duration):
+    from dynamics.eom_cache import get_equations
+    from dynamics.signals import InputRHS
+    from dynamics.simulation import Simulation
+
+    simulation = Simulation({'time_step': 0.01, 'duration': duration, 'engine': engine}, model=model)
+    start = time.perf_counter()
+    simulation.solve()
+    elapsed = time.perf_counter() - start
+    if engine == 'articulated':
+        rhs = simulation.articulated_chain().rhs
+    else:
+        eom = get_equations(simulation.topology())
+        rhs = eom.rhs_evaluator(simulation.parameter_values(eom))
+        if simulation.inputs is not None:
+            rhs = InputRHS(rhs, simulation.inputs, eom.torque_slice)
+    return evaluation_rate(rhs, 2 * model.num_bodies), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the overhead of time-varying torque inputs.")
+    parser.add_argument('--bodies', type=int, default=3)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--engine', default='symbolic', choices=['symbolic', 'articulated'])
+    parser.add_argument('--kind', default='linear', choices=['linear', 'cubic'])
+    parser.add_argument('--samples', type=int, nargs='+', default=[1000, 1000000])
+    args = parser.parse_args()
+
+    cases = [('constant', None)]
+    for samples in args.samples:
+        times = np.linspace(0.0, args.duration, samples)
+        cases.append((f'table {samples}', TabulatedSignal(times, np.sin(times), args.kind)))
+    cases.append(('expression', ExpressionSignal('sin(t) * exp(-0.1 * t)')))
+
+    # 임포트와 캐시 로드 시간이 첫 번째 결과에 섞이지 않도록 한 번 미리 실행
+    run(make_chain_model(args.bodies), args.engine, 0.1)
+    print(f"{'load':>16} {'evals/s':>12} {'total [s]':>10}")
+    for name, signal in cases:
+        model = make_chain_model(args.bodies)
+        model.add_load(0, 1.0, signal)
+        rate, total = run(model, args.engine, args.duration)
+        print(f"{name:>16} {rate:>12.0f} {total:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/startup.py
+# 시작 시간 예산 점검: 헤드리스 import, 창이 뜨기까지의 시간, 첫 시뮬레이션까지의 시간.
+# 각 항목은 새 인터프리터에서 -X importtime으로 실행해 느린 모듈 목록도 함께 보고한다.
+# 사용법 (저장소 루트에서): python -m benchmarks.startup --repeat 3
+# 예산을 넘으면 종료 코드 1 (CI나 야간 실행에서 회귀 감지용)
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    # dynamics 패키지만 불러온다 (SymPy/SciPy/matplotlib이 끌려오면 안 됨)
+    'headless_import': "import dynamics.simulation",
+    # main.py와 같은 순서로 창을 띄우고 첫 이벤트 처리까지
+    'time_to_window': (
+        "from PySide6.QtWidgets import QApplication\n"
+        "from gui.main_window import MainWindow\n"
+        "app = QApplication([])\n"
+        "window = MainWindow()\n"
+        "window.show()\n"
+        "app.processEvents()\n"
+    ),
+    # 작은 체인을 처음 실행할 때까지 (운동 방정식은 디스크 캐시에서 읽는다)
+    'time_to_first_run': (
+        "from benchmarks.models import make_chain_model\n"
+        "from dynamics.simulation import Simulation\n"
+        "Simulation({'time_step': 0.01, 'duration': 1.0}, model=make_chain_model(3)).solve()\n"
+    ),
+}
+DEFAULT_BUDGETS = {'headless_import': 0.5, 'time_to_window': 2.0, 'time_to_first_run': 5.0}
+
+
+def run_scenario(code):
+    # 인터프리터 기동을 포함한 벽시계 시간과 -X importtime 출력
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['MBD_PREWARM'] = '0'
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return elapsed, parse_importtime(result.stderr)
+
+
+def parse_importtime(output):
+    # "import time: self [us] | cumulative | package" 형식의 행만 사용
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure application startup time against a budget.")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per scenario (the fastest counts)")
+    parser.add_argument('--top', type=int, default=8, help="slowest top-level imports to list")
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    for name, budget in DEFAULT_BUDGETS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}-budget", type=float, default=budget,
+                            dest=f'{name}_budget', help=f"seconds (default {budget})")
+    args = parser.parse_args()
+
+    over_budget = []
+    for name in args.scenarios:
+        runs = [run_scenario(SCENARIOS[name]) for _ in range(args.repeat)]
+        elapsed, modules = min(runs, key=lambda run: run[0])
+        budget = getattr(args, f'{name}_budget')
+        status = 'ok' if elapsed <= budget else 'OVER BUDGET'
+        print(f"{name:>18}: {elapsed:6.3f} s (budget {budget:.2f} s) {status}")
+        # 최상위 import(들여쓰기 없는 이름)만 누적 시간 순으로
+        top_level = sorted((module for module in modules if not module[2].startswith('  ')), reverse=True)
+        for cumulative_us, _, module_name in top_level[:args.top]:
+            print(f"{'':>20}{cumulative_us / 1e6:7.3f} s  {module_name.strip()}")
+        if elapsed > budget:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
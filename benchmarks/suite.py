@@ -0,0 +1,200 @@
+# benchmarks/suite.py
+# 단계별 벤치마크: Kane 유도, 행렬 추출(km.rhs() 단순화), lambdify/코드 생성, 우변 평가 속도, 전체 적분.
+# 각 (바디 수, 형식) 경우는 새 프로세스에서 실행해 캐시와 최대 메모리(peak RSS)가 서로 섞이지 않는다.
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.suite --max-bodies 4 --output results.json
+#   python -m benchmarks.suite --baseline benchmarks/baseline.json      # 회귀가 있으면 종료 코드 1
+#   python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from dynamics.equations import EOM_FORMS
+
+# 지표 이름 -> 좋은 방향 ('lower'는 시간/메모리, 'higher'는 처리량)
+METRICS = {
+    'kane_s': 'lower',
+    'matrices_s': 'lower',
+    'lambdify_s': 'lower',
+    'codegen_s': 'lower',
+    'rhs_evals_per_s': 'higher',
+    'compiled_evals_per_s': 'higher',
+    'integrate_s': 'lower',
+    'peak_rss_mb': 'lower',
+}
+
+
+def peak_rss_mb():
+    # Linux의 ru_maxrss 단위는 KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(num_bodies, form, backends, duration):
+    # 현재 프로세스에서 한 경우를 측정해 지표 dict를 반환
+    from benchmarks.eom_forms import evaluation_rate
+    from benchmarks.models import make_chain_model
+    from dynamics.codegen import compile_cython_rhs, load_compiled_module, CompiledRHS, CompiledMassMatrixRHS
+    from dynamics.eom_cache import default_cache
+    from dynamics.equations import ChainEquations, chain_topology, equation_matrices, kane_method
+    from dynamics.simulation import Simulation
+    import numpy as np
+
+    # 모듈 임포트 시간은 단계 시간에서 제외
+    import scipy.integrate
+    import sympy.physics.mechanics
+
+    result = {'bodies': num_bodies, 'form': form}
+    topology = chain_topology(num_bodies, form)
+
+    start = time.perf_counter()
+    km, q, u, parameters = kane_method(topology)
+    result['kane_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrices = equation_matrices(km, form)
+    result['matrices_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    eom = ChainEquations(topology, q, u, parameters, matrices)
+    result['lambdify_s'] = time.perf_counter() - start
+
+    parameter_values = np.random.default_rng(1).uniform(0.5, 2.0, len(eom.parameters))
+    result['rhs_evals_per_s'] = evaluation_rate(eom.rhs_evaluator(parameter_values), 2 * num_bodies)
+
+    if 'cython' in backends:
+        with tempfile.TemporaryDirectory() as build_dir:
+            start = time.perf_counter()
+            func = load_compiled_module(compile_cython_rhs(eom, build_dir))
+            result['codegen_s'] = time.perf_counter() - start
+            evaluator_class = CompiledMassMatrixRHS if form == 'mass_matrix' else CompiledRHS
+            evaluator = evaluator_class(func, num_bodies, parameter_values)
+            result['compiled_evals_per_s'] = evaluation_rate(evaluator, 2 * num_bodies)
+
+    # 유도한 방정식을 캐시에 넣어 Simulation.solve()는 적분(과 준비)만 측정
+    default_cache().put(topology, eom)
+    model = make_chain_model(num_bodies)
+    model.add_load(0, 1.0)
+    simulation = Simulation({'time_step': 0.01, 'duration': duration, 'eom_form': form}, model=model)
+    start = time.perf_counter()
+    simulation.solve()
+    result['integrate_s'] = time.perf_counter() - start
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run_case_subprocess(num_bodies, form, backends, duration):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, MBD_EOM_CACHE_DIR=cache_dir)
+        command = [sys.executable, '-m', 'benchmarks.suite', '--run-case', str(num_bodies), form,
+                   '--backends', *backends, '--duration', str(duration)]
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{num_bodies} bodies / {form}: {completed.stderr.strip().splitlines()[-1]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def best_of(runs):
+    # 반복 실행 중 지표별 최선값 (시간/메모리는 최소, 처리량은 최대)
+    best = dict(runs[0])
+    for metric, direction in METRICS.items():
+        values = [run[metric] for run in runs if metric in run]
+        if values:
+            best[metric] = min(values) if direction == 'lower' else max(values)
+    return best
+
+
+def environment():
+    import numpy
+    import scipy
+    import sympy
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'numpy': numpy.__version__, 'scipy': scipy.__version__, 'sympy': sympy.__version__,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def compare(results, baseline, tolerance, min_time=0.05):
+    # 같은 (바디 수, 형식)의 지표를 비교해 허용 범위를 벗어난 회귀 목록을 반환.
+    # 두 실행 모두 min_time초보다 짧은 단계는 측정 잡음이 커서 비교하지 않는다.
+    reference = {(entry['bodies'], entry['form']): entry for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        base = reference.get((entry['bodies'], entry['form']))
+        if base is None:
+            continue
+        for metric, direction in METRICS.items():
+            if metric not in entry or metric not in base or base[metric] <= 0:
+                continue
+            if metric.endswith('_s') and max(entry[metric], base[metric]) < min_time:
+                continue
+            ratio = entry[metric] / base[metric]
+            worse = ratio > 1 + tolerance if direction == 'lower' else ratio < 1 / (1 + tolerance)
+            if worse:
+                regressions.append((entry['bodies'], entry['form'], metric, base[metric], entry[metric]))
+    return regressions
+
+
+def print_table(results):
+    columns = [metric for metric in METRICS if any(metric in entry for entry in results)]
+    print(f"{'bodies':>6} {'form':>12} " + ' '.join(f'{metric:>20}' for metric in columns))
+    for entry in results:
+        values = ' '.join(f"{entry[metric]:>20.4g}" if metric in entry else f"{'-':>20}" for metric in columns)
+        print(f"{entry['bodies']:>6} {entry['form']:>12} {values}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each stage of the EOM pipeline for n-link chains.")
+    parser.add_argument('--max-bodies', type=int, default=4)
+    parser.add_argument('--forms', nargs='+', default=list(EOM_FORMS), choices=EOM_FORMS)
+    parser.add_argument('--backends', nargs='+', default=['lambdify'], choices=['lambdify', 'cython'])
+    parser.add_argument('--duration', type=float, default=1.0, help="simulated seconds for the integration stage")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case; the best value of each metric counts")
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--baseline', help="compare against a stored results file")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument('--min-time', type=float, default=0.05, help="ignore stages faster than this [s]")
+    parser.add_argument('--save-baseline', help="write results as the new baseline")
+    parser.add_argument('--run-case', nargs=2, metavar=('BODIES', 'FORM'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        num_bodies, form = int(args.run_case[0]), args.run_case[1]
+        print(json.dumps(run_case(num_bodies, form, args.backends, args.duration)))
+        return
+
+    results = []
+    for num_bodies in range(1, args.max_bodies + 1):
+        for form in args.forms:
+            runs = [run_case_subprocess(num_bodies, form, args.backends, args.duration) for _ in range(args.repeat)]
+            results.append(best_of(runs))
+            print(f"measured {num_bodies} bodies / {form}", file=sys.stderr)
+    print_table(results)
+
+    report = {'environment': environment(),
+              'settings': {'backends': args.backends, 'duration': args.duration, 'repeat': args.repeat},
+              'results': results}
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_time)
+        for num_bodies, form, metric, before, after in regressions:
+            print(f"REGRESSION {num_bodies} bodies / {form}: {metric} {before:.4g} -> {after:.4g}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
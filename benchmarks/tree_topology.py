@@ -0,0 +1,64 @@
+# benchmarks/tree_topology.py
+# 가지가 있는 트리에서 희소 풀이의 효과를 측정한다.
+#   1) 'rhs' 형식: 조밀한 km.rhs()와 LTDL 분해의 유도 시간, 식 크기, 평가 속도 (작은 트리)
+#   2) 관절체 엔진: 바디 수가 같은 직렬 체인과 넓은 트리의 우변 평가 시간 (큰 트리)
+# 사용법 (저장소 루트에서): python -m benchmarks.tree_topology --branching 4 --dense
+import argparse
+import time
+import numpy as np
+
+from benchmarks.eom_forms import evaluation_rate
+from benchmarks.models import make_chain_model, make_tree_model
+from dynamics.articulated import ArticulatedChain
+from dynamics.equations import ChainEquations, equation_matrices, kane_method, tree_topology
+
+
+def symbolic_case(parents, dense):
+    topology = tree_topology(parents, 'rhs')
+    km, q, u, parameters = kane_method(topology)
+    solvers = {'ltdl': lambda: equation_matrices(km, 'rhs', parents)}
+    if dense:
+        solvers['dense'] = lambda: [km.rhs()]
+    values = np.random.default_rng(1).uniform(0.5, 2.0, len(parameters))
+    for name, solve in solvers.items():
+        start = time.perf_counter()
+        matrices = solve()
+        eom = ChainEquations(topology, q, u, parameters, matrices)
+        setup = time.perf_counter() - start
+        operations = sum(entry.count_ops() for entry in matrices[0])
+        rate = evaluation_rate(eom.rhs_evaluator(values), 2 * len(parents))
+        print(f"{len(parents):>6} {name:>6} {setup:>10.3f} {operations:>10} {rate:>12.0f}")
+
+
+def articulated_time(model, repeat=5):
+    bodies = model.bodies
+    chain = ArticulatedChain(bodies['mass'], bodies['inertia'], bodies['length'], parents=model.tree().parents)
+    y = np.random.default_rng(0).uniform(-1.0, 1.0, 2 * model.num_bodies)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chain.rhs(y, 0.0)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure sparse tree assembly against dense chains.")
+    parser.add_argument('--branching', type=int, default=4, help="children per body in the synthetic trees")
+    parser.add_argument('--max-depth', type=int, default=2, help="depth of the symbolic trees")
+    parser.add_argument('--large-depth', type=int, default=6, help="depth of the articulated-engine tree")
+    parser.add_argument('--dense', action='store_true', help="also derive with the dense km.rhs() (slow)")
+    args = parser.parse_args()
+
+    print(f"{'bodies':>6} {'solve':>6} {'setup [s]':>10} {'ops':>10} {'evals/s':>12}")
+    for depth in range(2, args.max_depth + 1):
+        symbolic_case(make_tree_model(depth, args.branching).tree().parents, args.dense)
+
+    tree = make_tree_model(args.large_depth, args.branching)
+    chain = make_chain_model(tree.num_bodies)
+    print(f"articulated RHS, {tree.num_bodies} bodies: tree {articulated_time(tree) * 1000:.1f} ms, "
+          f"chain {articulated_time(chain) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
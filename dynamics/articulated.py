@@ -0,0 +1,189 @@
+# dynamics/articulated.py
+import numpy as np
+from dynamics.topology import tree_order
+
+
+class ArticulatedChain:
+    # 평면 트리(직렬 체인 포함)를 위한 O(n) 관절체(articulated-body) 순동역학.
+    # Simulation의 Kane 모델과 같은 모델을 사용한다:
+    #   - 바디 i의 프레임은 부모 프레임에서 q_i만큼 회전 (u_i = dq_i/dt)
+    #   - 조인트 i는 바디 i의 시작점, 질량 중심과 자식 조인트는 바디 프레임의 (l_i, 0)
+    #   - parents[i]는 부모 바디 (-1은 원점에 고정된 지면), 생략하면 직렬 체인
+    #   - offsets[i]가 주어지면 조인트 i는 부모 프레임의 (offsets[i], 0) (복합 바디), 아니면 부모의 (l_parent, 0)
+    #   - 하중 T_i는 바디 i에 작용하는 순수 토크, 중력은 -g * y
+    #   - inputs(t)가 주어지면 (dynamics.signals.TorqueInputs) 매 우변 평가에서 T에 입력 토크를 더한다
+    #   - contacts(y)가 주어지면 (dynamics.contact.ContactModel, 단일 실행만) 접촉/조인트 제한 토크도 더한다
+    # 모든 양은 바디 좌표계(원점은 조인트)에서 평면 공간 벡터 (w, vx, vy)로 표현한다.
+    # 파라미터와 상태에 마지막 축을 두면((n, batch) 배열) 같은 재귀가 배치 전체에 대해 벡터화된다.
+    # 질량 행렬을 만들지 않으므로 가지가 많은 트리도 바디 수에 비례하는 비용만 든다.
+    def __init__(self, masses, inertias, lengths, torques=None, g=9.81, parents=None, offsets=None,
+                 inputs=None, contacts=None):
+        self.num_bodies = len(masses)
+        if self.num_bodies < 1:
+            raise ValueError("시스템에 바디가 정의되지 않았습니다.")
+        self.masses = np.asarray(masses, dtype=float)
+        self.inertias = np.asarray(inertias, dtype=float)
+        self.lengths = np.asarray(lengths, dtype=float)
+        self.torques = np.zeros_like(self.masses) if torques is None else np.asarray(torques, dtype=float)
+        self.g = g
+        self.inputs = inputs
+        self.contacts = contacts
+        self.base_torques = self.torques
+
+        # 부모 인덱스(-1은 지면)와 부모가 먼저 오는 순서, 부모 프레임에서의 조인트 위치, 바디 프레임에서의 질량 중심
+        if parents is None:
+            parents = range(-1, self.num_bodies - 1)
+        self.parents = [int(parent) for parent in parents]
+        if len(self.parents) != self.num_bodies:
+            raise ValueError("부모 배열의 길이가 바디 수와 다릅니다.")
+        self.order = tree_order(self.parents)
+        parent_index = np.array(self.parents)
+        has_parent = parent_index >= 0
+        if offsets is not None:
+            self.joint_x = np.asarray(offsets, dtype=float) * np.ones_like(self.lengths)
+        else:
+            self.joint_x = np.zeros_like(self.lengths)
+            self.joint_x[has_parent] = self.lengths[parent_index[has_parent]]
+        self.joint_y = np.zeros_like(self.lengths)
+        self.com_x = self.lengths.copy()
+        self.com_y = np.zeros_like(self.lengths)
+        self._update_constants()
+
+    def _update_constants(self):
+        # 조인트 원점 기준 바디 관성 (구성과 무관한 상수)
+        m = self.masses
+        self._inertia_oo = self.inertias + m * (self.com_x**2 + self.com_y**2)
+        self._m_cx = m * self.com_x
+        self._m_cy = m * self.com_y
+
+    def accelerations(self, q, u):
+        n = self.num_bodies
+        cos_q = _rows(np.cos(q))
+        sin_q = _rows(np.sin(q))
+        u = _rows(np.asarray(u, dtype=float))
+        parents = self.parents
+        ax = _rows(self.joint_x)
+        ay = _rows(self.joint_y)
+        masses = _rows(self.masses)
+        i_oo = _rows(self._inertia_oo)
+        m_cx = _rows(self._m_cx)
+        m_cy = _rows(self._m_cy)
+        torques = _rows(self.torques)
+
+        # Pass 1 (바깥 방향): 속도, 바이어스 가속도 c, 바이어스 힘 p
+        w = [0.0] * n
+        vx = [0.0] * n
+        vy = [0.0] * n
+        c1 = [0.0] * n
+        c2 = [0.0] * n
+        # 관절체 관성 IA (대칭 3x3: a00 a01 a02 a11 a12 a22)와 바이어스 힘 pA
+        a00 = i_oo[:]
+        a01 = [-x for x in m_cy]
+        a02 = m_cx[:]
+        a11 = masses[:]
+        a12 = [0.0] * n
+        a22 = masses[:]
+        p0 = [0.0] * n
+        p1 = [0.0] * n
+        p2 = [0.0] * n
+        order = self.order
+        for i in order:
+            parent = parents[i]
+            if parent < 0:
+                wp = vpx = vpy = 0.0
+            else:
+                wp, vpx, vpy = w[parent], vx[parent], vy[parent]
+            c, s, qd = cos_q[i], sin_q[i], u[i]
+            tx = vpx - wp * ay[i]
+            ty = vpy + wp * ax[i]
+            wi = wp + qd
+            vxi = c * tx + s * ty
+            vyi = -s * tx + c * ty
+            w[i], vx[i], vy[i] = wi, vxi, vyi
+            c1[i] = qd * vyi
+            c2[i] = -qd * vxi
+
+            # h = I v, p = v x* h - f_ext
+            hx = -m_cy[i] * wi + masses[i] * vxi
+            hy = m_cx[i] * wi + masses[i] * vyi
+            p0[i] = vxi * hy - vyi * hx - torques[i]
+            p1[i] = -wi * hy
+            p2[i] = wi * hx
+
+        # Pass 2 (안쪽 방향): 관절체 관성과 바이어스 힘을 부모로 누적
+        # (배치 행은 상수 배열의 뷰일 수 있으므로 제자리 연산 대신 새 값을 대입한다)
+        for i in reversed(order):
+            parent = parents[i]
+            if parent < 0:
+                continue
+            d = a00[i]
+            ui = -p0[i]
+            b11 = a11[i] - a01[i] * a01[i] / d
+            b12 = a12[i] - a01[i] * a02[i] / d
+            b22 = a22[i] - a02[i] * a02[i] / d
+            f0 = 0.0
+            f1 = p1[i] + b11 * c1[i] + b12 * c2[i] + a01[i] * ui / d
+            f2 = p2[i] + b12 * c1[i] + b22 * c2[i] + a02[i] * ui / d
+
+            # 부모 좌표계로 변환 (E: 부모 -> 자식 회전, k = (-ay, ax))
+            c, s = cos_q[i], sin_q[i]
+            cc, ss, cs = c * c, s * s, c * s
+            m11 = b11 * cc - 2.0 * b12 * cs + b22 * ss
+            m12 = (b11 - b22) * cs + b12 * (cc - ss)
+            m22 = b11 * ss + 2.0 * b12 * cs + b22 * cc
+            kx, ky = -ay[i], ax[i]
+            k1 = kx * m11 + ky * m12
+            k2 = kx * m12 + ky * m22
+            a00[parent] = a00[parent] + kx * k1 + ky * k2
+            a01[parent] = a01[parent] + k1
+            a02[parent] = a02[parent] + k2
+            a11[parent] = a11[parent] + m11
+            a12[parent] = a12[parent] + m12
+            a22[parent] = a22[parent] + m22
+
+            fx = c * f1 - s * f2
+            fy = s * f1 + c * f2
+            p0[parent] = p0[parent] + f0 + kx * fx + ky * fy
+            p1[parent] = p1[parent] + fx
+            p2[parent] = p2[parent] + fy
+
+        # Pass 3 (바깥 방향): 가속도 (중력은 지면의 가상 상향 가속도로 처리)
+        qdd = [0.0] * n
+        aw = [0.0] * n
+        alx = [0.0] * n
+        aly = [0.0] * n
+        for i in order:
+            parent = parents[i]
+            if parent < 0:
+                awp, apx, apy = 0.0, 0.0, self.g
+            else:
+                awp, apx, apy = aw[parent], alx[parent], aly[parent]
+            c, s = cos_q[i], sin_q[i]
+            tx = apx - awp * ay[i]
+            ty = apy + awp * ax[i]
+            bx = c * tx + s * ty + c1[i]
+            by = -s * tx + c * ty + c2[i]
+            qddi = (-p0[i] - (a00[i] * awp + a01[i] * bx + a02[i] * by)) / a00[i]
+            qdd[i] = qddi
+            aw[i] = awp + qddi
+            alx[i] = bx
+            aly[i] = by
+        return np.array(qdd)
+
+    def rhs(self, y, t):
+        n = self.num_bodies
+        if self.inputs is not None or self.contacts is not None:
+            torques = self.base_torques
+            if self.inputs is not None:
+                # 배치면 모든 변형에 같은 입력 토크
+                inputs = self.inputs(t)
+                torques = torques + inputs.reshape(inputs.shape + (1,) * (self.base_torques.ndim - 1))
+            if self.contacts is not None:
+                torques = torques + self.contacts(y)
+            self.torques = torques
+        return np.concatenate((y[n:], self.accelerations(y[:n], y[n:])))
+
+
+def _rows(values):
+    # 단일 실행은 파이썬 float 리스트(가장 빠른 스칼라 연산), 배치는 (batch,) 배열의 리스트
+    return values.tolist() if values.ndim == 1 else list(values)
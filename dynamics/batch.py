@@ -0,0 +1,119 @@
+# dynamics/batch.py
+# 저장된 모델 파일들을 Qt/matplotlib 없이 차례로 시뮬레이션하고 결과를 파일로 남기는 배치 명령.
+# 사용법 (저장소 루트에서):
+#   python -m dynamics.batch models/*.json models/big.npz --settings settings.json --output-dir results
+# 모델마다 <output-dir>/<모델 이름>.npy (또는 --format h5)와 요약 파일을 쓰고,
+# 전체 실행 결과는 <output-dir>/batch_summary.json에 기록한다.
+# --checkpoint-interval을 주면 결과 파일 옆에 <결과 파일>.checkpoint.npz를 주기적으로 쓰고,
+# --resume으로 다시 실행하면 중단된(또는 --duration을 늘린) 모델을 마지막 체크포인트부터 이어서 계산한다.
+# --report를 주면 모델마다 단계별 시간/적분기 카운터 (선형화 실행이면 고유 진동수도)를 출력한다.
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+
+from dynamics.model import load_model
+from dynamics.metrics import PROFILERS
+from dynamics.simulation import SOLVERS, Simulation
+
+DEFAULT_SETTINGS = {'time_step': 0.01, 'duration': 10.0}
+OVERRIDABLE_SETTINGS = ('time_step', 'duration', 'engine', 'eom_form', 'backend', 'solver', 'decimation', 'profile')
+
+
+def build_settings(args):
+    settings = dict(DEFAULT_SETTINGS)
+    if args.settings:
+        with open(args.settings, encoding='utf-8') as f:
+            settings.update(json.load(f))
+    for key in OVERRIDABLE_SETTINGS:
+        value = getattr(args, key)
+        if value is not None:
+            settings[key] = value
+    return settings
+
+
+def output_paths(model_paths, output_dir, extension):
+    paths = {}
+    for model_path in model_paths:
+        name = os.path.splitext(os.path.basename(model_path))[0]
+        paths[model_path] = os.path.join(output_dir, name + extension)
+    if len(set(paths.values())) != len(paths):
+        raise ValueError("이름이 같은 모델 파일이 있어 결과 파일이 겹칩니다.")
+    return paths
+
+
+def run_model(model_path, settings, output_path, checkpoint=False, report=False):
+    model = load_model(model_path)
+    settings = dict(settings, output_path=output_path)
+    if checkpoint:
+        settings['checkpoint_path'] = output_path + '.checkpoint.npz'
+    simulation = Simulation(settings, model=model)
+    start = time.perf_counter()
+    t, _ = simulation.solve()
+    if simulation.metrics.profile is not None:
+        print(simulation.metrics.profile_report())
+    if report:
+        print(simulation.metrics.report())
+        if simulation.linearization is not None:
+            frequencies = ', '.join(f'{f:.3f}' for f in simulation.modal_analysis()['frequencies'])
+            print(f"natural frequencies [Hz]: {frequencies or '-'}")
+    return {'model': model_path, 'output': output_path, 'bodies': model.num_bodies,
+            'samples': len(t), 'elapsed': time.perf_counter() - start,
+            'resumed_from': simulation.resumed_from, 'metrics': simulation.metrics.as_dict()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run simulations for saved model files without the GUI.")
+    parser.add_argument('models', nargs='+', help="model files (.json or .npz)")
+    parser.add_argument('--settings', help="JSON file with Simulation settings")
+    parser.add_argument('--output-dir', default='results')
+    parser.add_argument('--format', default='npy', choices=['npy', 'h5'])
+    parser.add_argument('--time-step', type=float)
+    parser.add_argument('--duration', type=float)
+    parser.add_argument('--engine', choices=['symbolic', 'articulated'])
+    parser.add_argument('--eom-form', choices=['rhs', 'mass_matrix'])
+    parser.add_argument('--backend', choices=['lambdify', 'cython'])
+    parser.add_argument('--solver', choices=SOLVERS)
+    parser.add_argument('--decimation', type=int)
+    parser.add_argument('--profile', choices=PROFILERS, help="profile each model run and print the report")
+    parser.add_argument('--report', action='store_true', help="print stage timings and solver counters of each run")
+    parser.add_argument('--checkpoint-interval', type=float,
+                        help="write a checkpoint next to each result every SECONDS of wall time")
+    parser.add_argument('--resume', action='store_true', help="continue each model from its last checkpoint")
+    parser.add_argument('--fail-fast', action='store_true', help="stop at the first failing model")
+    args = parser.parse_args(argv)
+
+    settings = build_settings(args)
+    if args.checkpoint_interval is not None:
+        settings['checkpoint_interval'] = args.checkpoint_interval
+    if args.resume:
+        settings['resume'] = True
+    checkpoint = args.checkpoint_interval is not None or args.resume
+    os.makedirs(args.output_dir, exist_ok=True)
+    paths = output_paths(args.models, args.output_dir, '.' + args.format)
+
+    results = []
+    for model_path in args.models:
+        try:
+            result = run_model(model_path, settings, paths[model_path], checkpoint, args.report)
+            print(f"{model_path}: {result['bodies']} bodies, {result['samples']} samples "
+                  f"in {result['elapsed']:.2f} s -> {result['output']}")
+        except Exception as e:
+            traceback.print_exc()
+            print(f"{model_path}: FAILED: {e}", file=sys.stderr)
+            result = {'model': model_path, 'error': str(e)}
+        results.append(result)
+        if args.fail_fast and 'error' in result:
+            break
+
+    with open(os.path.join(args.output_dir, 'batch_summary.json'), 'w', encoding='utf-8') as f:
+        json.dump({'settings': settings, 'results': results}, f, indent=2, ensure_ascii=False)
+    failures = sum('error' in result for result in results)
+    print(f"{len(results) - failures} succeeded, {failures} failed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# dynamics/checkpoint.py
+import json
+import os
+import time
+import numpy as np
+
+# 긴 시뮬레이션의 중간 상태. 적분은 구간(chunk)마다 직전 구간의 마지막 상태에서 다시 시작하므로
+# 구간 경계의 (샘플 번호, 상태)만 있으면 처음부터 다시 계산하지 않고 이어서 적분할 수 있다.
+# .npz 하나에 메타데이터(JSON 문자열)와 배열을 저장한다:
+#   model_hash, settings_hash: 같은 모델과 설정인지 확인 (duration은 제외하므로 더 길게 연장 가능)
+#   eom_key: 기호 엔진이 사용한 운동 방정식 캐시 키 (관절체 엔진은 None)
+#   samples: 기록이 끝난 샘플 수, state: 마지막 샘플의 (축약) 상태, stopped: 종료 이벤트로 끝났는지
+#   anchor, anchor_state: 마지막 구간 경계의 샘플 번호와 상태 (이어서 실행할 때 여기서 적분을 다시 시작한다)
+#   solver_stats, output: 결과 파일 설정, sink: TrajectorySink의 누적 통계
+#   trajectory: 결과 파일이 없는 실행에서 지금까지의 바디별 궤적
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def save_checkpoint(path, meta, arrays):
+    # 쓰는 도중 중단되어도 이전 체크포인트가 남도록 임시 파일에 쓴 뒤 교체한다
+    temporary = f'{path}.tmp.npz'
+    np.savez(temporary, meta=json.dumps(dict(meta, version=CHECKPOINT_FORMAT_VERSION)), **arrays)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path):
+    # (meta, arrays)를 반환
+    with np.load(path) as archive:
+        meta = json.loads(str(archive['meta']))
+        if meta.get('version', CHECKPOINT_FORMAT_VERSION) > CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f"{path}: 지원하지 않는 체크포인트 버전입니다 ({meta['version']}).")
+        arrays = {key: archive[key] for key in archive.files if key != 'meta'}
+    return meta, arrays
+
+
+class CheckpointTimer:
+    # 벽시계 기준으로 interval초마다 한 번 True
+    def __init__(self, interval, clock=None):
+        self.interval = interval
+        self.clock = clock or time.perf_counter
+        self.last = self.clock()
+
+    def due(self):
+        now = self.clock()
+        if now - self.last < self.interval:
+            return False
+        self.last = now
+        return True
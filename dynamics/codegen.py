@@ -0,0 +1,169 @@
+# dynamics/codegen.py
+import glob
+import importlib.machinery
+import importlib.util
+import os
+import numpy as np
+
+# 'lambdify'는 항상 사용 가능한 기본 경로, 'cython'은 pydy 코드 생성 + 로컬 컴파일러
+BACKENDS = ('lambdify', 'cython')
+
+
+def solve_mass_matrix(mass_matrix_full, forcing_full, num_coordinates, out=None):
+    # mass_matrix_full = [[I, 0], [0, M]], M은 대칭 양의 정부호 -> Cholesky 풀이
+    from scipy.linalg import cho_factor, cho_solve, LinAlgError
+
+    n = num_coordinates
+    if out is None:
+        out = np.empty(2 * n)
+    out[:n] = forcing_full[:n]
+    mass_matrix = mass_matrix_full[n:, n:]
+    forcing = forcing_full[n:]
+    try:
+        out[n:] = cho_solve(cho_factor(mass_matrix, check_finite=False), forcing, check_finite=False)
+    except LinAlgError:
+        # 특이 구성 등으로 양의 정부호가 아니면 일반 LU 풀이로 대체
+        out[n:] = np.linalg.solve(mass_matrix, forcing)
+    return out
+
+
+class LambdifyRHS:
+    # lambdify로 생성된 우변 함수를 odeint 형식 f(y, t)로 감싼다
+    def __init__(self, eom, parameters):
+        self.func = eom.funcs[0]
+        self.parameters = [float(p) for p in parameters]
+
+    def __call__(self, y, t):
+        return np.asarray(self.func(*y, *self.parameters), dtype=float).reshape(-1)
+
+
+class LambdifyMassMatrixRHS:
+    # 질량 행렬과 힘 벡터를 따로 평가한 뒤 선형 시스템을 수치적으로 푼다
+    def __init__(self, eom, parameters):
+        self.mass_matrix_func, self.forcing_func = eom.funcs
+        self.num_coordinates = eom.num_bodies
+        self.parameters = [float(p) for p in parameters]
+
+    def __call__(self, y, t):
+        mass_matrix = np.asarray(self.mass_matrix_func(*y, *self.parameters), dtype=float)
+        forcing = np.asarray(self.forcing_func(*y, *self.parameters), dtype=float).reshape(-1)
+        return solve_mass_matrix(mass_matrix, forcing, self.num_coordinates)
+
+
+class LambdifyJacobian:
+    # 기호적으로 유도한 상태 자코비안 dxdot/dx를 odeint(y, t) 형식으로 평가
+    def __init__(self, eom, parameters):
+        self.func = eom.jacobian_func
+        self.form = eom.form
+        self.num_coordinates = eom.num_bodies
+        self.parameters = [float(p) for p in parameters]
+        if self.form == 'mass_matrix':
+            self.mass_matrix_func, self.forcing_func = eom.funcs
+
+    def __call__(self, y, t):
+        if self.form == 'rhs':
+            return np.asarray(self.func(*y, *self.parameters), dtype=float)
+        from scipy.linalg import cho_factor, cho_solve
+
+        n = self.num_coordinates
+        mass_matrix_full = np.asarray(self.mass_matrix_func(*y, *self.parameters), dtype=float)
+        forcing_full = np.asarray(self.forcing_func(*y, *self.parameters), dtype=float).reshape(-1)
+        xdot = solve_mass_matrix(mass_matrix_full, forcing_full, n)
+        jacobian = -np.asarray(self.func(*y, *self.parameters, *xdot), dtype=float)
+        # 기구학 블록은 단위 질량 행렬이므로 그대로, 동역학 블록만 M으로 푼다
+        jacobian[n:] = cho_solve(cho_factor(mass_matrix_full[n:, n:], check_finite=False), jacobian[n:],
+                                 check_finite=False)
+        return jacobian
+
+
+class BatchLambdifyRHS:
+    # 상태 y는 (2n, batch), 파라미터는 (P, batch) 배열. 결과는 (2n, batch)
+    def __init__(self, eom, parameters):
+        self.funcs = eom.batch_funcs
+        self.form = eom.form
+        self.num_coordinates = eom.num_bodies
+        self.parameters = [np.asarray(p, dtype=float) for p in parameters]
+
+    def __call__(self, y, t):
+        n = self.num_coordinates
+        if self.form == 'rhs':
+            return self.funcs[0](*y, *self.parameters)[:, 0]
+        mass_matrix_full = self.funcs[0](*y, *self.parameters)
+        forcing_full = self.funcs[1](*y, *self.parameters)[:, 0]
+        # 배치 축을 앞으로 옮겨 배치 단위 선형 풀이 (M은 (batch, n, n))
+        mass_matrix = np.moveaxis(mass_matrix_full[n:, n:], -1, 0)
+        forcing = forcing_full[n:].T[..., np.newaxis]
+        accelerations = np.linalg.solve(mass_matrix, forcing)[..., 0].T
+        return np.concatenate((forcing_full[:n], accelerations))
+
+
+class CompiledRHS:
+    # 컴파일된 C 함수가 미리 할당된 출력 버퍼에 직접 쓰므로 호출마다 배열을 만들지 않는다
+    def __init__(self, func, num_coordinates, parameters):
+        self.func = func
+        self.num_coordinates = num_coordinates
+        self.parameters = np.ascontiguousarray(parameters, dtype=float)
+        self.output = np.empty(2 * num_coordinates)
+
+    def __call__(self, y, t):
+        y = np.ascontiguousarray(y, dtype=float)
+        n = self.num_coordinates
+        self.func(y[:n], y[n:], self.parameters, self.output)
+        return self.output
+
+
+class CompiledMassMatrixRHS:
+    def __init__(self, func, num_coordinates, parameters):
+        self.func = func
+        self.num_coordinates = num_coordinates
+        self.parameters = np.ascontiguousarray(parameters, dtype=float)
+        self.mass_matrix = np.empty((2 * num_coordinates) ** 2)
+        self.forcing = np.empty(2 * num_coordinates)
+        self.output = np.empty(2 * num_coordinates)
+
+    def __call__(self, y, t):
+        y = np.ascontiguousarray(y, dtype=float)
+        n = self.num_coordinates
+        self.func(y[:n], y[n:], self.parameters, self.mass_matrix, self.forcing)
+        return solve_mass_matrix(self.mass_matrix.reshape(2 * n, 2 * n), self.forcing, n, self.output)
+
+
+def compile_cython_rhs(eom, build_dir):
+    # pydy의 Cython 생성기로 C 확장 모듈을 만들고 모듈 경로를 반환
+    from pydy.codegen.cython_code import CythonMatrixGenerator
+
+    generator = CythonMatrixGenerator([eom.q, eom.u, eom.parameters], eom.matrices,
+                                      prefix='mbd_rhs', cse=True)
+    generator.compile(tmp_dir=build_dir)
+    modules = sorted(glob.glob(os.path.join(build_dir, 'mbd_rhs_*' + importlib.machinery.EXTENSION_SUFFIXES[0])),
+                     key=os.path.getmtime)
+    if not modules:
+        raise RuntimeError(f"컴파일된 모듈을 찾을 수 없습니다: {build_dir}")
+    return modules[-1]
+
+
+def load_compiled_module(path):
+    name = os.path.basename(path).split('.', 1)[0]
+    loader = importlib.machinery.ExtensionFileLoader(name, path)
+    spec = importlib.util.spec_from_file_location(name, path, loader=loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module.eval
+
+
+def verify_backend(eom, backend, samples=20, rtol=1e-8, atol=1e-10, seed=0):
+    # 임의의 파라미터와 상태에서 같은 형식의 lambdify 결과와 비교해 최대 절대 오차를 반환
+    rng = np.random.default_rng(seed)
+    parameters = rng.uniform(0.5, 2.0, len(eom.parameters))
+    reference = eom.rhs_evaluator(parameters, 'lambdify')
+    evaluator = eom.rhs_evaluator(parameters, backend)
+    worst = 0.0
+    for _ in range(samples):
+        y = rng.uniform(-np.pi, np.pi, 2 * eom.num_bodies)
+        expected = reference(y, 0.0)
+        actual = np.array(evaluator(y, 0.0))
+        error = np.abs(actual - expected)
+        if not np.all(error <= atol + rtol * np.abs(expected)):
+            raise ValueError(f"RHS 백엔드 결과가 lambdify와 일치하지 않습니다 (최대 오차 {error.max():.3e})")
+        worst = max(worst, float(error.max()))
+    return worst
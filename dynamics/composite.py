@@ -0,0 +1,97 @@
+# dynamics/composite.py
+import numpy as np
+
+FIXED_JOINT = 'Fixed'
+
+
+class CompositeReduction:
+    # Fixed 조인트로 용접된 바디들을 하나의 복합 강체로 합쳐 좌표 수를 줄인다.
+    # 용접된 바디는 부모에 대한 상대각이 항상 0이므로 복합체 축 위에서 각 바디의 시작점과
+    # 끝점(= 질량 중심, 링크 모델)이 정해진다. 축약 바디 k에 대해:
+    #   clusters[k]: 속한 원래 바디들 (첫 번째가 좌표를 갖는 대표 바디, coordinates[k])
+    #   parents[k]: 축약 트리의 부모 (-1은 지면)
+    # cluster_of[i]는 바디 i가 속한 축약 바디, 지면에 용접된 바디는 -1 (좌표 없음).
+    # 축약 모델은 바디마다 질량 중심 위치(com)와 부모 축 위의 조인트 위치(offsets)를 따로 가진다.
+    def __init__(self, tree, fixed_joints):
+        # tree: 전체 모델의 KinematicTree, fixed_joints: 조인트별 Fixed 여부 (bool 배열)
+        self.tree = tree
+        fixed_joints = np.asarray(fixed_joints, dtype=bool)
+        body_joints = tree.body_joints
+        self.welded = np.zeros(tree.num_bodies, dtype=bool)
+        has_joint = body_joints >= 0
+        self.welded[has_joint] = fixed_joints[body_joints[has_joint]]
+
+        self.cluster_of = np.full(tree.num_bodies, -1, dtype=np.int64)
+        self.clusters = []
+        for body in tree.order.tolist():
+            parent = tree.parents[body]
+            if not self.welded[body]:
+                self.cluster_of[body] = len(self.clusters)
+                self.clusters.append([body])
+            elif parent >= 0 and self.cluster_of[parent] >= 0:
+                self.cluster_of[body] = self.cluster_of[parent]
+                self.clusters[self.cluster_of[parent]].append(body)
+
+        self.coordinates = np.array([cluster[0] for cluster in self.clusters], dtype=np.int64)
+        # 대표 바디의 원래 부모 (그 부모가 지면에 용접되어 있으면 축약 트리에서는 루트)
+        self.attached_to = tree.parents[self.coordinates]
+        self.parents = np.where(self.attached_to >= 0, self.cluster_of[np.maximum(self.attached_to, 0)], -1)
+
+    @classmethod
+    def from_model(cls, model, tree=None):
+        return cls(tree if tree is not None else model.tree(), model.joints['joint_type'] == FIXED_JOINT)
+
+    @property
+    def num_bodies(self):
+        return len(self.clusters)
+
+    @property
+    def is_identity(self):
+        return not self.welded.any()
+
+    def tips(self, lengths):
+        # 각 바디 끝점의 복합체 축 위 위치 (지면에 용접된 바디는 지면 x축 위). lengths는 (n,) 또는 (n, batch)
+        lengths = np.asarray(lengths, dtype=float)
+        tips = np.empty_like(lengths)
+        parents = self.tree.parents
+        for body in self.tree.order.tolist():
+            parent = parents[body]
+            start = tips[parent] if self.welded[body] and parent >= 0 else 0.0
+            tips[body] = start + lengths[body]
+        return tips
+
+    def reduce(self, masses, inertias, lengths, torques):
+        # 바디별 파라미터를 축약 바디별 (질량, 질량 중심 기준 관성, 질량 중심 위치, 토크, 조인트 위치)로 합친다.
+        # 관성은 평행축 정리: sum(I_i + m_i * (x_i - x_com)^2). 마지막 축이 배치여도 된다
+        masses, inertias, torques = (np.asarray(values, dtype=float) for values in (masses, inertias, torques))
+        tips = self.tips(lengths)
+        members = self.cluster_of >= 0
+        index = self.cluster_of[members]
+        shape = (self.num_bodies,) + masses.shape[1:]
+
+        mass = np.zeros(shape)
+        np.add.at(mass, index, masses[members])
+        if (mass <= 0).any():
+            raise ValueError("질량이 0인 복합 바디가 있습니다.")
+        moment = np.zeros(shape)
+        np.add.at(moment, index, masses[members] * tips[members])
+        com = moment / mass
+        inertia = np.zeros(shape)
+        np.add.at(inertia, index, inertias[members] + masses[members] * (tips[members] - com[index])**2)
+        torque = np.zeros(shape)
+        np.add.at(torque, index, torques[members])
+
+        # 조인트 위치: 부모 복합체 축 위에서 대표 바디의 원래 부모 끝점 (지면이면 원점)
+        offsets = np.zeros(shape)
+        attached = self.attached_to >= 0
+        offsets[attached] = tips[self.attached_to[attached]]
+        return mass, inertia, com, torque, offsets
+
+    def expand(self, states):
+        # 축약 상태 (..., 2k)를 바디별 상태 (..., 2n)로 되돌린다 (용접된 바디의 상대각과 각속도는 0)
+        states = np.asarray(states)
+        n, k = self.tree.num_bodies, self.num_bodies
+        full = np.zeros(states.shape[:-1] + (2 * n,), dtype=states.dtype)
+        full[..., self.coordinates] = states[..., :k]
+        full[..., n + self.coordinates] = states[..., k:]
+        return full
@@ -0,0 +1,262 @@
+# dynamics/contact.py
+import numpy as np
+
+# 링크끼리, 링크와 바닥 사이의 접촉과 조인트 각도 제한을 벌점(penalty) 힘으로 처리한다.
+#   - 바디 i는 조인트(시작점)에서 끝점까지의 선분 (모델의 point1/point2에서 구한 길이), 반지름 contact_radius의
+#     캡슐 (생략하면 평균 링크 길이의 5%)
+#   - 바닥은 y = floor_height인 직선 (첫 루트 조인트가 원점, 중력은 -y). 다른 루트는 root_pivots의 위치에 고정
+#   - 침투 깊이 d와 법선 방향 상대 속도 v_n으로 법선력 max(k d - c v_n, 0),
+#     접선 방향은 정규화한 쿨롱 마찰 -mu F_n tanh(v_t / slip_velocity)
+#   - 조인트 제한은 범위를 벗어난 만큼의 스프링-댐퍼 조인트 토크 (부모와 자식에 반대로 작용)
+# 접촉력 F (점 p)는 일반화 힘 Q_j = sum (p - 조인트 j) x F (조인트 j 아래 부분 트리의 접촉)로 바꾼 뒤
+# 운동 방정식의 바디별 순수 토크 파라미터 T로 넘긴다. 상대각 좌표에서 Q_j = (부분 트리의 T 합)이므로
+# T_k = Q_k - sum(자식의 Q)이고, 두 엔진 모두 우변을 바꾸지 않고 토크만 더하면 된다.
+# 링크 쌍은 균일 격자(칸 크기 = 경계 상자 변의 중앙값, 벡터화)로 같은 칸에 걸친 후보만 먼저 고르므로
+# 체인이 바닥에 구겨져 있어도 비용이 링크 수에 거의 비례한다 (긴 링크 하나는 걸친 칸마다 들어간다). 벌점 힘은 강성이 크므로 odeint(LSODA), Radau, BDF를 권장
+# 상자 하나가 한 축으로 걸칠 수 있는 칸 수의 상한 (아주 긴 링크가 칸 수를 폭증시키지 않게 칸을 키운다)
+MAX_CELL_SPAN = 64
+
+CONTACT_DEFAULTS = {
+    'contact_stiffness': 1e4,
+    'contact_damping': 100.0,
+    'contact_radius': None,
+    'friction': 0.0,
+    'slip_velocity': 0.01,
+    'limit_stiffness': 1e3,
+    'limit_damping': 10.0,
+}
+
+
+class TreeSums:
+    # 트리 위의 조상 합과 부분 트리 합을 O(n) 벡터 연산으로 계산한다.
+    # 깊이 우선 전위 순서에서 부분 트리는 연속 구간이므로 누적 합 두 번으로 충분하다
+    def __init__(self, parents):
+        parents = [int(parent) for parent in parents]
+        n = len(parents)
+        children = [[] for _ in parents]
+        roots = []
+        for body, parent in enumerate(parents):
+            (roots if parent < 0 else children[parent]).append(body)
+        preorder = []
+        stack = roots[::-1]
+        while stack:
+            body = stack.pop()
+            preorder.append(body)
+            stack.extend(reversed(children[body]))
+        if len(preorder) != n:
+            raise ValueError("부모 배열에 순환이 있습니다.")
+        size = np.ones(n, dtype=np.int64)
+        for body in reversed(preorder):
+            if parents[body] >= 0:
+                size[parents[body]] += size[body]
+        self.preorder = np.array(preorder, dtype=np.int64)
+        self.start = np.empty(n, dtype=np.int64)
+        self.start[self.preorder] = np.arange(n)
+        self.stop = self.start + size
+
+    def ancestors(self, values):
+        # result[i] = 바디 i와 그 조상들의 values 합 (값을 부분 트리 구간 전체에 더한다)
+        n = len(values)
+        steps = np.bincount(self.start, values, n + 1) - np.bincount(self.stop, values, n + 1)
+        return np.cumsum(steps[:n])[self.start]
+
+    def subtree(self, values):
+        # result[i] = 바디 i와 그 자손들의 values 합
+        totals = np.concatenate(([0.0], np.cumsum(values[self.preorder])))
+        return totals[self.stop] - totals[self.start]
+
+
+def grid_pairs(lower, upper):
+    # 축 정렬 상자 (n, 2)끼리 겹치는 쌍 (a, b) (a != b, 쌍마다 한 번).
+    # 칸 크기는 상자의 긴 변의 중앙값이므로 보통 상자는 최대 2x2 칸에, 긴 상자는 걸친 모든 칸에 들어간다.
+    # (칸, 상자) 항목을 칸 번호로 정렬해 같은 칸 안의 항목끼리만 쌍을 만들고,
+    # 여러 칸에서 겹치는 쌍은 겹친 영역의 왼쪽 아래 칸에서만 남긴다
+    empty = np.zeros(0, dtype=np.int64)
+    if len(lower) < 2:
+        return empty, empty
+    extents = np.max(upper - lower, axis=1)
+    cell = max(float(np.median(extents)), float(extents.max()) / MAX_CELL_SPAN, 1e-12)
+    origin = lower.min(axis=0)
+    first_cell = np.floor((lower - origin) / cell).astype(np.int64)
+    last_cell = np.floor((upper - origin) / cell).astype(np.int64)
+    rows = int(last_cell[:, 1].max()) + 1
+    spans = last_cell - first_cell + 1
+    sizes = spans[:, 0] * spans[:, 1]
+    boxes = np.repeat(np.arange(len(lower)), sizes)
+    # 상자 안에서의 항목 번호 -> 걸친 칸 (열 우선)
+    offsets = np.arange(len(boxes)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    cx = first_cell[boxes, 0] + offsets // spans[boxes, 1]
+    cy = first_cell[boxes, 1] + offsets % spans[boxes, 1]
+    keys = cx * rows + cy
+    order = np.argsort(keys, kind='stable')
+    keys, boxes = keys[order], boxes[order]
+
+    counts = np.searchsorted(keys, keys, side='right') - np.arange(len(keys)) - 1
+    first = np.repeat(np.arange(len(keys)), counts)
+    second = first + np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    a, b = boxes[first], boxes[second]
+    corner = np.maximum(first_cell[a], first_cell[b])
+    unique = corner[:, 0] * rows + corner[:, 1] == keys[first]
+    a, b = a[unique], b[unique]
+    overlap = (lower[a] <= upper[b]).all(axis=1) & (lower[b] <= upper[a]).all(axis=1)
+    return a[overlap], b[overlap]
+
+
+def closest_points(p1, d1, p2, d2):
+    # 선분 p1 + s d1과 p2 + t d2 (s, t in [0, 1]) 사이 최근접점의 매개변수 (s, t). 모든 인자는 (m, 2)
+    r = p1 - p2
+    a = np.einsum('ij,ij->i', d1, d1)
+    e = np.einsum('ij,ij->i', d2, d2)
+    b = np.einsum('ij,ij->i', d1, d2)
+    c = np.einsum('ij,ij->i', d1, r)
+    f = np.einsum('ij,ij->i', d2, r)
+    denominator = a * e - b * b
+    parallel = denominator <= 1e-12 * a * e
+    s = np.where(parallel, 0.0, np.clip((b * f - c * e) / np.where(parallel, 1.0, denominator), 0.0, 1.0))
+    t = (b * s + f) / e
+    s = np.where(t < 0.0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a, 0.0, 1.0), s))
+    return s, np.clip(t, 0.0, 1.0)
+
+
+class ContactModel:
+    # parents, lengths: 전체 모델의 트리 부모와 링크 길이, reduction: CompositeReduction (축약 좌표 <-> 바디)
+    # limits: (축약 좌표, 하한, 상한) 배열 세 개. 호출하면 축약 상태 y에서 축약 바디별 순수 토크를 돌려준다
+    # root_pivots: 바디별 (x, y), 루트 바디가 지면에 고정된 위치 (생략하면 모든 루트가 원점, 루트가 아닌 행은 무시)
+    def __init__(self, parents, lengths, reduction, floor_height=None, self_collision=False, limits=None,
+                 root_pivots=None, **parameters):
+        unknown = set(parameters) - set(CONTACT_DEFAULTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 접촉 파라미터입니다: {', '.join(sorted(unknown))}")
+        parameters = dict(CONTACT_DEFAULTS, **parameters)
+        self.stiffness = parameters['contact_stiffness']
+        self.damping = parameters['contact_damping']
+        self.radius = parameters['contact_radius']
+        self.friction = parameters['friction']
+        self.slip_velocity = parameters['slip_velocity']
+        self.limit_stiffness = parameters['limit_stiffness']
+        self.limit_damping = parameters['limit_damping']
+        self.floor_height = floor_height
+        self.self_collision = self_collision
+
+        self.parents = np.asarray(parents, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=float)
+        if self.radius is None:
+            self.radius = 0.05 * float(np.mean(self.lengths))
+        self.reduction = reduction
+        self.sums = TreeSums(self.parents)
+        # 루트의 고정 위치 (바디별 조상 합으로 더하도록 루트가 아닌 행은 0)
+        self.root_pivots = np.zeros((len(self.parents), 2))
+        if root_pivots is not None:
+            roots = self.parents < 0
+            self.root_pivots[roots] = np.asarray(root_pivots, dtype=float).reshape(-1, 2)[roots]
+        self.offsets = np.column_stack((self.sums.ancestors(self.root_pivots[:, 0]),
+                                        self.sums.ancestors(self.root_pivots[:, 1])))
+        # 지면에 용접된 바디는 움직이지 않으므로 바닥 접촉에서 빼고, 링크 접촉에서는 고정 장애물로만 쓴다
+        self.movable = reduction.cluster_of >= 0
+        self.floor_bodies = np.flatnonzero(self.movable)
+        coordinates, lower, upper = limits if limits is not None else ((), (), ())
+        self.limit_coordinates = np.asarray(coordinates, dtype=np.int64)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        reduced_parents = np.asarray(reduction.parents, dtype=np.int64)
+        self.children = np.flatnonzero(reduced_parents >= 0)
+        self.child_parents = reduced_parents[self.children]
+
+    def kinematics(self, y):
+        # 축약 상태 -> 바디별 (시작점, 선분 벡터, 각속도, 시작점 속도), 점은 (n, 2)
+        n = len(self.parents)
+        full = self.reduction.expand(np.asarray(y, dtype=float))
+        angles = self.sums.ancestors(full[:n])
+        omega = self.sums.ancestors(full[n:])
+        segments = self.lengths[:, np.newaxis] * np.column_stack((np.cos(angles), np.sin(angles)))
+        tips = np.column_stack((self.sums.ancestors(segments[:, 0]), self.sums.ancestors(segments[:, 1])))
+        # 끝점 속도는 조상들의 w x (선분)의 합
+        tip_velocities = np.column_stack((self.sums.ancestors(-omega * segments[:, 1]),
+                                          self.sums.ancestors(omega * segments[:, 0])))
+        pivot_velocities = tip_velocities - omega[:, np.newaxis] * np.column_stack((-segments[:, 1], segments[:, 0]))
+        return tips - segments + self.offsets, segments, omega, pivot_velocities
+
+    def candidate_pairs(self, pivots, segments):
+        # 넓은 단계: 캡슐의 경계 상자가 겹치는 쌍 중 조인트를 공유하는 쌍(부모-자식, 같은 부모의 형제,
+        # 같은 위치에 고정된 루트)과 같은 복합 바디(지면에 함께 용접된 바디 포함)에 속한 쌍을 뺀다
+        tips = pivots + segments
+        lower = np.minimum(pivots, tips) - self.radius
+        upper = np.maximum(pivots, tips) + self.radius
+        a, b = grid_pairs(lower, upper)
+        parents, clusters = self.parents, self.reduction.cluster_of
+        siblings = (parents[a] == parents[b]) & (parents[a] >= 0)
+        roots = (parents[a] < 0) & (parents[b] < 0) & (self.root_pivots[a] == self.root_pivots[b]).all(axis=1)
+        keep = (parents[a] != b) & (parents[b] != a) & ~siblings & ~roots & (clusters[a] != clusters[b])
+        return a[keep], b[keep]
+
+    def __call__(self, y):
+        pivots, segments, omega, pivot_velocities = self.kinematics(y)
+        bodies, points, forces = [], [], []
+
+        def velocity(body, point):
+            # 바디 위 점의 속도 v_pivot + w x (p - pivot)
+            arm = point - pivots[body]
+            return pivot_velocities[body] + omega[body, np.newaxis] * np.column_stack((-arm[:, 1], arm[:, 0]))
+
+        if self.floor_height is not None:
+            # 바닥: 움직이는 바디의 끝점 (자식의 시작점은 부모의 끝점, 루트 시작점은 root_pivots에 고정)
+            body = self.floor_bodies
+            tip = pivots[body] + segments[body]
+            depth = self.floor_height + self.radius - tip[:, 1]
+            touching = depth > 0
+            if touching.any():
+                body, tip, depth = body[touching], tip[touching], depth[touching]
+                v = velocity(body, tip)
+                normal = np.maximum(self.stiffness * depth - self.damping * v[:, 1], 0.0)
+                tangent = -self.friction * normal * np.tanh(v[:, 0] / self.slip_velocity)
+                bodies.append(body)
+                points.append(tip)
+                forces.append(np.column_stack((tangent, normal)))
+
+        if self.self_collision:
+            a, b = self.candidate_pairs(pivots, segments)
+            s, t = closest_points(pivots[a], segments[a], pivots[b], segments[b])
+            point_a = pivots[a] + s[:, np.newaxis] * segments[a]
+            point_b = pivots[b] + t[:, np.newaxis] * segments[b]
+            gap = point_a - point_b
+            distance = np.hypot(gap[:, 0], gap[:, 1])
+            touching = (distance < 2 * self.radius) & (distance > 1e-12)
+            if touching.any():
+                a, b, point_a, point_b = a[touching], b[touching], point_a[touching], point_b[touching]
+                distance = distance[touching]
+                normal = gap[touching] / distance[:, np.newaxis]
+                tangent = np.column_stack((-normal[:, 1], normal[:, 0]))
+                relative = velocity(a, point_a) - velocity(b, point_b)
+                v_n = np.einsum('ij,ij->i', relative, normal)
+                v_t = np.einsum('ij,ij->i', relative, tangent)
+                f_n = np.maximum(self.stiffness * (2 * self.radius - distance) - self.damping * v_n, 0.0)
+                f_t = -self.friction * f_n * np.tanh(v_t / self.slip_velocity)
+                force = f_n[:, np.newaxis] * normal + f_t[:, np.newaxis] * tangent
+                bodies.extend((a, b))
+                points.extend((point_a, point_b))
+                forces.extend((force, -force))
+
+        k = self.reduction.num_bodies
+        generalized = np.zeros(k)
+        if bodies:
+            n = len(self.parents)
+            body = np.concatenate(bodies)
+            point = np.concatenate(points)
+            force = np.concatenate(forces)
+            fx = self.sums.subtree(np.bincount(body, force[:, 0], n))
+            fy = self.sums.subtree(np.bincount(body, force[:, 1], n))
+            moment = self.sums.subtree(np.bincount(body, point[:, 0] * force[:, 1] - point[:, 1] * force[:, 0], n))
+            # 조인트 j에 대한 부분 트리 접촉력의 모멘트
+            generalized = (moment - (pivots[:, 0] * fy - pivots[:, 1] * fx))[self.reduction.coordinates]
+
+        if len(self.limit_coordinates):
+            coordinate = self.limit_coordinates
+            q, u = y[coordinate], y[k + coordinate]
+            below = np.maximum(self.limit_stiffness * (self.lower - q) - self.limit_damping * u, 0.0)
+            above = np.minimum(self.limit_stiffness * (self.upper - q) - self.limit_damping * u, 0.0)
+            torque = np.where(q < self.lower, below, 0.0) + np.where(q > self.upper, above, 0.0)
+            generalized = generalized + np.bincount(coordinate, torque, k)
+
+        torques = generalized.copy()
+        np.subtract.at(torques, self.child_parents, generalized[self.children])
+        return torques
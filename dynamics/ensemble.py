@@ -0,0 +1,119 @@
+# dynamics/ensemble.py
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+
+from dynamics.eom_cache import EquationCache, default_cache
+from dynamics.simulation import integrate_batch
+
+# 워커 프로세스마다 한 번 로드한 운동 방정식 (디스크 캐시에서 읽으므로 재유도하지 않음)
+_worker_equations = None
+
+
+def _init_worker(cache_dir, topology):
+    global _worker_equations
+    _worker_equations = EquationCache(cache_dir).get(topology) if topology is not None else None
+
+
+def _open_output(output, shape):
+    # output: ('shm', 이름) 또는 ('npy', 경로). 결과 배열의 뷰와 닫기용 핸들을 반환
+    kind, location = output
+    if kind == 'shm':
+        shm = shared_memory.SharedMemory(name=location)
+        return np.ndarray(shape, dtype=float, buffer=shm.buf), shm
+    return np.load(location, mmap_mode='r+'), None
+
+
+def _run_chunk(output, shape, start, stop, masses, inertias, lengths, torques, g, initial_conditions, t,
+               parents, offsets, reduction, inputs):
+    solution = integrate_batch(_worker_equations, masses, inertias, lengths, torques, g, initial_conditions, t,
+                               parents, offsets, inputs)
+    if reduction is not None:
+        solution = reduction.expand(solution)
+    result, shm = _open_output(output, shape)
+    # 결과는 피클로 돌려보내지 않고 공유 메모리/메모리 맵 배열에 직접 쓴다
+    result[start:stop] = solution
+    if shm is None:
+        result.flush()
+    else:
+        del result
+        shm.close()
+    return stop - start
+
+
+class EnsembleRunner:
+    # Simulation의 배치 적분을 여러 프로세스에 나눠 실행하는 몬테카를로 러너
+    def __init__(self, simulation, max_workers=None, chunk_size=64, mp_context='spawn'):
+        self.simulation = simulation
+        self.max_workers = max_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        # Qt 프로세스에서 fork하지 않도록 기본은 spawn
+        self.mp_context = multiprocessing.get_context(mp_context)
+
+    def run(self, parameter_sets=None, initial_conditions=None, output_path=None, progress=None):
+        # 반환값은 (batch, time, state) 배열. output_path를 주면 .npy 메모리 맵에 기록하고 그 맵을 반환
+        simulation = self.simulation
+        if not simulation.model.num_joints:
+            raise ValueError("시스템에 조인트가 정의되지 않았습니다.")
+        simulation.check_tree()
+        simulation.check_batch_contacts()
+        simulation.inputs = simulation.torque_inputs()
+        masses, inertias, lengths, torques, g = simulation.batch_parameters(parameter_sets or {})
+        num_states = 2 * masses.shape[0]
+        # 워커는 Fixed 조인트를 합친 축약 모델을 적분하고 바디별 상태로 되돌려 기록한다
+        masses, inertias, lengths, torques, offsets = simulation.reduced_parameters(masses, inertias, lengths, torques)
+        reduction = None if simulation.reduction.is_identity else simulation.reduction
+        batch_size = g.shape[0]
+        t = simulation.time_points()
+        shape = (batch_size, len(t), num_states)
+
+        if initial_conditions is None:
+            initial_conditions = np.zeros(num_states)
+        initial_conditions = simulation.reduce_state(
+            np.broadcast_to(np.asarray(initial_conditions, dtype=float), (batch_size, num_states)))
+
+        # 부모 프로세스에서 한 번 유도해 디스크 캐시에 저장해 두면 워커는 읽기만 한다
+        topology = None
+        cache = default_cache()
+        if simulation.engine != 'articulated':
+            topology = simulation.topology()
+            cache.get(topology)
+
+        shm = None
+        if output_path is not None:
+            result = np.lib.format.open_memmap(output_path, mode='w+', dtype=float, shape=shape)
+            result.flush()
+            output = ('npy', output_path)
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+            result = np.ndarray(shape, dtype=float, buffer=shm.buf)
+            output = ('shm', shm.name)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context,
+                                     initializer=_init_worker, initargs=(cache.cache_dir, topology)) as pool:
+                futures = []
+                for start in range(0, batch_size, self.chunk_size):
+                    stop = min(start + self.chunk_size, batch_size)
+                    futures.append(pool.submit(
+                        _run_chunk, output, shape, start, stop,
+                        masses[:, start:stop], inertias[:, start:stop], lengths[:, start:stop],
+                        torques[:, start:stop], g[start:stop], initial_conditions[start:stop], t,
+                        simulation.reduction.parents,
+                        None if offsets is None else offsets[:, start:stop], reduction, simulation.inputs))
+                done = 0
+                for future in as_completed(futures):
+                    done += future.result()
+                    if progress is not None:
+                        progress(done, batch_size)
+
+            if shm is not None:
+                return result.copy()
+            return np.load(output_path, mmap_mode='r')
+        finally:
+            if shm is not None:
+                del result
+                shm.close()
+                shm.unlink()
@@ -0,0 +1,154 @@
+# dynamics/eom_cache.py
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from collections import OrderedDict
+
+from dynamics.codegen import compile_cython_rhs, verify_backend
+from dynamics.equations import derive_equations
+from dynamics.metrics import timed
+
+# 캐시 포맷이 바뀌면 올려서 이전 파일이 재사용되지 않도록 한다
+CACHE_FORMAT_VERSION = 5
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'multibody_dynamics', 'eom')
+
+
+def topology_key(topology):
+    payload = json.dumps({'version': CACHE_FORMAT_VERSION, 'topology': topology}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class EquationCache:
+    # 위상 해시를 키로 하는 2단 캐시: 메모리 LRU + 크기 제한이 있는 디스크 저장소
+    def __init__(self, cache_dir=None, max_memory_entries=8, max_disk_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir or os.environ.get('MBD_EOM_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+
+    def get(self, topology, backend='lambdify', jacobian=False, metrics=None):
+        # metrics(SimulationMetrics)가 주어지면 캐시 적중 종류와 유도/컴파일 단계 시간을 기록
+        key = topology_key(topology)
+        equations = self._memory.get(key)
+        if equations is not None:
+            self._memory.move_to_end(key)
+            source = 'memory'
+        else:
+            with timed(metrics, 'cache_load'):
+                equations = self._load(key)
+            source = 'disk'
+            if equations is None:
+                source = 'derived'
+                equations = derive_equations(topology, metrics)
+                self._store(key, equations)
+            self._remember(key, equations)
+        if metrics is not None:
+            metrics.count(f'equations_{source}')
+
+        if not equations.has_backend(backend):
+            with timed(metrics, 'codegen'):
+                self._compile_backend(key, equations, backend)
+        if jacobian and equations.jacobian_func is None:
+            with timed(metrics, 'jacobian'):
+                equations.derive_jacobian()
+            self._store(key, equations)
+        return equations
+
+    def put(self, topology, equations):
+        # 다른 곳에서 유도한 방정식을 캐시에 등록 (벤치마크 등)
+        key = topology_key(topology)
+        self._store(key, equations)
+        self._remember(key, equations)
+
+    def _compile_backend(self, key, equations, backend):
+        if backend != 'cython':
+            raise ValueError(f"알 수 없는 RHS 백엔드입니다: {backend}")
+        build_dir = os.path.join(self.cache_dir, 'build', key)
+        try:
+            equations.compiled_modules[backend] = compile_cython_rhs(equations, build_dir)
+            verify_backend(equations, backend)
+        except Exception as e:
+            # 컴파일러나 Cython이 없으면 lambdify 경로로 계속 진행
+            equations.compiled_modules.pop(backend, None)
+            print(f"RHS backend '{backend}' unavailable, falling back to lambdify: {e}")
+            return
+        self._store(key, equations)
+
+    def clear(self, disk=False):
+        self._memory.clear()
+        if disk and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, name))
+            shutil.rmtree(os.path.join(self.cache_dir, 'build'), ignore_errors=True)
+
+    def _remember(self, key, equations):
+        self._memory[key] = equations
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                equations = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 손상되었거나 호환되지 않는 항목은 버리고 다시 유도한다
+            print(f"Discarding unreadable EOM cache entry {path}: {e}")
+            os.remove(path)
+            return None
+        # 최근 사용 시각을 갱신해 축출 순서에 반영
+        os.utime(path)
+        return equations
+
+    def _store(self, key, equations):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(equations, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError as e:
+            # 디스크 캐시는 선택 사항이므로 실패해도 메모리 캐시로 계속 진행
+            print(f"Could not write EOM cache entry: {e}")
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        # 가장 오래전에 사용된 항목부터 제거 (가장 최근 항목 하나는 남긴다)
+        for _, size, path in sorted(entries)[:-1]:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+            key = os.path.basename(path)[:-len('.pkl')]
+            shutil.rmtree(os.path.join(self.cache_dir, 'build', key), ignore_errors=True)
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = EquationCache()
+    return _default_cache
+
+
+def get_equations(topology, backend='lambdify', jacobian=False, metrics=None):
+    return default_cache().get(topology, backend, jacobian, metrics)
@@ -0,0 +1,282 @@
+# dynamics/equations.py
+import inspect
+import os
+import numpy as np
+from dynamics.metrics import timed
+from dynamics.topology import ltdl_solve, tree_order
+from dynamics.codegen import (LambdifyRHS, LambdifyMassMatrixRHS, BatchLambdifyRHS, CompiledRHS,
+                              CompiledMassMatrixRHS, LambdifyJacobian, load_compiled_module)
+
+
+# 'rhs': km.rhs()로 질량 행렬을 기호적으로 역변환 (가지가 있는 트리는 LTDL 분해로 희소하게 풀이)
+# 'mass_matrix': mass_matrix_full / forcing_full을 따로 평가하고 매 스텝 수치적으로 풀이
+# SymPy는 가져오는 데만 수백 ms가 걸리므로 유도/컴파일 시점에 함수 안에서 가져온다.
+EOM_FORMS = ('rhs', 'mass_matrix')
+
+
+def chain_topology(num_bodies, form='rhs'):
+    # 직렬 체인의 위상 정보 (값이 아닌 구조만 포함 -> 캐시 키로 사용)
+    return {'kind': 'serial_chain', 'num_bodies': num_bodies, 'form': form}
+
+
+def tree_topology(parents, form='rhs', offsets=False):
+    # 부모 배열로 정의된 트리(숲)의 위상. 직렬 체인이면 기존 키를 그대로 사용해 캐시를 공유한다.
+    # offsets=True: 조인트 위치(부모 축 위의 거리 a_i)를 별도 파라미터로 두는 복합 바디 모델
+    # (l_i는 질량 중심까지의 거리로만 쓰인다)
+    parents = [int(parent) for parent in parents]
+    if not offsets and parents == list(range(-1, len(parents) - 1)):
+        return chain_topology(len(parents), form)
+    topology = {'kind': 'tree', 'num_bodies': len(parents), 'parents': parents, 'form': form}
+    if offsets:
+        topology['offsets'] = True
+    return topology
+
+
+def topology_parents(topology):
+    if topology['kind'] == 'serial_chain':
+        return list(range(-1, topology['num_bodies'] - 1))
+    if topology['kind'] == 'tree':
+        return list(topology['parents'])
+    raise ValueError(f"지원하지 않는 위상입니다: {topology['kind']}")
+
+
+class ChainEquations:
+    # 파라미터를 기호로 유지한 채 한 번 유도된 운동 방정식.
+    # 파라미터 순서: m1..mn, izz1..izzn, l1..ln, T1..Tn, g (복합 바디 모델은 뒤에 a1..an)
+    # matrices: 'rhs' 형식은 [rhs], 'mass_matrix' 형식은 [mass_matrix_full, forcing_full]
+    def __init__(self, topology, q, u, parameters, matrices):
+        self.topology = topology
+        self.num_bodies = topology['num_bodies']
+        self.form = topology['form']
+        self.q = q
+        self.u = u
+        self.parameters = parameters
+        self.matrices = matrices
+        self.sources = None
+        self.funcs = None
+        self._batch_funcs = None
+        # 상태 자코비안 (암시적 적분기용, 필요할 때 유도되어 캐시에 추가됨)
+        self.jacobian_source = None
+        self.jacobian_func = None
+        # 백엔드 이름 -> 컴파일된 확장 모듈 경로 (디스크 캐시에 함께 저장됨)
+        self.compiled_modules = {}
+        self._compiled_funcs = {}
+        self.compile()
+
+    @property
+    def has_offsets(self):
+        return self.topology.get('offsets', False)
+
+    @property
+    def torque_slice(self):
+        # 파라미터 벡터에서 T1..Tn의 위치 (시간에 따라 변하는 입력을 매 호출마다 덮어쓴다)
+        return slice(3 * self.num_bodies, 4 * self.num_bodies)
+
+    @property
+    def state_vars(self):
+        return self.q + self.u
+
+    def compile(self):
+        if self.sources is None:
+            from sympy.utilities.lambdify import lambdify
+
+            self.funcs = [lambdify(self.state_vars + self.parameters, matrix, modules='numpy')
+                          for matrix in self.matrices]
+            self.sources = [inspect.getsource(func) for func in self.funcs]
+        else:
+            self.funcs = [_load_lambdified(source) for source in self.sources]
+        if self.jacobian_source is not None:
+            self.jacobian_func = _load_lambdified(self.jacobian_source)
+
+    def derive_jacobian(self):
+        from sympy import Matrix, symbols
+        from sympy.utilities.lambdify import lambdify
+
+        x = self.state_vars
+        if self.form == 'rhs':
+            # d(rhs)/dx
+            matrix = self.matrices[0].jacobian(x)
+            args = x + self.parameters
+        else:
+            # M(x) xdot = F(x)에서 G(x, a) = M(x) a - F(x)라 두면 J = -M^-1 dG/dx (a = xdot에서 평가)
+            mass_matrix_full, forcing_full = self.matrices
+            a = Matrix(symbols(f'xdot1:{len(x) + 1}'))
+            matrix = (mass_matrix_full * a - forcing_full).jacobian(x)
+            args = x + self.parameters + list(a)
+        self.jacobian_func = lambdify(args, matrix, modules='numpy')
+        self.jacobian_source = inspect.getsource(self.jacobian_func)
+
+    def jacobian_evaluator(self, parameters):
+        if self.jacobian_func is None:
+            self.derive_jacobian()
+        return LambdifyJacobian(self, parameters)
+
+    @property
+    def batch_funcs(self):
+        # 같은 생성 소스를 배치(마지막 축) 입력용 네임스페이스에서 다시 로드
+        if self._batch_funcs is None:
+            self._batch_funcs = [_load_lambdified(source, batch=True) for source in self.sources]
+        return self._batch_funcs
+
+    def parameter_vector(self, masses, inertias, lengths, torques, g, offsets=None):
+        n = self.num_bodies
+        if self.has_offsets and offsets is None:
+            raise ValueError("복합 바디 모델에는 조인트 위치(offsets)가 필요합니다.")
+        groups = [('masses', masses), ('inertias', inertias), ('lengths', lengths), ('torques', torques)]
+        if self.has_offsets:
+            groups.append(('offsets', offsets))
+        for name, values in groups:
+            if len(values) != n:
+                raise ValueError(f"{name}: {n}개의 값이 필요하지만 {len(values)}개가 주어졌습니다.")
+        vector = list(masses) + list(inertias) + list(lengths) + list(torques) + [g]
+        return vector + list(offsets) if self.has_offsets else vector
+
+    def has_backend(self, backend):
+        return backend == 'lambdify' or os.path.exists(self.compiled_modules.get(backend, ''))
+
+    def rhs_evaluator(self, parameters, backend='lambdify'):
+        if backend == 'lambdify':
+            if self.form == 'mass_matrix':
+                return LambdifyMassMatrixRHS(self, parameters)
+            return LambdifyRHS(self, parameters)
+        func = self._compiled_funcs.get(backend)
+        if func is None:
+            func = load_compiled_module(self.compiled_modules[backend])
+            self._compiled_funcs[backend] = func
+        if self.form == 'mass_matrix':
+            return CompiledMassMatrixRHS(func, self.num_bodies, parameters)
+        return CompiledRHS(func, self.num_bodies, parameters)
+
+    def batch_rhs_evaluator(self, parameters):
+        # 배치 평가는 항상 lambdify 경로를 사용 (각 인자가 (batch,) 배열)
+        return BatchLambdifyRHS(self, parameters)
+
+    # 컴파일된 함수는 피클할 수 없으므로 생성된 소스만 저장하고 로드 시 다시 컴파일한다
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['funcs'] = None
+        state['_batch_funcs'] = None
+        state['jacobian_func'] = None
+        state['_compiled_funcs'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.compile()
+
+
+def _batch_array(rows):
+    # 배치 입력에서는 행렬의 상수 항(0, 1 등)과 배열 항을 같은 모양으로 맞춘 뒤 쌓는다
+    entries = np.broadcast_arrays(*[np.asarray(entry, dtype=float) for row in rows for entry in row])
+    return np.stack(entries).reshape(len(rows), len(rows[0]), *entries[0].shape)
+
+
+def _load_lambdified(source, batch=False):
+    # lambdify가 numpy 모듈에 대해 사용하는 것과 같은 네임스페이스에서 소스를 실행
+    from sympy.utilities.lambdify import lambdify
+
+    namespace = dict(lambdify([], 0, modules='numpy').__globals__)
+    if batch:
+        namespace['array'] = _batch_array
+    exec(compile(source, '<cached-eom>', 'exec'), namespace)
+    name = source.split('def ', 1)[1].split('(', 1)[0]
+    return namespace[name]
+
+
+def derive_equations(topology, metrics=None):
+    km, q, u, parameters = kane_method(topology, metrics)
+    with timed(metrics, 'rhs' if topology['form'] == 'rhs' else 'mass_matrix'):
+        matrices = equation_matrices(km, topology['form'], topology_parents(topology))
+    with timed(metrics, 'lambdify'):
+        return ChainEquations(topology, q, u, parameters, matrices)
+
+
+def kane_method(topology, metrics=None):
+    # 트리 위상에 대해 Kane 방정식을 세운 KanesMethod와 (q, u, 파라미터 기호)를 반환.
+    # 바디 i의 프레임은 부모 프레임에서 q_i만큼 회전하고, 시작점은 부모의 끝점(루트는 원점)
+    parents = topology_parents(topology)
+    if topology['form'] not in EOM_FORMS:
+        raise ValueError(f"지원하지 않는 방정식 형식입니다: {topology['form']}")
+    num_bodies = topology['num_bodies']
+    if num_bodies < 1:
+        raise ValueError("시스템에 바디가 정의되지 않았습니다.")
+    from sympy import symbols
+    from sympy.physics.mechanics import dynamicsymbols, ReferenceFrame, Point, RigidBody, inertia, KanesMethod
+
+    # 일반화 좌표(q)와 일반화 속도(u) 정의
+    q = dynamicsymbols(f'q1:{num_bodies + 1}')
+    u = dynamicsymbols(f'u1:{num_bodies + 1}')
+
+    # 바디 파라미터와 하중을 기호로 유지
+    m = list(symbols(f'm1:{num_bodies + 1}'))
+    izz = list(symbols(f'izz1:{num_bodies + 1}'))
+    l = list(symbols(f'l1:{num_bodies + 1}'))
+    T = list(symbols(f'T1:{num_bodies + 1}'))
+    g = symbols('g')
+
+    # 기준 프레임 정의 (frames[0]과 points[0]은 지면, 바디 i는 frames[i+1]과 points[i+1])
+    order = tree_order(parents)
+    with timed(metrics, 'frames'):
+        N = ReferenceFrame('N')
+        frames = [N] + [None] * num_bodies
+        for i in order:
+            parent_frame = frames[parents[i] + 1]
+            Fi = parent_frame.orientnew(f'F{i+1}', 'Axis', (q[i], N.z))
+            Fi.set_ang_vel(parent_frame, u[i] * N.z)
+            frames[i+1] = Fi
+
+    # 점과 위치 정의 (points[i+1]은 바디 i의 질량 중심)
+    offsets = topology.get('offsets', False)
+    a = list(symbols(f'a1:{num_bodies + 1}')) if offsets else []
+    with timed(metrics, 'points'):
+        points = [Point('O')] + [None] * num_bodies
+        points[0].set_vel(N, 0)
+        joint_points = [points[0]] + [None] * num_bodies
+        for i in order:
+            parent_point = points[parents[i] + 1]
+            if offsets:
+                # 조인트는 부모 조인트에서 부모 축을 따라 a_i, 질량 중심은 조인트에서 l_i
+                parent_joint, parent_frame = joint_points[parents[i] + 1], frames[parents[i] + 1]
+                parent_point = parent_joint.locatenew(f'J{i+1}', a[i] * parent_frame.x)
+                parent_point.v2pt_theory(parent_joint, N, parent_frame)
+                joint_points[i+1] = parent_point
+            p = parent_point.locatenew(f'P{i+1}', l[i] * frames[i+1].x)
+            p.v2pt_theory(parent_point, N, frames[i+1])
+            points[i+1] = p
+
+    # 강체 정의
+    with timed(metrics, 'rigid_bodies'):
+        rigid_bodies = []
+        for i in range(num_bodies):
+            body_inertia = inertia(frames[i+1], 0, 0, izz[i])
+            body = RigidBody(f'Body{i+1}', points[i+1], frames[i+1], m[i], (body_inertia, points[i+1]))
+            rigid_bodies.append(body)
+
+    # 하중(각 바디 프레임에 작용하는 토크)과 중력
+    with timed(metrics, 'forces'):
+        forces = [(frames[i+1], T[i] * N.z) for i in range(num_bodies)]
+        gravity = -g * N.y
+        for body in rigid_bodies:
+            forces.append((body.masscenter, body.mass * gravity))
+
+    # KanesMethod 적용
+    with timed(metrics, 'kanes_equations'):
+        kinematic_differential_equations = [qi.diff(symbols('t')) - ui for qi, ui in zip(q, u)]
+        km = KanesMethod(N, q_ind=q, u_ind=u, kd_eqs=kinematic_differential_equations)
+        km.kanes_equations(loads=forces, bodies=rigid_bodies)
+    return km, q, u, m + izz + l + T + [g] + a
+
+
+def equation_matrices(km, form, parents=None):
+    if form == 'mass_matrix':
+        # 기구학 미분 방정식이 qdot = u이므로 mass_matrix_full의 좌상단 블록은 단위 행렬
+        return [km.mass_matrix_full, km.forcing_full]
+    if parents is None or list(parents) == list(range(-1, len(parents) - 1)):
+        return [km.rhs()]
+    # 가지가 있는 트리: 서로 다른 가지 사이의 질량 행렬 블록은 0이므로 조밀한 LU 대신
+    # 채움이 없는 LTDL 분해로 udot을 구한다 (식의 크기와 유도 시간이 가지 수에 따라 선형으로 는다)
+    from sympy import Matrix
+
+    n = len(parents)
+    accelerations = ltdl_solve(km.mass_matrix, km.forcing, parents)
+    return [Matrix(list(km.forcing_full[:n]) + accelerations)]
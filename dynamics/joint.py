@@ -9,3 +9,6 @@ class Joint:
     joint_type: str = 'Hinge'
     torque: float = 0.0
     graphics: any = None  # For storing QGraphicsEllipseItem
+    # Range of the child body's angle relative to its parent in radians (None = unlimited on that side)
+    lower_limit: float = None
+    upper_limit: float = None
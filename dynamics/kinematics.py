@@ -0,0 +1,47 @@
+# dynamics/kinematics.py
+import numpy as np
+from dynamics.topology import tree_order
+
+
+def frame_indices(t, fps=60.0, speed=1.0):
+    # 재생 속도 speed(시뮬레이션 초 / 실제 초)로 초당 fps 프레임을 보여줄 때 각 프레임의 샘플 인덱스.
+    # 샘플이 화면 프레임보다 촘촘하면 솎아내고, 마지막 샘플은 항상 포함한다.
+    t = np.asarray(t)
+    if len(t) == 0:
+        return np.zeros(0, dtype=int)
+    times = np.arange(t[0], t[-1], speed / fps)
+    indices = np.searchsorted(t, times).clip(0, len(t) - 1)
+    return np.unique(np.append(indices, len(t) - 1))
+
+
+def chain_points(q, lengths, origin=(0.0, 0.0), dtype=np.float32, parents=None):
+    # 체인(또는 parents로 주어진 트리)의 순기구학을 모든 프레임에 대해 한 번에 계산한다.
+    # q: (frames, n) 상대 관절각 (바디 i는 부모에서 q_i만큼 회전, q = 0이면 모두 +x 방향)
+    # 반환값: (frames, n + 1, 2) 배열. [:, 0]은 지면 조인트, [:, i + 1]은 바디 i의 끝점 (y는 위쪽)
+    q = np.atleast_2d(np.asarray(q, dtype=float))
+    lengths = np.asarray(lengths, dtype=float)
+    points = np.empty((q.shape[0], q.shape[1] + 1, 2), dtype=dtype)
+    points[:, 0] = origin
+    if parents is None or np.array_equal(parents, np.arange(-1, q.shape[1] - 1)):
+        angles = np.cumsum(q, axis=1)
+        points[:, 1:, 0] = origin[0] + np.cumsum(lengths * np.cos(angles), axis=1)
+        points[:, 1:, 1] = origin[1] + np.cumsum(lengths * np.sin(angles), axis=1)
+        return points
+
+    # 트리: 부모가 먼저 오는 순서로 바디마다 한 번씩 (프레임 축은 벡터화)
+    angles = np.empty_like(q)
+    tips = np.empty((q.shape[0], q.shape[1] + 1, 2))
+    tips[:, 0] = origin
+    for i in tree_order(parents):
+        parent = parents[i]
+        angles[:, i] = q[:, i] if parent < 0 else angles[:, parent] + q[:, i]
+        tips[:, i + 1, 0] = tips[:, parent + 1, 0] + lengths[i] * np.cos(angles[:, i])
+        tips[:, i + 1, 1] = tips[:, parent + 1, 1] + lengths[i] * np.sin(angles[:, i])
+    points[:] = tips
+    return points
+
+
+def tree_segments(parents):
+    # chain_points 결과에서 각 바디의 (시작점, 끝점) 인덱스를 이어 붙인 배열 (선분 단위로 그릴 때 사용)
+    parents = np.asarray(parents)
+    return np.column_stack((parents + 1, np.arange(1, len(parents) + 1))).ravel()
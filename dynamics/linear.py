@@ -0,0 +1,158 @@
+# dynamics/linear.py
+import numpy as np
+
+# 동작점 x0 주위의 선형 모델  x' = A (x - x0) + B (u - u0) + c
+#   x: 상태 (q, u), u: 바디별 토크, c = f(x0, u0) (평형점이면 0)
+# 우변은 토크에 대해 아핀이므로 B와 c는 정확하고, A는 기호 자코비안(기호 엔진) 또는 중앙 차분(관절체 엔진).
+# 전파는 time_step마다 정확한 이산화를 사용한다:
+#   'expm': [A B c; 0 0 0]의 행렬 지수로 구한 x_{k+1} = Phi x_k + Gamma u_k + g  (샘플당 행렬-벡터 곱 한 번)
+#   'modal': 고유 분해 A = V diag(w) V^-1로 모드마다 z_{k+1} = e^{w dt} z_k + ... (입력이 없으면 닫힌 형태)
+# 입력 토크는 각 스텝 시작 시각의 값으로 유지(zero-order hold)한다.
+PROPAGATIONS = ('expm', 'modal')
+
+
+def hanging_pose(parents):
+    # 중력(-y) 방향으로 늘어진 자세: 루트는 -pi/2, 나머지 상대각은 0
+    q = np.zeros(len(parents))
+    q[np.asarray(parents) < 0] = -np.pi / 2
+    return q
+
+
+def jacobian_fd(evaluate, x, u, step=1e-6):
+    # 중앙 차분 상태 자코비안 (자코비안을 제공하지 않는 엔진용)
+    columns = []
+    for i in range(len(x)):
+        h = step * max(1.0, abs(x[i]))
+        xp, xm = x.copy(), x.copy()
+        xp[i] += h
+        xm[i] -= h
+        columns.append((evaluate(xp, u) - evaluate(xm, u)) / (2 * h))
+    return np.column_stack(columns)
+
+
+def static_equilibrium(evaluate, q, u, jacobian=None, tol=1e-12, max_iterations=50):
+    # 속도 0에서 가속도가 0이 되는 좌표 (뉴턴 반복, q에서 시작)
+    n = len(q)
+    jacobian = jacobian or (lambda x, u: jacobian_fd(evaluate, x, u))
+    x = np.concatenate((np.asarray(q, dtype=float), np.zeros(n)))
+    for _ in range(max_iterations):
+        residual = np.asarray(evaluate(x, u), dtype=float)[n:]
+        if np.max(np.abs(residual)) < tol:
+            return x
+        stiffness = np.asarray(jacobian(x, u), dtype=float)[n:, :n]
+        x[:n] -= np.linalg.solve(stiffness, residual)
+    raise ValueError("정적 평형점을 찾지 못했습니다. 동작점(operating_point)을 직접 지정하세요.")
+
+
+def linearize(evaluate, x0, u0, jacobian=None):
+    # evaluate(x, u): 토크 u에서의 우변, jacobian(x, u): 상태 자코비안 (없으면 중앙 차분)
+    x0 = np.asarray(x0, dtype=float)
+    u0 = np.asarray(u0, dtype=float)
+    c = np.array(evaluate(x0, u0), dtype=float)
+    A = np.array(jacobian(x0, u0) if jacobian is not None else jacobian_fd(evaluate, x0, u0), dtype=float)
+    B = np.empty((len(x0), len(u0)))
+    for i in range(len(u0)):
+        e = np.zeros(len(u0))
+        e[i] = 1.0
+        B[:, i] = np.asarray(evaluate(x0, u0 + e), dtype=float) - c
+    return LinearModel(A, B, c, x0)
+
+
+class LinearModel:
+    def __init__(self, A, B, c, x0, method='expm'):
+        if method not in PROPAGATIONS:
+            raise ValueError(f"알 수 없는 전파 방식입니다: {method}")
+        self.A, self.B, self.c, self.x0 = A, B, c, x0
+        self.method = method
+        self._discrete = {}
+        self._eigen = None
+
+    @property
+    def num_states(self):
+        return len(self.x0)
+
+    def eigen(self):
+        # (w, V, V^-1). 고유벡터가 거의 종속이면 (결함 행렬, 예: 무중력의 0 고유값) 모드 분해를 쓸 수 없다
+        if self._eigen is None:
+            w, V = np.linalg.eig(self.A)
+            if np.linalg.cond(V) > 1e10:
+                raise ValueError("A 행렬을 모드 분해할 수 없습니다 (결함 고유값). 'expm' 전파를 사용하세요.")
+            self._eigen = w, V, np.linalg.inv(V)
+        return self._eigen
+
+    def modes(self):
+        # 진동 모드 (고유값 켤레 쌍 중 허수부가 양수인 것, 고유진동수 오름차순):
+        #   frequencies: 비감쇠 고유진동수 |w| / 2pi [Hz], damping_ratios: -Re(w) / |w|
+        #   shapes: 좌표 성분 (열마다 최대 성분이 1이 되도록 위상과 크기를 맞춘 실수 벡터)
+        w, V, _ = self.eigen()
+        n = self.num_states // 2
+        oscillatory = np.flatnonzero(w.imag > 1e-9 * np.maximum(np.abs(w), 1.0))
+        oscillatory = oscillatory[np.argsort(np.abs(w[oscillatory]))]
+        shapes = V[:n, oscillatory]
+        largest = shapes[np.argmax(np.abs(shapes), axis=0), np.arange(len(oscillatory))]
+        shapes = (shapes / largest).real
+        return {'eigenvalues': w, 'frequencies': np.abs(w[oscillatory]) / (2 * np.pi),
+                'damping_ratios': -w[oscillatory].real / np.abs(w[oscillatory]), 'shapes': shapes}
+
+    def discretize(self, dt):
+        # (Phi, Gamma, g): 한 스텝 동안 입력이 일정할 때의 정확한 이산화
+        key = round(dt, 15)
+        if key not in self._discrete:
+            from scipy.linalg import expm
+
+            s, m = self.B.shape
+            augmented = np.zeros((s + m + 1, s + m + 1))
+            augmented[:s, :s] = self.A
+            augmented[:s, s:s + m] = self.B
+            augmented[:s, -1] = self.c
+            E = expm(augmented * dt)
+            self._discrete[key] = E[:s, :s], E[:s, s:s + m], E[:s, -1]
+        return self._discrete[key]
+
+    def propagate(self, state, t, inputs=None):
+        # t[0]의 state에서 시작해 균일 격자 t 위의 상태 (첫 행 포함). inputs: 바디별 입력 토크 (TorqueInputs)
+        result = np.empty((len(t), self.num_states))
+        result[0] = state
+        if len(t) < 2:
+            return result
+        dt = (t[-1] - t[0]) / (len(t) - 1)
+        u = None if inputs is None else inputs.sample(t[:-1])
+        deviation = np.asarray(state, dtype=float) - self.x0
+        if self.method == 'modal':
+            result[1:] = self.x0 + self._propagate_modal(deviation, dt, len(t) - 1, u)
+        else:
+            result[1:] = self.x0 + self._propagate_expm(deviation, dt, len(t) - 1, u)
+        return result
+
+    def _propagate_expm(self, deviation, dt, steps, u):
+        Phi, Gamma, g = self.discretize(dt)
+        forcing = np.broadcast_to(g, (steps, len(g))) if u is None else u @ Gamma.T + g
+        out = np.empty((steps, len(deviation)))
+        x = deviation
+        for k in range(steps):
+            x = Phi @ x + forcing[k]
+            out[k] = x
+        return out
+
+    def _propagate_modal(self, deviation, dt, steps, u):
+        # 모드 좌표 z = V^-1 x에서 z_{k+1} = a z_k + gamma f_k  (a = e^{w dt}, gamma = (a - 1) / w)
+        w, V, V_inv = self.eigen()
+        a = np.exp(w * dt)
+        small = np.abs(w) * dt < 1e-8
+        gamma = np.where(small, dt, (a - 1) / np.where(small, 1.0, w))
+        z0 = V_inv @ deviation
+        f = V_inv @ self.c
+        if u is None:
+            # 일정한 입력: z_k = a^k z0 + gamma f (1 + a + ... + a^{k-1})
+            k = np.arange(1, steps + 1)[:, np.newaxis]
+            powers = np.exp(np.outer(k[:, 0] * dt, w))
+            geometric = np.where(small, k, (powers - 1) / np.where(small, 1.0, a - 1))
+            z = powers * z0 + geometric * (gamma * f)
+        else:
+            from scipy.signal import lfilter
+
+            forcing = gamma * (u @ (V_inv @ self.B).T + f)
+            z = np.empty((steps, len(w)), dtype=complex)
+            for j in range(len(w)):
+                z[:, j] = lfilter([1.0], [1.0, -a[j]], forcing[:, j], zi=[a[j] * z0[j]])[0]
+        return (z @ V.T).real
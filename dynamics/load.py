@@ -6,3 +6,5 @@ from PySide6.QtCore import QPointF
 class Load:
     joint: 'Joint'
     torque: float
+    # 시간에 따라 변하는 부분 (dynamics.signals), 하중 토크는 torque + signal(t)
+    signal: object = None
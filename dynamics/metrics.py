@@ -0,0 +1,157 @@
+# dynamics/metrics.py
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+PROFILERS = ('cprofile', 'sampling')
+
+
+class SimulationMetrics:
+    # 한 번의 실행에 대한 단계별 소요 시간과 카운터.
+    # stages: 처음 시작한 순서대로 [이름, 누적 초, 깊이, 횟수] — 깊이는 중첩된 단계 표시용이고,
+    # 구간별 적분처럼 같은 깊이에서 반복되는 단계는 한 항목에 누적한다
+    # listeners: 단계가 끝날 때마다 listener(이름, 초) 호출 (GUI 시그널 연결용)
+    def __init__(self):
+        self.listeners = []
+        self.reset()
+
+    def reset(self):
+        self.stages = []
+        self.counters = {}
+        self.profile = None
+        self._entries = {}
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name):
+        entry = self._entries.get((name, self._depth))
+        if entry is None:
+            entry = self._entries[name, self._depth] = [name, 0.0, self._depth, 0]
+            self.stages.append(entry)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._depth -= 1
+            entry[1] += seconds
+            entry[3] += 1
+            for listener in self.listeners:
+                listener(name, seconds)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def stage_time(self, name):
+        return sum(seconds for stage, seconds, _, _ in self.stages if stage == name)
+
+    def as_dict(self):
+        return {'stages': [{'name': name, 'seconds': seconds, 'depth': depth, 'calls': calls}
+                           for name, seconds, depth, calls in self.stages],
+                'counters': dict(self.counters)}
+
+    def report(self):
+        lines = ['stage timings:']
+        for name, seconds, depth, calls in self.stages:
+            repeated = f"  ({calls} calls)" if calls > 1 else ''
+            lines.append(f"  {'  ' * depth}{name:<{28 - 2 * depth}} {seconds:10.4f} s{repeated}")
+        if self.counters:
+            lines.append('counters:')
+            for name, value in self.counters.items():
+                lines.append(f"  {name:<28} {value:>10}")
+        if self.profile is not None:
+            lines.append(self.profile_report())
+        return '\n'.join(lines)
+
+    def profile_report(self, limit=15):
+        if isinstance(self.profile, SamplingProfiler):
+            return self.profile.report(limit)
+        import io
+        import pstats
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+
+def timed(metrics, name):
+    # metrics가 없으면 아무것도 하지 않는 컨텍스트 (유도 함수들은 metrics 없이도 호출된다)
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+class SamplingProfiler:
+    # 대상 스레드의 호출 스택을 일정 간격으로 표본 추출한다. cProfile보다 부하가 작아
+    # 실제 실행 시간 분포를 크게 바꾸지 않는다. inclusive: 스택에 나타난 횟수, leaf: 맨 위 함수였던 횟수
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.inclusive = Counter()
+        self.leaf = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.leaf[_frame_key(frame)] += 1
+            seen = set()
+            while frame is not None:
+                key = _frame_key(frame)
+                if key not in seen:
+                    seen.add(key)
+                    self.inclusive[key] += 1
+                frame = frame.f_back
+
+    def report(self, limit=15):
+        lines = [f"sampling profile ({self.samples} samples, {self.interval * 1000:.0f} ms interval):",
+                 f"  {'inclusive':>9} {'leaf':>6}  function"]
+        for key, count in self.inclusive.most_common(limit):
+            lines.append(f"  {count / max(self.samples, 1):>8.1%} {self.leaf[key] / max(self.samples, 1):>6.1%}  {key}")
+        return '\n'.join(lines)
+
+
+def _frame_key(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+@contextmanager
+def profiling(metrics, profiler):
+    # profiler: None, 'cprofile' 또는 'sampling'. 결과는 metrics.profile에 남는다
+    if profiler is None:
+        yield
+        return
+    if profiler == 'cprofile':
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            metrics.profile = profile
+    elif profiler == 'sampling':
+        profile = SamplingProfiler()
+        profile.start()
+        try:
+            yield
+        finally:
+            profile.stop()
+            metrics.profile = profile
+    else:
+        raise ValueError(f"알 수 없는 프로파일러입니다: {profiler}")
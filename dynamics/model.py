@@ -0,0 +1,370 @@
+# dynamics/model.py
+import numpy as np
+
+# Qt 없이 모델 전체를 구조화 배열로 보관한다. 참조 대신 정수 인덱스를 사용:
+#   joints['body1'/'body2']는 bodies 행 번호, loads['joint']는 joints 행 번호
+BODY_DTYPE = np.dtype([
+    ('x1', float), ('y1', float), ('x2', float), ('y2', float),
+    ('cx', float), ('cy', float), ('mass', float), ('inertia', float), ('length', float),
+])
+# limited인 조인트는 자식 바디의 상대각을 [lower, upper] (rad)로 제한한다 (dynamics.contact)
+JOINT_DTYPE = np.dtype([
+    ('body1', np.int64), ('body2', np.int64), ('x', float), ('y', float),
+    ('joint_type', 'U16'), ('torque', float), ('limited', bool), ('lower', float), ('upper', float),
+])
+LOAD_DTYPE = np.dtype([('joint', np.int64), ('torque', float)])
+
+# 모델 파일: .json은 직접 편집하기 위한 요소별 레코드, .npz는 큰 모델을 위한 구조화 배열 그대로.
+# 버전 2부터 시간에 따라 변하는 하중 신호(signals), 버전 3부터 조인트 각도 제한을 함께 저장한다
+MODEL_FORMAT_VERSION = 3
+# .npz에 배열로 따로 저장하는 신호 필드 (표 신호의 표본)
+SIGNAL_ARRAYS = ('times', 'values')
+# add_* 로 행을 추가할 때 배열 용량의 최솟값 (이후 두 배씩 늘린다)
+MIN_CAPACITY = 16
+
+
+class Model:
+    def __init__(self, bodies=None, joints=None, loads=None, signals=None):
+        # bodies/joints/loads는 용량이 더 큰 버퍼의 앞부분 뷰. add_*는 버퍼를 두 배씩 키워 분할 상환 O(1)
+        self._buffers = {'bodies': np.zeros(0, BODY_DTYPE), 'joints': np.zeros(0, JOINT_DTYPE),
+                         'loads': np.zeros(0, LOAD_DTYPE)}
+        self._counts = dict.fromkeys(self._buffers, 0)
+        # 하중 인덱스 -> 시간 신호 (dynamics.signals). 하중 토크는 loads['torque'] + signal(t)
+        self.signals = {}
+        if bodies is not None:
+            self.add_bodies(bodies)
+        if joints is not None:
+            self.add_joints(joints)
+        if loads is not None:
+            self.add_loads(loads)
+        self.signals.update(signals or {})
+        self.validate()
+
+    @property
+    def bodies(self):
+        return self._rows('bodies')
+
+    @bodies.setter
+    def bodies(self, bodies):
+        self._set_rows('bodies', _structured(bodies, BODY_DTYPE))
+
+    @property
+    def joints(self):
+        return self._rows('joints')
+
+    @joints.setter
+    def joints(self, joints):
+        self._set_rows('joints', _structured(joints, JOINT_DTYPE))
+
+    @property
+    def loads(self):
+        return self._rows('loads')
+
+    @loads.setter
+    def loads(self, loads):
+        self._set_rows('loads', _structured(loads, LOAD_DTYPE))
+
+    def _rows(self, name):
+        return self._buffers[name][:self._counts[name]]
+
+    def _set_rows(self, name, rows):
+        self._buffers[name] = rows
+        self._counts[name] = len(rows)
+
+    def _append(self, name, rows):
+        # rows를 버퍼 끝에 복사하고 첫 행의 인덱스를 반환. 용량이 모자라면 두 배 이상으로 새로 할당
+        buffer, count = self._buffers[name], self._counts[name]
+        if count + len(rows) > len(buffer):
+            grown = np.zeros(max(2 * len(buffer), count + len(rows), MIN_CAPACITY), buffer.dtype)
+            grown[:count] = buffer[:count]
+            self._buffers[name] = buffer = grown
+        buffer[count:count + len(rows)] = rows
+        self._counts[name] = count + len(rows)
+        return count
+
+    @property
+    def num_bodies(self):
+        return len(self.bodies)
+
+    @property
+    def num_joints(self):
+        return len(self.joints)
+
+    @property
+    def num_loads(self):
+        return len(self.loads)
+
+    def validate(self):
+        joint_bodies = np.concatenate((self.joints['body1'], self.joints['body2']))
+        if joint_bodies.size and (joint_bodies.min() < 0 or joint_bodies.max() >= self.num_bodies):
+            raise ValueError("조인트가 존재하지 않는 바디를 참조합니다.")
+        if self.num_loads and (self.loads['joint'].min() < 0 or self.loads['joint'].max() >= self.num_joints):
+            raise ValueError("하중이 존재하지 않는 조인트를 참조합니다.")
+        if any(not 0 <= load < self.num_loads for load in self.signals):
+            raise ValueError("신호가 존재하지 않는 하중을 참조합니다.")
+        limited = self.joints['limited']
+        if (self.joints['lower'][limited] > self.joints['upper'][limited]).any():
+            joint = int(np.flatnonzero(limited & (self.joints['lower'] > self.joints['upper']))[0])
+            raise ValueError(f"조인트 {joint + 1}의 각도 제한 하한이 상한보다 큽니다.")
+
+    def add_body(self, point1, point2, mass, inertia, center=None):
+        (x1, y1), (x2, y2) = point1, point2
+        cx, cy = center if center is not None else ((x1 + x2) / 2, (y1 + y2) / 2)
+        length = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
+        row = np.array((x1, y1, x2, y2, cx, cy, mass, inertia, length), dtype=BODY_DTYPE)
+        return self._append('bodies', row[np.newaxis])
+
+    def add_joint(self, body1, body2, position, joint_type='Hinge', torque=0.0, limits=None):
+        # limits: 자식 바디 상대각의 (하한, 상한) [rad], None이면 제한 없음
+        if not (0 <= body1 < self.num_bodies and 0 <= body2 < self.num_bodies):
+            raise ValueError("조인트가 존재하지 않는 바디를 참조합니다.")
+        lower, upper = limits if limits is not None else (0.0, 0.0)
+        if lower > upper:
+            raise ValueError("각도 제한의 하한이 상한보다 큽니다.")
+        row = np.array((body1, body2, position[0], position[1], joint_type, torque, limits is not None, lower, upper),
+                       dtype=JOINT_DTYPE)
+        return self._append('joints', row[np.newaxis])
+
+    def add_load(self, joint, torque, signal=None):
+        if not 0 <= joint < self.num_joints:
+            raise ValueError("하중이 존재하지 않는 조인트를 참조합니다.")
+        load = self._append('loads', np.array([(joint, torque)], dtype=LOAD_DTYPE))
+        if signal is not None:
+            self.signals[load] = signal
+        return load
+
+    def add_bodies(self, bodies):
+        # 구조화 배열(BODY_DTYPE 또는 이전 버전 필드)의 행을 한 번에 추가하고 첫 바디의 인덱스를 반환
+        return self._append('bodies', _structured(bodies, BODY_DTYPE))
+
+    def add_joints(self, joints):
+        joints = _structured(joints, JOINT_DTYPE)
+        joint_bodies = np.concatenate((joints['body1'], joints['body2']))
+        if joint_bodies.size and (joint_bodies.min() < 0 or joint_bodies.max() >= self.num_bodies):
+            raise ValueError("조인트가 존재하지 않는 바디를 참조합니다.")
+        inverted = joints['limited'] & (joints['lower'] > joints['upper'])
+        if inverted.any():
+            joint = self.num_joints + int(np.flatnonzero(inverted)[0])
+            raise ValueError(f"조인트 {joint + 1}의 각도 제한 하한이 상한보다 큽니다.")
+        return self._append('joints', joints)
+
+    def add_loads(self, loads, signals=None):
+        # signals: 추가하는 하중 안에서의 인덱스 -> 신호
+        loads = _structured(loads, LOAD_DTYPE)
+        if loads.size and (loads['joint'].min() < 0 or loads['joint'].max() >= self.num_joints):
+            raise ValueError("하중이 존재하지 않는 조인트를 참조합니다.")
+        first = self._append('loads', loads)
+        for load, signal in (signals or {}).items():
+            self.signals[first + load] = signal
+        return first
+
+    def content_hash(self):
+        # 모델 내용의 해시 (체크포인트가 같은 모델에서 나왔는지 확인). 신호는 설명과 표본 배열을 함께 해시
+        import hashlib
+        import json
+
+        digest = hashlib.sha256()
+        for array in (self.bodies, self.joints, self.loads):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        for load, signal in sorted(self.signals.items()):
+            spec = signal.to_spec()
+            for name in SIGNAL_ARRAYS:
+                if name in spec:
+                    digest.update(np.ascontiguousarray(spec.pop(name), dtype=float).tobytes())
+            digest.update(json.dumps({'load': load, **spec}, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()[:32]
+
+    def tree(self):
+        # 조인트 그래프에서 만든 신장 트리 (dynamics.topology.KinematicTree)
+        from dynamics.topology import kinematic_tree
+        return kinematic_tree(self)
+
+    def load_bodies(self, tree=None):
+        # 하중은 조인트가 구동하는 자식 바디의 프레임에 토크로 작용
+        tree = tree if tree is not None else self.tree()
+        bodies = tree.joint_bodies[self.loads['joint']]
+        if (bodies < 0).any():
+            joint = int(self.loads['joint'][np.argmax(bodies < 0)])
+            raise ValueError(f"하중이 트리에 포함되지 않은 조인트 {joint + 1}에 작용합니다.")
+        return bodies
+
+    def body_torques(self, tree=None):
+        # 하중의 상수 부분 (신호는 torque_inputs)
+        torques = np.zeros(self.num_bodies)
+        np.add.at(torques, self.load_bodies(tree), self.loads['torque'])
+        return torques
+
+    def torque_inputs(self, tree=None):
+        # 신호가 있는 하중들의 바디별 입력 (dynamics.signals.TorqueInputs), 없으면 None
+        if not self.signals:
+            return None
+        from dynamics.signals import TorqueInputs
+
+        bodies = self.load_bodies(tree)
+        loads = sorted(self.signals)
+        return TorqueInputs(self.num_bodies, bodies[loads], [self.signals[load] for load in loads])
+
+    @classmethod
+    def from_items(cls, body_items, joints, loads):
+        # 작업 공간의 BodyItem/Joint/Load 객체를 배열로 변환 (QPointF 값은 한 번만 읽는다)
+        bodies = np.zeros(len(body_items), BODY_DTYPE)
+        body_index = {}
+        for i, body_item in enumerate(body_items):
+            body = body_item.body
+            body_index[id(body)] = i
+            bodies[i] = (body.point1.x(), body.point1.y(), body.point2.x(), body.point2.y(),
+                         body.center.x(), body.center.y(), body.mass, body.inertia, body.length)
+
+        joint_array = np.zeros(len(joints), JOINT_DTYPE)
+        joint_index = {}
+        for i, joint in enumerate(joints):
+            joint_index[id(joint)] = i
+            try:
+                body1, body2 = body_index[id(joint.body1)], body_index[id(joint.body2)]
+            except KeyError:
+                raise ValueError(f"조인트 {i + 1}가 모델에 없는 바디를 참조합니다.") from None
+            limited = joint.lower_limit is not None or joint.upper_limit is not None
+            lower, upper = 0.0, 0.0
+            if limited:
+                lower = -np.inf if joint.lower_limit is None else joint.lower_limit
+                upper = np.inf if joint.upper_limit is None else joint.upper_limit
+            joint_array[i] = (body1, body2, joint.position.x(), joint.position.y(),
+                              joint.joint_type, joint.torque, limited, lower, upper)
+
+        load_array = np.zeros(len(loads), LOAD_DTYPE)
+        signals = {}
+        for i, load in enumerate(loads):
+            try:
+                load_array[i] = (joint_index[id(load.joint)], load.torque)
+            except KeyError:
+                raise ValueError(f"하중 {i + 1}이 모델에 없는 조인트를 참조합니다.") from None
+            if load.signal is not None:
+                signals[i] = load.signal
+        return cls(bodies, joint_array, load_array, signals)
+
+    def to_items(self):
+        # 작업 공간에서 사용하는 (BodyItem 리스트, Joint 리스트, Load 리스트)로 변환.
+        # 그래픽 항목은 만들지 않는다 (graphics=None).
+        from PySide6.QtCore import QPointF
+        from dynamics.body import Body
+        from dynamics.joint import Joint
+        from dynamics.load import Load
+        from visualization.workspace import BodyItem
+
+        body_items = []
+        for row in self.bodies.tolist():
+            x1, y1, x2, y2, cx, cy, mass, inertia, _ = row
+            body = Body(QPointF(x1, y1), QPointF(x2, y2), QPointF(cx, cy), mass, inertia)
+            body_items.append(BodyItem(body, None))
+
+        joints = []
+        for body1, body2, x, y, joint_type, torque, limited, lower, upper in self.joints.tolist():
+            joint = Joint(body_items[body1].body, body_items[body2].body, QPointF(x, y), joint_type, torque)
+            if limited:
+                joint.lower_limit = None if np.isneginf(lower) else lower
+                joint.upper_limit = None if np.isposinf(upper) else upper
+            joints.append(joint)
+
+        loads = [Load(joints[joint], torque, self.signals.get(i))
+                 for i, (joint, torque) in enumerate(self.loads.tolist())]
+        return body_items, joints, loads
+
+
+def save_model(model, path):
+    import json
+
+    if path.endswith('.npz'):
+        # 신호 설명은 JSON 문자열로, 표 신호의 표본은 signal<k>_times 같은 배열로 따로 저장
+        signals, arrays = [], {}
+        for k, (load, signal) in enumerate(sorted(model.signals.items())):
+            spec = signal.to_spec()
+            for name in SIGNAL_ARRAYS:
+                if name in spec:
+                    arrays[f'signal{k}_{name}'] = np.asarray(spec.pop(name), dtype=float)
+            signals.append({'load': load, **spec})
+        np.savez(path, version=MODEL_FORMAT_VERSION, bodies=model.bodies, joints=model.joints, loads=model.loads,
+                 signals=json.dumps(signals), **arrays)
+        return
+
+    def records(array):
+        return [dict(zip(array.dtype.names, row)) for row in array.tolist()]
+
+    signals = []
+    for load, signal in sorted(model.signals.items()):
+        spec = signal.to_spec()
+        for name in SIGNAL_ARRAYS:
+            if name in spec:
+                spec[name] = np.asarray(spec[name], dtype=float).tolist()
+        signals.append({'load': load, **spec})
+    data = {'version': MODEL_FORMAT_VERSION, 'bodies': records(model.bodies),
+            'joints': records(model.joints), 'loads': records(model.loads), 'signals': signals}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_model(path):
+    import json
+
+    if path.endswith('.npz'):
+        with np.load(path) as archive:
+            _check_version(int(archive['version']), path)
+            signals = json.loads(str(archive['signals'])) if 'signals' in archive else []
+            for k, spec in enumerate(signals):
+                for name in SIGNAL_ARRAYS:
+                    if f'signal{k}_{name}' in archive:
+                        spec[name] = archive[f'signal{k}_{name}']
+            return Model(archive['bodies'], archive['joints'], archive['loads'], _signals(signals, path))
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    _check_version(data.get('version', MODEL_FORMAT_VERSION), path)
+
+    def array(name, dtype):
+        # 생략된 필드는 0 (joint_type은 'Hinge'), length는 끝점에서 다시 계산
+        result = np.zeros(len(data.get(name, [])), dtype)
+        if 'joint_type' in dtype.names:
+            result['joint_type'] = 'Hinge'
+        for i, record in enumerate(data.get(name, [])):
+            unknown = set(record) - set(dtype.names)
+            if unknown:
+                raise ValueError(f"{path}: {name}[{i}]에 알 수 없는 필드가 있습니다: {', '.join(sorted(unknown))}")
+            for key, value in record.items():
+                result[key][i] = value
+        return result
+
+    bodies = array('bodies', BODY_DTYPE)
+    bodies['length'] = np.hypot(bodies['x2'] - bodies['x1'], bodies['y2'] - bodies['y1'])
+    return Model(bodies, array('joints', JOINT_DTYPE), array('loads', LOAD_DTYPE),
+                 _signals(data.get('signals', []), path))
+
+
+def _signals(records, path):
+    # [{'load': 하중 인덱스, 'type': ..., ...}] -> {하중 인덱스: 신호}
+    from dynamics.signals import make_signal
+
+    signals = {}
+    for i, record in enumerate(records):
+        spec = dict(record)
+        try:
+            load = int(spec.pop('load'))
+            signals[load] = make_signal(spec)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path}: signals[{i}]가 올바르지 않습니다: {e}") from None
+    return signals
+
+
+def _structured(values, dtype):
+    # 이전 버전 파일의 구조화 배열은 이름이 같은 필드만 옮긴다 (새 필드는 0, 조인트는 제한 없음)
+    values = np.asarray(values)
+    if values.dtype.names is None or values.dtype == dtype:
+        return np.asarray(values, dtype=dtype)
+    result = np.zeros(values.shape, dtype)
+    for name in values.dtype.names:
+        if name in dtype.names:
+            result[name] = values[name]
+    return result
+
+
+def _check_version(version, path):
+    if version > MODEL_FORMAT_VERSION:
+        raise ValueError(f"{path}: 지원하지 않는 모델 파일 버전입니다 ({version}).")
@@ -0,0 +1,131 @@
+# dynamics/result_cache.py
+import hashlib
+import json
+import os
+from collections import OrderedDict
+import numpy as np
+
+# 적분기나 모델 해석이 바뀌면 올려서 이전 결과가 재사용되지 않도록 한다
+RESULT_CACHE_VERSION = 1
+DEFAULT_RESULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'multibody_dynamics', 'results')
+ENTRY_ARRAYS = ('t', 'solution', 'event_times', 'event_states')
+
+
+def result_key(model_hash, settings):
+    # settings: 궤적을 결정하는 설정 (JSON으로 직렬화 가능한 값)
+    payload = json.dumps({'version': RESULT_CACHE_VERSION, 'model': model_hash, 'settings': settings},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class ResultCache:
+    # 모델/설정 해시를 키로 하는 시뮬레이션 결과 캐시: 바이트 수로 제한한 메모리 LRU + 크기 제한이 있는 디스크 저장소.
+    # 항목은 배열 dict {'t', 'solution', 'event_times', 'event_states'}
+    def __init__(self, cache_dir=None, max_memory_bytes=256 * 1024 * 1024, max_disk_bytes=1024 * 1024 * 1024):
+        self.cache_dir = cache_dir or os.environ.get('MBD_RESULT_CACHE_DIR', DEFAULT_RESULT_CACHE_DIR)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+
+    def get(self, key):
+        # (항목, 'memory' | 'disk') 또는 (None, None)
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry, 'memory'
+        entry = self._load(key)
+        if entry is None:
+            return None, None
+        self._remember(key, entry)
+        return entry, 'disk'
+
+    def put(self, key, entry):
+        # 캐시된 배열은 여러 실행이 공유하므로 복사해 읽기 전용으로 만든다
+        entry = {name: np.array(entry[name], dtype=float) for name in ENTRY_ARRAYS}
+        for array in entry.values():
+            array.setflags(write=False)
+        self._remember(key, entry)
+        self._store(key, entry)
+
+    def clear(self, disk=False):
+        self._memory.clear()
+        self._memory_bytes = 0
+        if disk and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _remember(self, key, entry):
+        # 한 항목이 메모리 한도보다 크면 디스크에만 둔다
+        size = _entry_bytes(entry)
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= _entry_bytes(self._memory.pop(key))
+        self._memory[key] = entry
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _entry_bytes(evicted)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with np.load(path) as archive:
+                entry = {name: archive[name] for name in ENTRY_ARRAYS}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 손상된 항목은 버리고 다시 계산한다
+            print(f"Discarding unreadable result cache entry {path}: {e}")
+            os.remove(path)
+            return None
+        for array in entry.values():
+            array.setflags(write=False)
+        os.utime(path)
+        return entry
+
+    def _store(self, key, entry):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+            np.savez(tmp_path, **entry)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError as e:
+            # 디스크 캐시는 선택 사항이므로 실패해도 메모리 캐시로 계속 진행
+            print(f"Could not write result cache entry: {e}")
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npz') and not name.endswith('.tmp.npz'):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        # 가장 오래전에 사용된 항목부터 제거 (가장 최근 항목 하나는 남긴다)
+        for _, size, path in sorted(entries)[:-1]:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+def _entry_bytes(entry):
+    return sum(array.nbytes for array in entry.values())
+
+
+_default_cache = None
+
+
+def default_result_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
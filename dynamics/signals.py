@@ -0,0 +1,212 @@
+# dynamics/signals.py
+import bisect
+import numpy as np
+
+# 시간에 따라 변하는 하중 토크. 모든 신호는 스칼라 t에 대해 float, 배열 t에 대해 같은 모양의 배열을 반환하고,
+# to_spec()으로 모델 파일에 저장할 수 있는 dict가 된다 (make_signal로 복원).
+INTERPOLATIONS = ('linear', 'cubic')
+
+# 식 신호에서 쓸 수 있는 이름 (모두 NumPy 함수라 배열 t에도 그대로 벡터화된다)
+EXPRESSION_NAMES = ('sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'arctan2', 'sinh', 'cosh', 'tanh',
+                    'exp', 'log', 'log10', 'sqrt', 'abs', 'sign', 'floor', 'ceil', 'mod', 'minimum', 'maximum',
+                    'clip', 'where', 'heaviside', 'pi', 'e')
+
+
+class TabulatedSignal:
+    # 표본 (times, values)를 선형 또는 3차 스플라인으로 보간하고, 범위 밖에서는 끝값을 유지한다.
+    # 구간별 다항식 계수(선형은 기울기, 3차는 스플라인 계수)를 미리 계산해 두고,
+    # 스칼라 호출은 균일 간격이면 나눗셈 한 번, 아니면 직전 구간에서 시작하는 탐색으로 구간을 찾는다.
+    # 적분기는 시간을 거의 단조롭게 진행하므로 표본이 수백만 개여도 호출 비용이 일정하다.
+    def __init__(self, times, values, kind='linear'):
+        times = np.ascontiguousarray(times, dtype=float)
+        values = np.ascontiguousarray(values, dtype=float)
+        if times.ndim != 1 or len(times) < 2:
+            raise ValueError("표 신호에는 두 개 이상의 표본이 필요합니다.")
+        if values.shape != times.shape:
+            raise ValueError("표 신호의 시각과 값의 개수가 다릅니다.")
+        steps = np.diff(times)
+        if (steps <= 0).any():
+            raise ValueError("표 신호의 시각은 순증가해야 합니다.")
+        if kind not in INTERPOLATIONS:
+            raise ValueError(f"알 수 없는 보간 방식입니다: {kind}")
+        self.times = times
+        self.values = values
+        self.kind = kind
+        self.start, self.end = float(times[0]), float(times[-1])
+        self.step = float(steps[0]) if np.allclose(steps, steps[0], rtol=1e-9, atol=0.0) else None
+
+        # coefficients[i]: 구간 i에서 (t - times[i])에 대한 다항식 계수 (높은 차수부터)
+        if kind == 'linear':
+            self.coefficients = np.column_stack((np.diff(values) / steps, values[:-1]))
+        else:
+            from scipy.interpolate import CubicSpline
+            self.coefficients = np.ascontiguousarray(CubicSpline(times, values).c.T)
+        self._last = 0
+
+    def interval(self, t):
+        last = len(self.times) - 2
+        if self.step is not None:
+            return min(max(int((t - self.start) / self.step), 0), last)
+        i = self._last
+        times = self.times
+        if times.item(i) <= t:
+            # 대부분 같은 구간이거나 바로 다음 구간
+            if i == last or t < times.item(i + 1):
+                return i
+            if i + 1 == last or t < times.item(i + 2):
+                self._last = i + 1
+                return i + 1
+        i = min(max(int(times.searchsorted(t, side='right')) - 1, 0), last)
+        self._last = i
+        return i
+
+    def __call__(self, t):
+        if not isinstance(t, float) and np.ndim(t):
+            t = np.clip(np.asarray(t, dtype=float), self.start, self.end)
+            index = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, len(self.times) - 2)
+            dt = t - self.times[index]
+            coefficients = self.coefficients[index]
+            result = coefficients[..., 0]
+            for k in range(1, coefficients.shape[-1]):
+                result = result * dt + coefficients[..., k]
+            return result
+        # 스칼라 경로는 NumPy 스칼라를 만들지 않도록 item()으로 파이썬 float만 다룬다
+        t = min(max(float(t), self.start), self.end)
+        i = self.interval(t)
+        dt = t - self.times.item(i)
+        c = self.coefficients
+        if self.kind == 'linear':
+            return c.item(i, 0) * dt + c.item(i, 1)
+        return ((c.item(i, 0) * dt + c.item(i, 1)) * dt + c.item(i, 2)) * dt + c.item(i, 3)
+
+    def to_spec(self):
+        return {'type': 'table', 'times': self.times, 'values': self.values, 'kind': self.kind}
+
+
+class ExpressionSignal:
+    # t에 대한 NumPy 식 (예: "2 * sin(3 * t) * exp(-t)"). 한 번 컴파일해 두고 매 호출은 eval 한 번
+    def __init__(self, expression):
+        self.expression = expression
+        self._compile()
+
+    def _compile(self):
+        try:
+            self.code = compile(self.expression, '<signal>', 'eval')
+        except SyntaxError as e:
+            raise ValueError(f"잘못된 식입니다: {self.expression} ({e.msg})") from None
+        unknown = set(self.code.co_names) - set(EXPRESSION_NAMES) - {'t'}
+        if unknown:
+            raise ValueError(f"식에 알 수 없는 이름이 있습니다: {', '.join(sorted(unknown))}")
+        self.namespace = {'__builtins__': {}}
+        self.namespace.update((name, getattr(np, name)) for name in EXPRESSION_NAMES)
+
+    def __call__(self, t):
+        value = eval(self.code, self.namespace, {'t': t})
+        if np.ndim(t):
+            return np.broadcast_to(np.asarray(value, dtype=float), np.shape(t))
+        return float(value)
+
+    def to_spec(self):
+        return {'type': 'expression', 'expression': self.expression}
+
+    # 컴파일된 코드 객체는 피클할 수 없으므로 식만 보내고 받는 쪽에서 다시 컴파일 (앙상블 워커용)
+    def __getstate__(self):
+        return {'expression': self.expression}
+
+    def __setstate__(self, state):
+        self.expression = state['expression']
+        self._compile()
+
+
+class PiecewiseSignal:
+    # 경계 breaks로 나뉜 구간마다 상수나 식. 구간 i는 breaks[i - 1] <= t < breaks[i] (len(pieces) == len(breaks) + 1)
+    def __init__(self, breaks, pieces):
+        self.breaks = [float(b) for b in breaks]
+        if len(pieces) != len(self.breaks) + 1:
+            raise ValueError("구간 함수의 개수는 경계 개수보다 하나 많아야 합니다.")
+        if any(b2 <= b1 for b1, b2 in zip(self.breaks, self.breaks[1:])):
+            raise ValueError("구간 경계는 순증가해야 합니다.")
+        self.pieces = [piece if isinstance(piece, str) else float(piece) for piece in pieces]
+        self._evaluators = [ExpressionSignal(piece) if isinstance(piece, str) else piece for piece in self.pieces]
+
+    def __call__(self, t):
+        if np.ndim(t):
+            t = np.asarray(t, dtype=float)
+            index = np.searchsorted(self.breaks, t, side='right')
+            result = np.empty(t.shape)
+            for i, piece in enumerate(self._evaluators):
+                mask = index == i
+                if mask.any():
+                    result[mask] = piece(t[mask]) if callable(piece) else piece
+            return result
+        piece = self._evaluators[bisect.bisect_right(self.breaks, t)]
+        return piece(t) if callable(piece) else piece
+
+    def to_spec(self):
+        return {'type': 'piecewise', 'breaks': self.breaks, 'pieces': self.pieces}
+
+
+def make_signal(spec):
+    kind = spec.get('type')
+    if kind == 'table':
+        return TabulatedSignal(spec['times'], spec['values'], spec.get('kind', 'linear'))
+    if kind == 'expression':
+        return ExpressionSignal(spec['expression'])
+    if kind == 'piecewise':
+        return PiecewiseSignal(spec['breaks'], spec['pieces'])
+    raise ValueError(f"알 수 없는 신호 형식입니다: {kind}")
+
+
+class TorqueInputs:
+    # 시간에 따라 변하는 하중들을 바디별 토크 벡터로 모은다 (상수 하중은 파라미터 T에 그대로 남는다).
+    # bodies[k]는 신호 k가 작용하는 바디
+    def __init__(self, num_bodies, bodies, signals):
+        self.num_bodies = num_bodies
+        self.bodies = [int(body) for body in bodies]
+        self.signals = list(signals)
+
+    def __call__(self, t):
+        torques = np.zeros(self.num_bodies)
+        for body, signal in zip(self.bodies, self.signals):
+            torques[body] += signal(t)
+        return torques
+
+    def sample(self, times):
+        # 여러 시각에서 한 번에 평가한 (len(times), num_bodies) 배열 (그래프, 검사용)
+        times = np.asarray(times, dtype=float)
+        torques = np.zeros((len(times), self.num_bodies))
+        for body, signal in zip(self.bodies, self.signals):
+            torques[:, body] += signal(times)
+        return torques
+
+    def remap(self, index, num_bodies):
+        # 바디 i의 신호를 index[i]로 옮긴다 (복합 바디 축약용, index < 0인 바디의 신호는 버린다)
+        pairs = [(int(index[body]), signal) for body, signal in zip(self.bodies, self.signals) if index[body] >= 0]
+        return TorqueInputs(num_bodies, [body for body, _ in pairs], [signal for _, signal in pairs])
+
+
+class InputRHS:
+    # 우변(또는 자코비안) 평가기의 토크 파라미터를 매 호출마다 '상수 토크 + 입력 신호 값'으로 바꾼다.
+    # contacts(y)가 주어지면 (dynamics.contact.ContactModel, 단일 실행만) 상태에 따른 접촉 토크도 더한다.
+    # evaluator.parameters는 리스트(배치 평가기면 배열의 리스트) 또는 NumPy 배열
+    def __init__(self, evaluator, inputs, torque_slice, contacts=None):
+        self.evaluator = evaluator
+        self.inputs = inputs
+        self.contacts = contacts
+        self.torque_slice = torque_slice
+        base = evaluator.parameters[torque_slice]
+        self.base = base.copy() if isinstance(base, np.ndarray) else list(base)
+
+    @property
+    def parameters(self):
+        return self.evaluator.parameters
+
+    def __call__(self, y, t):
+        torques = self.inputs(t) if self.inputs is not None else 0.0
+        if self.contacts is not None:
+            torques = torques + self.contacts(y)
+        if isinstance(self.base, np.ndarray):
+            self.evaluator.parameters[self.torque_slice] = self.base + torques
+        else:
+            self.evaluator.parameters[self.torque_slice] = [b + v for b, v in zip(self.base, torques.tolist())]
+        return self.evaluator(y, t)
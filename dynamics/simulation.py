@@ -1,109 +1,154 @@
-from pydy.system import System
-from sympy.physics.mechanics import dynamicsymbols, ReferenceFrame, Point, RigidBody, inertia, KanesMethod
-from sympy import symbols
+import os
 import numpy as np
-import matplotlib.pyplot as plt
+from dynamics.articulated import ArticulatedChain
+from dynamics.checkpoint import CheckpointTimer, load_checkpoint, save_checkpoint
+from dynamics.composite import CompositeReduction
+from dynamics.contact import CONTACT_DEFAULTS, ContactModel
+from dynamics.equations import tree_topology
+from dynamics.eom_cache import get_equations, topology_key
+from dynamics.linear import PROPAGATIONS, hanging_pose, linearize, static_equilibrium
+from dynamics.metrics import SimulationMetrics, profiling
+from dynamics.model import Model
+from dynamics.result_cache import default_result_cache, result_key
+from dynamics.signals import InputRHS
+from dynamics.trajectory import TrajectorySink
+
+SOLVERS = ('odeint', 'RK45', 'DOP853', 'Radau', 'BDF', 'LSODA')
+IMPLICIT_SOLVERS = ('Radau', 'BDF', 'LSODA')
+# 명시적 Runge-Kutta 방법의 (시도한 스텝당 우변 평가 수, 채택된 스텝당 연속 해 추가 평가 수).
+# solve_ivp는 기각된 스텝 수를 알려 주지 않으므로 nfev에서 역산한다
+EXPLICIT_STAGE_EVALS = {'RK45': (6, 0), 'DOP853': (12, 3)}
+
+
+class SimulationCancelled(Exception):
+    pass
+
+
+def joint_angle_event(threshold, coordinates):
+    # 지정한 좌표 중 하나라도 |q| >= threshold가 되면 적분을 멈추는 solve_ivp 이벤트
+    coordinates = list(coordinates)
+
+    def event(t, y):
+        return threshold - np.max(np.abs(y[coordinates]))
+
+    event.terminal = True
+    event.direction = -1
+    return event
+
+
+def _sink_state(meta, arrays):
+    # 체크포인트에 나눠 저장한 TrajectorySink.state()를 다시 합친다
+    state = dict(meta['sink'])
+    state.update((key, arrays.get(f'sink_{key}')) for key in ('minimum', 'maximum', 'sum_squares', 'final_state'))
+    return state
+
+
+def integrate_batch(eom, masses, inertias, lengths, torques, g, initial_conditions, t, parents=None, offsets=None,
+                    inputs=None):
+    # 바디별 파라미터는 (n, batch), g는 (batch,) 배열. eom이 None이면 관절체 엔진을 사용
+    # (parents: 트리 부모 배열, offsets: 복합 바디 모델의 조인트 위치, inputs: 모든 변형에 공통인 입력 토크).
+    # 반환값은 (batch, time, state) 배열
+    from scipy.integrate import odeint
+
+    num_states = 2 * masses.shape[0]
+    batch_size = g.shape[0]
+    if initial_conditions is None:
+        initial_conditions = np.zeros(num_states)
+    initial_conditions = np.broadcast_to(np.asarray(initial_conditions, dtype=float), (batch_size, num_states))
+
+    if eom is None:
+        batch_rhs = ArticulatedChain(masses, inertias, lengths, torques, g=g, parents=parents, offsets=offsets,
+                                     inputs=inputs).rhs
+    else:
+        parameters = eom.parameter_vector(masses, inertias, lengths, torques, g, offsets)
+        batch_rhs = eom.batch_rhs_evaluator(parameters)
+        if inputs is not None:
+            batch_rhs = InputRHS(batch_rhs, inputs, eom.torque_slice)
+
+    # 상태는 (batch, 2n)을 평탄화한 벡터. 각 변형은 자기 블록 안에서만 결합하므로
+    # 자코비안 대역폭을 알려 주면 odeint가 배치 크기와 무관한 비용으로 자코비안을 근사한다
+    def equations(y, t):
+        return batch_rhs(y.reshape(batch_size, num_states).T, t).T.ravel()
+
+    solution = odeint(equations, initial_conditions.ravel(), t,
+                      ml=num_states - 1, mu=num_states - 1)
+    return solution.reshape(len(t), batch_size, num_states).transpose(1, 0, 2)
+
 
 class Simulation:
-    def __init__(self, settings, bodies, joints, loads):
+    def __init__(self, settings, bodies=None, joints=None, loads=None, model=None):
         self.time_step = settings['time_step']
         self.duration = settings['duration']
         self.bodies = bodies        # BodyItem 객체들의 리스트
         self.joints = joints        # Joint 객체들의 리스트
         self.loads = loads          # Load 객체들의 리스트
+        # 계산은 배열 기반 모델로만 한다 (작업 공간 객체가 주어지면 한 번 변환, 헤드리스 실행은 model만 전달)
+        self.model = model if model is not None else Model.from_items(bodies or [], joints or [], loads or [])
+        # 조인트 그래프의 신장 트리: 바디 i의 부모는 tree.parents[i] (직렬 체인은 i - 1)
+        self.tree = self.model.tree()
+        # Fixed 조인트로 용접된 바디는 복합 바디 하나로 합쳐 적분하고 결과는 바디별 상태로 되돌린다
+        self.reduction = CompositeReduction.from_model(self.model, self.tree)
+        # 시간에 따라 변하는 하중 (축약 바디별 TorqueInputs, 신호가 없으면 None). 실행 시 check_tree 다음에 정해진다
+        self.inputs = None
+        self.g = settings.get('gravity', 9.81)
+        self.backend = settings.get('backend', 'lambdify')
+        self.eom_form = settings.get('eom_form', 'rhs')
+        # 'symbolic': Kane 방정식 유도, 'articulated': SymPy 없는 O(n) 수치 엔진
+        self.engine = settings.get('engine', 'symbolic')
+        # 결과 파일 (.npy 메모리 맵 또는 .h5), 기록 간격과 기록할 상태 인덱스
+        self.output_path = settings.get('output_path') or None
+        self.decimation = settings.get('decimation', 1)
+        self.record_coordinates = settings.get('record_coordinates')
+        self.chunk_samples = settings.get('chunk_samples', 4096)
+        # 구간별 적분에서 적분기를 다시 시작하는 간격(시뮬레이션 초). 경계가 time_step으로만 정해지고 duration과
+        # 무관하므로, duration을 늘려 연장한 실행도 처음부터 긴 duration으로 한 실행과 같은 지점에서 다시 시작한다
+        self.chunk_duration = settings.get('chunk_duration', 1.0)
+        self.summary = None
+        # 적분기: 'odeint' 또는 solve_ivp 방법, 허용 오차와 종료 이벤트
+        self.solver = settings.get('solver', 'odeint')
+        if self.solver not in SOLVERS:
+            raise ValueError(f"알 수 없는 적분기입니다: {self.solver}")
+        self.rtol = settings.get('rtol')
+        self.atol = settings.get('atol')
+        self.stop_angle = settings.get('stop_angle')
+        self.events = settings.get('events', [])
+        self.solver_stats = {}
+        self.dense_solutions = []
+        self.triggered_events = []
+        # 단계별 시간/카운터. profile: None, 'cprofile' 또는 'sampling'
+        self.metrics = SimulationMetrics()
+        self.profile = settings.get('profile')
+        self.profile_path = settings.get('profile_path')
+        # 체크포인트 파일 (.npz)과 기록 간격(벽시계 초). resume이면 그 파일에서 이어서 실행한다
+        # (duration을 늘려 연장하는 것도 가능)
+        self.checkpoint_path = settings.get('checkpoint_path') or None
+        self.checkpoint_interval = settings.get('checkpoint_interval', 60.0)
+        self.resume = settings.get('resume', False)
+        if self.resume and self.checkpoint_path is None:
+            raise ValueError("이어서 실행하려면 체크포인트 파일(checkpoint_path)이 필요합니다.")
+        self.resumed_from = None
+        # 초기 상태 (바디별 2n 벡터, 생략하면 0)
+        self.initial_state = settings.get('initial_state')
+        # 선형화 모드: None(비선형 적분), 'expm' 또는 'modal' 전파. operating_point는 바디별 좌표(n) 또는
+        # 상태(2n), 생략하면 늘어진 자세에서 찾은 정적 평형점. 실행 후 self.linear에 선형 모델이 남는다
+        self.linearization = settings.get('linearization')
+        if self.linearization is not None and self.linearization not in PROPAGATIONS:
+            raise ValueError(f"알 수 없는 선형화 전파 방식입니다: {self.linearization}")
+        self.operating_point = settings.get('operating_point')
+        self.linear = None
+        # 결과 캐시 사용 여부 (GUI에서 같은 모델을 다시 실행할 때), 적중하면 result_source는 'memory' 또는 'disk'
+        self.use_result_cache = settings.get('result_cache', False)
+        self.result_source = None
+        # 접촉 (dynamics.contact): floor_height가 있으면 바닥 y = floor_height와의 접촉, self_collision이면 링크끼리의
+        # 접촉. 조인트 각도 제한은 모델에 있다 (joints['limited']). 벌점 힘 계수는 CONTACT_DEFAULTS의 이름으로 지정
+        self.floor_height = settings.get('floor_height')
+        self.self_collision = settings.get('self_collision', False)
+        self.contact_parameters = {key: settings[key] for key in CONTACT_DEFAULTS if key in settings}
+        self.contacts = None
 
     def run(self):
         try:
-            # Step 1: 조인트가 정의되었는지 확인
-            if not self.joints:
-                raise ValueError("시스템에 조인트가 정의되지 않았습니다.")
-
-            # Step 2: 일반화 좌표(q)와 일반화 속도(u) 정의
-            num_bodies = len(self.bodies)
-            q = dynamicsymbols(f'q1:{num_bodies + 1}')  # q1, q2, ..., qn
-            u = dynamicsymbols(f'u1:{num_bodies + 1}')  # u1, u2, ..., un
-
-            # Step 3: 기준 프레임 정의
-            N = ReferenceFrame('N')  # 관성 프레임
-            frames = [N]
-            for i in range(num_bodies):
-                parent_frame = frames[i]  # 이전 프레임을 부모로 설정
-                Fi = parent_frame.orientnew(f'F{i+1}', 'Axis', (q[i], N.z))
-                Fi.set_ang_vel(parent_frame, u[i] * N.z)
-                frames.append(Fi)
-
-            # Step 4: 점과 위치 정의
-            points = [Point('O')]
-            points[0].set_vel(N, 0)
-            for i in range(num_bodies):
-                body_item = self.bodies[i]
-                length = body_item.body.length
-                p = points[i].locatenew(f'P{i+1}', length * frames[i+1].x)
-                p.v2pt_theory(points[i], N, frames[i+1])
-                points.append(p)
-
-            # Step 5: 강체 정의
-            rigid_bodies = []
-            for i, body_item in enumerate(self.bodies):
-                mass = body_item.body.mass
-                inertia_val = body_item.body.inertia
-                body_inertia = inertia(frames[i+1], 0, 0, inertia_val)
-                body = RigidBody(f'Body{i+1}', points[i+1], frames[i+1], mass, (body_inertia, points[i+1]))
-                rigid_bodies.append(body)
-
-            # Step 6: 힘(하중) 정의
-            forces = []
-            for load in self.loads:
-                torque = load.torque
-                joint_index = self.joints.index(load.joint)
-                forces.append((frames[joint_index + 1], torque * N.z))
-
-            # 중력 추가
-            g = symbols('g')
-            gravity = -g * N.y
-            for body in rigid_bodies:
-                mass = body.mass
-                center_of_mass = body.masscenter
-                forces.append((center_of_mass, mass * gravity))
-
-            # Step 7: KanesMethod 적용 (kd_eqs 포함)
-            kinematic_differential_equations = [qi.diff(symbols('t')) - ui for qi, ui in zip(q, u)]
-            km = KanesMethod(N, q_ind=q, u_ind=u, kd_eqs=kinematic_differential_equations)
-            fr, frstar = km.kanes_equations(loads=forces, bodies=rigid_bodies)
-
-            # Step 8: 수치적분 준비
-            from sympy.utilities.lambdify import lambdify
-            from scipy.integrate import odeint
-
-            # 상태 변수와 파라미터 정의
-            state_vars = q + u
-            parameters = [g]
-
-            # rhs_func 생성
-            rhs_func = lambdify(state_vars + parameters, km.rhs(), modules='numpy')
-
-            # 초기 조건 설정 (좌표와 속도 모두 0)
-            initial_conditions = np.zeros(len(q) + len(u))
-
-            t = np.linspace(0, self.duration, int(self.duration / self.time_step) + 1)
-
-            # 중력 상수 값 지정 (예: 9.81 m/s^2)
-            g_val = 9.81
-
-            # 방정식 적분
-            def equations(y, t):
-                # y를 q와 u로 분할
-                q_vals = y[:len(q)]
-                u_vals = y[len(q):]
-                # 입력 값 생성 (상수 포함)
-                input_vals = np.concatenate((q_vals, u_vals, [g_val]))
-                # dydt 계산 (dq/dt와 du/dt 모두 포함)
-                dydt = rhs_func(*input_vals)
-                dydt = np.array(dydt).flatten()
-                return dydt
-
-            solution = odeint(equations, initial_conditions, t)
-
+            t, solution = self.solve()
         except AttributeError as e:
             import traceback
             print(f"Attribute Error: {e}")
@@ -115,12 +160,585 @@ class Simulation:
             traceback.print_exc()
             return
 
-        # Step 9: 결과 시각화 또는 처리
+        # Step 4: 결과 시각화 또는 처리
         self.visualize(solution, t)
 
+    def solve(self, on_chunk=None, on_status=None, cancel_event=None, num_chunks=100):
+        # 계산만 수행하고 (t, solution)을 반환한다 (GUI 스레드 밖에서 실행 가능).
+        # on_chunk(t, y)가 주어지면 적분 구간을 나눠 부분 궤적을 전달하고,
+        # cancel_event(threading.Event)가 설정되면 다음 우변 평가에서 SimulationCancelled를 던진다.
+        # 단계별 시간과 적분기 카운터는 self.metrics에 남는다
+        self.metrics.reset()
+        try:
+            with profiling(self.metrics, self.profile):
+                with self.metrics.stage('total'):
+                    return self._solve_cached(on_chunk, on_status, cancel_event, num_chunks)
+        finally:
+            self.metrics.counters.update(self.solver_counters())
+            if self.profile_path and self.profile == 'cprofile' and self.metrics.profile is not None:
+                self.metrics.profile.dump_stats(self.profile_path)
+
+    def _solve_cached(self, on_chunk, on_status, cancel_event, num_chunks):
+        # 같은 모델과 설정으로 계산한 결과가 결과 캐시에 있으면 적분하지 않고 돌려준다
+        self.result_source = None
+        key = self.result_key(on_chunk)
+        if key is None:
+            return self._solve(on_chunk, on_status, cancel_event, num_chunks)
+        cache = default_result_cache()
+        with self.metrics.stage('result_cache'):
+            entry, source = cache.get(key)
+        self.metrics.count(f'results_{source or "computed"}')
+        if entry is None:
+            t, solution = self._solve(on_chunk, on_status, cancel_event, num_chunks)
+            num_states = 2 * self.model.num_bodies
+            cache.put(key, {'t': t, 'solution': solution,
+                            'event_times': [time for time, _ in self.triggered_events],
+                            'event_states': np.reshape([y for _, y in self.triggered_events], (-1, num_states))})
+            return t, solution
+        self.result_source = source
+        self.solver_stats = {}
+        self.dense_solutions = []
+        self.triggered_events = list(zip(entry['event_times'], entry['event_states']))
+        if on_chunk is not None:
+            on_chunk(entry['t'], entry['solution'])
+        return entry['t'], entry['solution']
+
+    def result_key(self, on_chunk=None):
+        # 결과 캐시 키 (모델 내용 + 궤적을 결정하는 설정). 결과 파일, 체크포인트, 프로파일, 사용자 이벤트 함수가
+        # 있는 실행은 캐시하지 않는다 (None). 구간별 적분은 구간마다 적분기를 다시 시작하므로 구간 길이도 키에 넣는다
+        if not self.use_result_cache or self.output_path or self.checkpoint_path or self.profile or self.events:
+            return None
+        settings = {'settings': self.settings_hash(), 'duration': float(self.duration), 'backend': self.backend,
+                    'output': self.output_settings(), 'chunks': None if on_chunk is None else self.chunk_steps()}
+        return result_key(self.model.content_hash(), settings)
+
+    def solver_counters(self):
+        names = {'nfev': 'rhs_calls', 'njev': 'jacobian_evals', 'nlu': 'lu_decompositions',
+                 'nsteps': 'steps', 'nrejected': 'rejected_steps'}
+        return {names[key]: value for key, value in self.solver_stats.items()}
+
+    def _solve(self, on_chunk, on_status, cancel_event, num_chunks):
+        report = on_status or (lambda message: None)
+        metrics = self.metrics
+
+        # Step 1: 조인트가 정의되었는지 확인
+        if not self.model.num_joints:
+            raise ValueError("시스템에 조인트가 정의되지 않았습니다.")
+        self.check_tree()
+        self.inputs = self.torque_inputs()
+        self.contacts = self.contact_model()
+
+        # Step 2: 운동 방정식의 우변 준비 (Fixed 조인트를 합친 축약 바디 기준)
+        num_bodies = self.reduction.num_bodies
+        # 초기 조건 (지정하지 않으면 좌표와 속도 모두 0)
+        initial_conditions = np.zeros(2 * num_bodies)
+        if self.initial_state is not None:
+            initial_conditions = self.reduce_state(self.initial_state)
+
+        if self.linearization is not None:
+            # 동작점 주위의 선형 모델을 한 번 만들고, 적분 대신 스텝마다 정확한 이산 전파
+            if self.events or self.stop_angle is not None:
+                raise ValueError("선형화 모드에서는 종료 이벤트를 지원하지 않습니다.")
+            if self.contacts is not None:
+                raise ValueError("선형화 모드에서는 접촉과 조인트 제한을 지원하지 않습니다.")
+            report("Linearizing...")
+            with metrics.stage('linearization'):
+                self.linear = self.linear_model()
+
+            def advance(state, t):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise SimulationCancelled()
+                return self.linear.propagate(state, t, self.inputs), False
+        else:
+            equations, jacobian, events = self.prepare_integration(report, cancel_event)
+
+            def advance(state, t):
+                return self.integrate(equations, jacobian, events, state, t)
+
+        # Step 3: 수치적분 (선형화 모드는 이산 전파)
+        report("Integrating...")
+        self.solver_stats = {'nfev': 0, 'njev': 0, 'nlu': 0, 'nsteps': 0}
+        if self.solver in EXPLICIT_STAGE_EVALS:
+            self.solver_stats['nrejected'] = 0
+        self.dense_solutions = []
+        self.triggered_events = []
+        num_samples = self.num_samples()
+        if on_chunk is None and self.output_path is None and self.checkpoint_path is None:
+            t = self.time_points()
+            with metrics.stage('integration'):
+                solution, _ = advance(initial_conditions, t)
+            return t[:len(solution)], self.expand(solution)
+
+        # 이어서 실행: 체크포인트의 샘플 수, 상태, 카운터, 발생한 이벤트를 복원 (파일이 없으면 처음부터).
+        # 적분은 마지막 구간 경계(anchor)에서 다시 시작하고, 이미 기록한 샘플은 다시 내보내지 않는다
+        checkpoint = self.read_checkpoint(num_samples) if self.resume else None
+        filled = 0
+        state = initial_conditions
+        anchor, anchor_state = 0, initial_conditions
+        stopped = False
+        if checkpoint is not None:
+            meta, arrays = checkpoint
+            filled, stopped = meta['samples'], meta['stopped']
+            state = arrays['state']
+            anchor = meta.get('anchor', filled - 1)
+            anchor_state = arrays.get('anchor_state', state)
+            self.solver_stats.update(meta['solver_stats'])
+            self.triggered_events = list(zip(arrays['event_times'], arrays['event_states']))
+            self.resumed_from = meta['time']
+            report(f"Resuming from t = {meta['time']:.2f} s...")
+
+        # 구간별 적분: 결과 파일이 지정되면 전체 궤적을 메모리에 두지 않고 조각마다 기록
+        sink = None
+        solution = None
+        num_states = 2 * self.model.num_bodies
+        if self.output_path is not None:
+            sink = TrajectorySink(self.output_path, num_samples, num_states, self.decimation,
+                                  self.record_coordinates, resume=None if checkpoint is None else _sink_state(*checkpoint))
+            chunk = self.chunk_steps(sink)
+        else:
+            solution = np.empty((num_samples, num_states))
+            chunk = self.chunk_steps()
+            if checkpoint is not None:
+                solution[:filled] = checkpoint[1]['trajectory']
+
+        # on_chunk에는 구간 길이와 상관없이 약 num_chunks번에 나눠 전달한다 (GUI 진행 표시)
+        report_samples = max(1, (num_samples - 1) // num_chunks)
+        pending = []
+
+        def flush():
+            if pending:
+                on_chunk(np.concatenate([t for t, _ in pending]), np.concatenate([y for _, y in pending]))
+                pending.clear()
+
+        def emit(t, y):
+            # y는 축약 상태. 기록이 끝난 뒤에만 filled와 state를 옮겨 체크포인트가 파일 내용과 어긋나지 않게 한다
+            nonlocal filled, state
+            if not len(t):
+                return
+            full = self.expand(y)
+            if solution is not None:
+                solution[filled:filled + len(t)] = full
+            if sink is not None:
+                sink.write(t, full)
+            filled += len(t)
+            state = y[-1]
+            if on_chunk is not None:
+                pending.append((t, full))
+                if sum(len(t) for t, _ in pending) >= report_samples:
+                    flush()
+
+        timer = CheckpointTimer(self.checkpoint_interval) if self.checkpoint_path is not None else None
+        try:
+            if checkpoint is None:
+                emit(self.time_points(0, 1), state[np.newaxis])
+            elif on_chunk is not None and solution is not None:
+                on_chunk(self.time_points(0, filled), solution[:filled])
+            start = anchor
+            while start < num_samples - 1 and not stopped:
+                # 경계는 chunk의 배수. 마지막 구간도 경계까지 적분하고 duration 이후의 샘플을 버린다
+                # (출력 격자는 적분기의 내부 스텝을 바꾸지 않으므로 연장한 실행과 같은 값이 나온다)
+                stop = (start // chunk + 1) * chunk
+                last = min(stop, num_samples - 1)
+                t = self.time_points(start, stop + 1)
+                with metrics.stage('integration'):
+                    segment, stopped = advance(anchor_state, t)
+                if stopped and len(segment) > last - start:
+                    # 종료 이벤트가 duration 이후: 이번 실행에서는 일어나지 않은 것으로 본다
+                    stopped = False
+                    self.triggered_events = [event for event in self.triggered_events if event[0] <= t[last - start]]
+                segment = segment[:last - start + 1]
+                first = max(filled - start, 1)
+                with metrics.stage('output'):
+                    emit(t[first:len(segment)], segment[first:])
+                if len(segment) == stop - start + 1:
+                    anchor, anchor_state = stop, segment[-1]
+                start = stop
+                if timer is not None and timer.due():
+                    with metrics.stage('checkpoint'):
+                        self.write_checkpoint(filled, state, stopped, sink, solution, anchor, anchor_state)
+            if on_chunk is not None:
+                flush()
+        finally:
+            # 취소나 오류로 끝나도 마지막으로 기록을 마친 구간까지 남긴다
+            if timer is not None and filled:
+                self.write_checkpoint(filled, state, stopped, sink, solution, anchor, anchor_state)
+            if sink is not None:
+                sink.close()
+
+        if sink is not None:
+            self.summary = sink.summary()
+            t, solution, _ = sink.open()
+            return t, solution
+        return self.time_points(0, filled), solution[:filled]
+
+    def prepare_integration(self, report, cancel_event):
+        # (우변, 자코비안, 이벤트) 준비
+        metrics = self.metrics
+        num_bodies = self.reduction.num_bodies
+        with metrics.stage('equations'):
+            if self.engine == 'articulated':
+                equations = self.articulated_chain().rhs
+            else:
+                # 체인 위상에 대한 운동 방정식 (파라미터는 기호로 유지, 캐시됨)
+                report("Deriving equations of motion...")
+                eom = get_equations(self.topology(), self.backend, metrics=metrics)
+                parameters = self.parameter_values(eom)
+                # 선택한 백엔드를 사용할 수 없으면 lambdify로 대체
+                backend = self.backend if eom.has_backend(self.backend) else 'lambdify'
+                equations = eom.rhs_evaluator(parameters, backend)
+                if self.inputs is not None or self.contacts is not None:
+                    equations = InputRHS(equations, self.inputs, eom.torque_slice, self.contacts)
+
+        # 암시적 solve_ivp 방법에는 기호적으로 유도한 자코비안을 제공
+        # (접촉 토크는 기호 자코비안에 없으므로 접촉이 있으면 solve_ivp의 유한 차분에 맡긴다)
+        jacobian = None
+        if self.engine != 'articulated' and self.solver in IMPLICIT_SOLVERS and self.contacts is None:
+            report("Deriving state Jacobian...")
+            eom = get_equations(self.topology(), self.backend, jacobian=True, metrics=metrics)
+            jacobian = eom.jacobian_evaluator(parameters)
+            if self.inputs is not None:
+                jacobian = InputRHS(jacobian, self.inputs, eom.torque_slice)
+
+        # 사용자 이벤트는 바디별 상태를 받는다 (축약 좌표에서는 용접된 바디의 각도가 항상 0)
+        events = [self.expanded_event(event) for event in self.events]
+        if self.stop_angle is not None:
+            events.append(joint_angle_event(self.stop_angle, range(num_bodies)))
+        if events and self.solver == 'odeint':
+            raise ValueError("이벤트 함수는 solve_ivp 적분기(RK45, DOP853, Radau, BDF, LSODA)에서만 지원됩니다.")
+
+        if cancel_event is not None:
+            rhs = equations
+
+            def equations(y, t):
+                if cancel_event.is_set():
+                    raise SimulationCancelled()
+                return rhs(y, t)
+        return equations, jacobian, events
+
+    def integrate(self, equations, jacobian, events, state, t):
+        # t[0]의 state에서 시작해 격자 t 위의 해를 반환 (첫 행 포함). 종료 이벤트가 발생하면
+        # 이벤트 이전의 샘플까지만 반환하고 stopped=True
+        if self.solver == 'odeint':
+            from scipy.integrate import odeint
+
+            tolerances = {key: getattr(self, key) for key in ('rtol', 'atol') if getattr(self, key) is not None}
+            segment, info = odeint(equations, state, t, full_output=True, **tolerances)
+            self.solver_stats['nfev'] += int(info['nfe'][-1])
+            self.solver_stats['njev'] += int(info['nje'][-1])
+            self.solver_stats['nsteps'] += int(info['nst'][-1])
+            return segment, False
+
+        from scipy.integrate import solve_ivp
+
+        options = {}
+        if jacobian is not None:
+            options['jac'] = lambda t, y: jacobian(y, t)
+        # 컴파일된 백엔드는 출력 버퍼를 재사용하므로 solve_ivp에는 복사본을 넘긴다
+        result = solve_ivp(lambda t, y: np.array(equations(y, t)), (t[0], t[-1]), state,
+                           method=self.solver, t_eval=t, dense_output=True, events=events or None,
+                           rtol=self.rtol or 1e-6, atol=self.atol or 1e-8, **options)
+        if result.status < 0:
+            raise RuntimeError(f"적분 실패: {result.message}")
+        self.solver_stats['nfev'] += result.nfev
+        self.solver_stats['njev'] += result.njev
+        self.solver_stats['nlu'] += result.nlu
+        steps = len(result.sol.ts) - 1
+        self.solver_stats['nsteps'] += steps
+        if self.solver in EXPLICIT_STAGE_EVALS:
+            # 초기 평가 2회(시작점, 초기 스텝 크기 추정)를 빼고 시도한 스텝 수를 구한다
+            per_attempt, per_step = EXPLICIT_STAGE_EVALS[self.solver]
+            attempts = (result.nfev - 2 - per_step * steps) // per_attempt
+            self.solver_stats['nrejected'] += max(attempts - steps, 0)
+        self.dense_solutions.append(result.sol)
+        if result.status == 1:
+            for t_events, y_events in zip(result.t_events, result.y_events):
+                self.triggered_events.extend(zip(t_events, self.expand(y_events)))
+        return result.y.T, result.status == 1
+
+    def settings_hash(self):
+        # 궤적에 영향을 주는 설정의 해시. duration과 결과 파일 설정은 제외하고,
+        # 이벤트 함수와 백엔드(반올림 수준의 차이만 있음)도 제외한다
+        import hashlib
+        import json
+
+        settings = {'time_step': self.time_step, 'gravity': self.g, 'engine': self.engine, 'eom_form': self.eom_form,
+                    'solver': self.solver, 'rtol': self.rtol, 'atol': self.atol, 'stop_angle': self.stop_angle,
+                    'initial_state': self.initial_state, 'linearization': self.linearization,
+                    'operating_point': self.operating_point, 'floor_height': self.floor_height,
+                    'self_collision': self.self_collision, 'contacts': self.contact_parameters}
+        payload = json.dumps(settings, sort_keys=True, default=lambda value: np.asarray(value, dtype=float).tolist())
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def output_settings(self):
+        coordinates = self.record_coordinates
+        return {'path': self.output_path, 'decimation': self.decimation,
+                'record_coordinates': None if coordinates is None else [int(c) for c in coordinates]}
+
+    def write_checkpoint(self, samples, state, stopped, sink=None, solution=None, anchor=None, anchor_state=None):
+        # samples개의 샘플까지 기록을 마친 시점 (state는 마지막 샘플의 축약 상태).
+        # anchor: 그 이전의 마지막 구간 경계 샘플 번호와 그때의 상태 (생략하면 마지막 샘플)
+        if anchor is None:
+            anchor, anchor_state = samples - 1, state
+        meta = {
+            'model_hash': self.model.content_hash(),
+            'settings_hash': self.settings_hash(),
+            # 이어서 실행할 때 같은 키로 디스크 캐시에서 읽으므로 다시 유도하지 않는다
+            'eom_key': None if self.engine == 'articulated' else topology_key(self.topology()),
+            'samples': int(samples),
+            'anchor': int(anchor),
+            'time': float(self.time_points(samples - 1, samples)[0]),
+            'stopped': bool(stopped),
+            'solver_stats': {key: int(value) for key, value in self.solver_stats.items()},
+            'output': self.output_settings(),
+        }
+        num_states = 2 * self.model.num_bodies
+        arrays = {
+            'state': np.asarray(state, dtype=float),
+            'anchor_state': np.asarray(anchor_state, dtype=float),
+            'event_times': np.array([time for time, _ in self.triggered_events], dtype=float),
+            'event_states': np.array([y for _, y in self.triggered_events], dtype=float).reshape(-1, num_states),
+        }
+        if sink is not None:
+            sink.flush()
+            sink_state = sink.state()
+            meta['sink'] = {key: sink_state[key] for key in ('samples_seen', 'outputs_written', 'final_time')}
+            for key in ('minimum', 'maximum', 'sum_squares', 'final_state'):
+                if sink_state[key] is not None:
+                    arrays[f'sink_{key}'] = sink_state[key]
+        else:
+            arrays['trajectory'] = solution[:samples]
+        save_checkpoint(self.checkpoint_path, meta, arrays)
+
+    def read_checkpoint(self, num_samples):
+        # 이어서 실행할 체크포인트 (meta, arrays). 파일이 없으면 None, 다른 모델이나 설정에서 나왔으면 ValueError
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        meta, arrays = load_checkpoint(self.checkpoint_path)
+        if meta['model_hash'] != self.model.content_hash() or meta['settings_hash'] != self.settings_hash():
+            raise ValueError(f"{self.checkpoint_path}: 다른 모델 또는 설정으로 만든 체크포인트입니다.")
+        if meta['output'] != self.output_settings():
+            raise ValueError(f"{self.checkpoint_path}: 체크포인트의 결과 파일 설정이 현재 설정과 다릅니다.")
+        if meta['samples'] > num_samples:
+            raise ValueError(f"{self.checkpoint_path}: 체크포인트(t = {meta['time']:.2f} s)가 설정한 duration보다 깁니다.")
+        return meta, arrays
+
+    def interpolate(self, times):
+        # solve_ivp의 연속 해(dense output)로 임의 시각의 상태를 평가 (이어서 실행한 경우 재개 이후 구간만)
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        if not self.dense_solutions:
+            raise ValueError("연속 해가 없습니다. solve_ivp 적분기로 실행하세요.")
+        values = []
+        for time in times:
+            for dense in self.dense_solutions:
+                if dense.t_min <= time <= dense.t_max:
+                    values.append(self.expand(dense(time)))
+                    break
+            else:
+                raise ValueError(f"시각 {time}은 적분 구간 밖입니다.")
+        return np.array(values)
+
+    def run_batch(self, parameter_sets=None, initial_conditions=None):
+        # 여러 파라미터 세트를 하나의 상태 벡터로 묶어 함께 적분한다.
+        # parameter_sets: 'masses', 'inertias', 'torques' ((batch, n) 배열)와 'gravity' ((batch,) 배열),
+        # 생략된 항목은 현재 모델 값을 사용. 반환값은 (batch, time, state) 배열
+        if not self.model.num_joints:
+            raise ValueError("시스템에 조인트가 정의되지 않았습니다.")
+        self.check_tree()
+        self.check_batch_contacts()
+        self.inputs = self.torque_inputs()
+        masses, inertias, lengths, torques, g = self.batch_parameters(parameter_sets or {})
+        masses, inertias, lengths, torques, offsets = self.reduced_parameters(masses, inertias, lengths, torques)
+        if initial_conditions is not None:
+            initial_conditions = self.reduce_state(initial_conditions)
+        eom = None
+        if self.engine != 'articulated':
+            eom = get_equations(self.topology())
+        solution = integrate_batch(eom, masses, inertias, lengths, torques, g, initial_conditions,
+                                   self.time_points(), self.reduction.parents, offsets, self.inputs)
+        return self.expand(solution)
+
+    def check_batch_contacts(self):
+        if self.contact_model() is not None:
+            raise ValueError("배치 적분은 접촉과 조인트 제한을 지원하지 않습니다.")
+
+    def batch_parameters(self, parameter_sets):
+        num_bodies = self.model.num_bodies
+        defaults = dict(zip(('masses', 'inertias', 'lengths', 'torques'), self.body_parameters()))
+        unknown = set(parameter_sets) - {'masses', 'inertias', 'torques', 'gravity'}
+        if unknown:
+            raise ValueError(f"알 수 없는 파라미터입니다: {', '.join(sorted(unknown))}")
+
+        sizes = {len(np.atleast_1d(values)) for values in parameter_sets.values()}
+        if len(sizes) > 1:
+            raise ValueError("모든 파라미터 세트의 배치 크기가 같아야 합니다.")
+        batch_size = sizes.pop() if sizes else 1
+
+        # 바디별 파라미터는 (n, batch), 중력은 (batch,)로 맞춘다
+        per_body = []
+        for name in ('masses', 'inertias', 'lengths', 'torques'):
+            values = np.asarray(parameter_sets.get(name, defaults[name]), dtype=float)
+            per_body.append(np.array(np.broadcast_to(values, (batch_size, num_bodies)).T))
+        g = np.array(np.broadcast_to(np.asarray(parameter_sets.get('gravity', self.g), dtype=float), (batch_size,)))
+        return (*per_body, g)
+
+    def chunk_steps(self, sink=None):
+        # 구간 하나의 스텝 수 (chunk_duration 초, duration과 무관). 결과 파일에 쓸 때는 chunk_samples 이하
+        steps = max(1, int(round(self.chunk_duration / self.time_step)))
+        return min(steps, self.chunk_samples) if sink is not None else steps
+
+    def num_samples(self):
+        return int(self.duration / self.time_step) + 1
+
+    def time_points(self, start=0, stop=None):
+        # np.linspace(0, duration, num_samples)[start:stop]와 같은 값을 전체 배열 없이 계산
+        num_samples = self.num_samples()
+        stop = num_samples if stop is None else stop
+        if num_samples == 1:
+            return np.zeros(stop - start)
+        return np.arange(start, stop) * (self.duration / (num_samples - 1))
+
+    def topology(self):
+        return tree_topology(self.reduction.parents, self.eom_form, offsets=not self.reduction.is_identity)
+
+    def reduced_parameters(self, masses, inertias, lengths, torques):
+        # 복합 바디별 (질량, 관성, 질량 중심 위치, 토크, 조인트 위치). 합칠 바디가 없으면 그대로 (조인트 위치 None)
+        if self.reduction.is_identity:
+            return masses, inertias, lengths, torques, None
+        return self.reduction.reduce(masses, inertias, lengths, torques)
+
+    def expand(self, states):
+        return states if self.reduction.is_identity else self.reduction.expand(states)
+
+    def reduce_state(self, states):
+        # 바디별 상태 (..., 2n)에서 축약 좌표에 해당하는 성분만 고른다
+        states = np.asarray(states, dtype=float)
+        if self.reduction.is_identity:
+            return states
+        coordinates = self.reduction.coordinates
+        return np.concatenate((states[..., coordinates], states[..., self.model.num_bodies + coordinates]), axis=-1)
+
+    def expanded_event(self, event):
+        if self.reduction.is_identity:
+            return event
+
+        def expanded(t, y):
+            return event(t, self.reduction.expand(y))
+
+        expanded.terminal = getattr(event, 'terminal', False)
+        expanded.direction = getattr(event, 'direction', 0)
+        return expanded
+
+    def torque_inputs(self):
+        inputs = self.model.torque_inputs(self.tree)
+        if inputs is None or self.reduction.is_identity:
+            return inputs
+        # 용접된 바디의 입력은 복합 바디로 (지면에 용접된 바디의 입력은 버린다)
+        return inputs.remap(self.reduction.cluster_of, self.reduction.num_bodies)
+
+    def contact_model(self):
+        # 바닥, 링크 접촉, 각도 제한이 있는 조인트 중 하나라도 있으면 ContactModel, 없으면 None
+        limits = self.joint_limits()
+        if self.floor_height is None and not self.self_collision and not len(limits[0]):
+            return None
+        return ContactModel(self.tree.parents, self.model.bodies['length'], self.reduction, self.floor_height,
+                            self.self_collision, limits, self.root_pivots(), **self.contact_parameters)
+
+    def root_pivots(self):
+        # 루트 바디의 지면 조인트 위치 (첫 지면 조인트 기준, 화면 좌표는 y가 아래로 증가하므로 뒤집는다).
+        # 지면 조인트가 없는 루트는 원점
+        pivots = np.zeros((self.model.num_bodies, 2))
+        roots = self.tree.roots
+        joints = self.tree.body_joints[roots]
+        grounded = joints >= 0
+        if grounded.any():
+            positions = np.column_stack((self.model.joints['x'], -self.model.joints['y']))[joints[grounded]]
+            pivots[roots[grounded]] = positions - positions[0]
+        return pivots
+
+    def joint_limits(self):
+        # 제한이 있는 조인트의 (축약 좌표, 하한, 상한). Fixed 조인트는 좌표가 없으므로 무시한다
+        joints = self.model.joints
+        limited = np.flatnonzero(joints['limited'])
+        bodies = self.tree.joint_bodies[limited]
+        clusters = np.where(bodies >= 0, self.reduction.cluster_of[np.maximum(bodies, 0)], -1)
+        driven = clusters >= 0
+        driven[driven] = self.reduction.coordinates[clusters[driven]] == bodies[driven]
+        limited = limited[driven]
+        return clusters[driven], joints['lower'][limited], joints['upper'][limited]
+
+    def check_tree(self):
+        # 닫힌 루프는 구속 조건 없이는 풀 수 없으므로 트리에서 빠진 조인트가 있으면 실행하지 않는다
+        if self.tree.cut_joints:
+            joints = ', '.join(str(joint + 1) for joint in self.tree.cut_joints)
+            raise ValueError(f"닫힌 루프는 지원하지 않습니다 (트리에 포함되지 않은 조인트: {joints}).")
+        if not self.reduction.num_bodies:
+            raise ValueError("모든 바디가 지면에 고정되어 움직일 수 있는 바디가 없습니다.")
+
+    def body_parameters(self):
+        bodies = self.model.bodies
+        return bodies['mass'], bodies['inertia'], bodies['length'], self.model.body_torques(self.tree)
+
+    def parameter_values(self, eom):
+        masses, inertias, lengths, torques, offsets = self.reduced_parameters(*self.body_parameters())
+        return np.array(eom.parameter_vector(masses, inertias, lengths, torques, self.g, offsets))
+
+    def linear_model(self):
+        # 축약 좌표에서 동작점 주위의 선형 모델 (dynamics.linear.LinearModel). 입력은 축약 바디별 토크
+        masses, inertias, lengths, torques, offsets = self.reduced_parameters(*self.body_parameters())
+        jacobian = None
+        if self.engine == 'articulated':
+            chain = ArticulatedChain(masses, inertias, lengths, torques, g=self.g,
+                                     parents=self.reduction.parents, offsets=offsets)
+
+            def evaluate(x, u):
+                chain.torques = np.asarray(u, dtype=float)
+                return chain.rhs(x, 0.0)
+        else:
+            # 캐시된 Kane 방정식과 그 기호 상태 자코비안을 토크만 바꿔 가며 평가
+            eom = get_equations(self.topology(), jacobian=True, metrics=self.metrics)
+            parameters = eom.parameter_vector(masses, inertias, lengths, torques, self.g, offsets)
+            rhs = eom.rhs_evaluator(parameters)
+            state_jacobian = eom.jacobian_evaluator(parameters)
+
+            def evaluate(x, u):
+                rhs.parameters[eom.torque_slice] = [float(value) for value in u]
+                return rhs(x, 0.0)
+
+            def jacobian(x, u):
+                state_jacobian.parameters[eom.torque_slice] = [float(value) for value in u]
+                return state_jacobian(x, 0.0)
+
+        if self.operating_point is None:
+            x0 = static_equilibrium(evaluate, hanging_pose(self.reduction.parents), torques, jacobian)
+        else:
+            point = np.asarray(self.operating_point, dtype=float)
+            if point.shape == (self.model.num_bodies,):
+                point = np.concatenate((point, np.zeros_like(point)))
+            x0 = self.reduce_state(point)
+        linear = linearize(evaluate, x0, torques, jacobian)
+        linear.method = self.linearization or 'expm'
+        return linear
+
+    def modal_analysis(self):
+        # 선형 모델의 진동 모드. shapes는 바디별 상대 좌표 (용접된 바디는 0)
+        linear = self.linear if self.linear is not None else self.linear_model()
+        modes = linear.modes()
+        shapes = np.zeros((self.model.num_bodies, modes['shapes'].shape[1]))
+        shapes[self.reduction.coordinates] = modes['shapes']
+        return dict(modes, shapes=shapes)
+
+    def articulated_chain(self):
+        masses, inertias, lengths, torques, offsets = self.reduced_parameters(*self.body_parameters())
+        return ArticulatedChain(masses, inertias, lengths, torques, g=self.g,
+                                parents=self.reduction.parents, offsets=offsets, inputs=self.inputs,
+                                contacts=self.contacts)
+
     def visualize(self, solution, t):
+        # 헤드리스 실행에서 matplotlib을 불러오지 않도록 그릴 때만 가져온다
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(10, 6))
-        num_coordinates = len(self.bodies)
+        num_coordinates = self.model.num_bodies
         for i in range(num_coordinates):
             plt.plot(t, solution[:, i], label=f'θ{i+1}')
         plt.xlabel('시간 (초)')
@@ -0,0 +1,160 @@
+# dynamics/topology.py
+import numpy as np
+
+
+class KinematicTree:
+    # 조인트 그래프에서 뽑은 신장 트리(바디가 서로 연결되지 않았으면 숲). 상태 인덱스는 모델의 바디 인덱스 그대로.
+    #   parents[i]: 바디 i의 부모 바디 (-1은 지면. 루트는 원점에 힌지로 고정)
+    #   order: 부모가 항상 자식보다 먼저 오는 바디 순서 (너비 우선)
+    #   body_joints[i]: 바디 i를 부모(또는 지면)에 연결하는 조인트, 지면 조인트가 없는 루트는 -1
+    #   joint_bodies[j]: 조인트 j가 구동하는 자식 바디, 트리에 포함되지 않은 조인트는 -1
+    #   cut_joints: 닫힌 루프를 만들어 트리에서 빠진 조인트
+    def __init__(self, parents, order=None, body_joints=None, joint_bodies=None, cut_joints=()):
+        self.parents = np.asarray(parents, dtype=np.int64)
+        self.order = np.asarray(tree_order(self.parents) if order is None else order, dtype=np.int64)
+        n = len(self.parents)
+        self.body_joints = np.full(n, -1, dtype=np.int64) if body_joints is None else np.asarray(body_joints)
+        self.joint_bodies = np.zeros(0, dtype=np.int64) if joint_bodies is None else np.asarray(joint_bodies)
+        self.cut_joints = list(cut_joints)
+
+    @classmethod
+    def serial(cls, num_bodies):
+        return cls(np.arange(-1, num_bodies - 1))
+
+    @property
+    def num_bodies(self):
+        return len(self.parents)
+
+    @property
+    def roots(self):
+        return np.flatnonzero(self.parents < 0)
+
+    @property
+    def is_serial(self):
+        # 바디 i의 부모가 i - 1인 기존 직렬 체인 (기호 유도와 캐시 키가 예전과 같다)
+        return np.array_equal(self.parents, np.arange(-1, self.num_bodies - 1))
+
+    def ancestors(self, body):
+        result = []
+        parent = self.parents[body]
+        while parent >= 0:
+            result.append(int(parent))
+            parent = self.parents[parent]
+        return result
+
+    def depths(self):
+        depths = np.zeros(self.num_bodies, dtype=np.int64)
+        for body in self.order:
+            parent = self.parents[body]
+            if parent >= 0:
+                depths[body] = depths[parent] + 1
+        return depths
+
+    def mass_matrix_pattern(self):
+        # 상대 좌표에서 M[i, j]는 i와 j 중 하나가 다른 하나의 조상(또는 자신)일 때만 0이 아니다.
+        # 가지가 갈라지면 서로 다른 가지 사이의 블록이 0이 된다
+        pattern = np.eye(self.num_bodies, dtype=bool)
+        for body in range(self.num_bodies):
+            ancestors = self.ancestors(body)
+            pattern[body, ancestors] = True
+            pattern[ancestors, body] = True
+        return pattern
+
+
+def tree_order(parents):
+    # 부모가 자식보다 먼저 오는 너비 우선 순서. 부모 배열에 순환이 있으면 ValueError
+    parents = [int(parent) for parent in parents]
+    children = [[] for _ in parents]
+    order = []
+    for body, parent in enumerate(parents):
+        if parent < 0:
+            order.append(body)
+        else:
+            children[parent].append(body)
+    for body in order:
+        order.extend(children[body])
+    if len(order) != len(parents):
+        raise ValueError("부모 배열에 순환이 있습니다.")
+    return order
+
+
+def kinematic_tree(model):
+    # 조인트 그래프(바디 = 노드, 조인트 = 간선)의 연결 성분마다 루트를 골라 너비 우선 신장 트리를 만든다.
+    # body1 == body2인 조인트는 그 바디를 지면에 연결하는 지면 조인트.
+    # 루트 선택: 지면 조인트가 있는 바디 -> 어떤 조인트의 body2도 아닌 바디 -> 가장 작은 인덱스.
+    # 그래서 body1 -> body2 방향으로 그린 체인은 body1이 부모, body2가 자식이 된다
+    import networkx as nx
+
+    n = model.num_bodies
+    graph = nx.MultiGraph()
+    graph.add_nodes_from(range(n))
+    ground = {}
+    driven = set()
+    for joint, (body1, body2) in enumerate(zip(model.joints['body1'].tolist(), model.joints['body2'].tolist())):
+        if body1 == body2:
+            ground.setdefault(body1, joint)
+        else:
+            graph.add_edge(body1, body2, key=joint)
+            driven.add(body2)
+
+    parents = np.full(n, -1, dtype=np.int64)
+    body_joints = np.full(n, -1, dtype=np.int64)
+    joint_bodies = np.full(model.num_joints, -1, dtype=np.int64)
+    order = []
+    for component in sorted(nx.connected_components(graph), key=min):
+        grounded = [body for body in component if body in ground]
+        sources = [body for body in component if body not in driven]
+        root = min(grounded or sources or component)
+        order.append(root)
+        if root in ground:
+            body_joints[root] = ground[root]
+            joint_bodies[ground[root]] = root
+        for parent, child in nx.bfs_edges(graph, root):
+            # 같은 두 바디 사이의 조인트가 여럿이면 번호가 가장 작은 것이 트리 간선
+            joint = min(graph[parent][child])
+            parents[child] = parent
+            body_joints[child] = joint
+            joint_bodies[joint] = child
+            order.append(child)
+
+    cut_joints = np.flatnonzero(joint_bodies < 0).tolist()
+    return KinematicTree(parents, order, body_joints, joint_bodies, cut_joints)
+
+
+def ltdl_solve(mass_matrix, forcing, parents, order=None):
+    # 트리 구조 질량 행렬에 대한 M x = f 풀이 (Featherstone의 LTDL 분해, M = L^T D L).
+    # 자식부터 부모 쪽으로 분해하면 채움(fill-in)이 조상-자손 패턴 밖으로 생기지 않아
+    # 비용이 바디 수의 세제곱이 아니라 sum(깊이^2)에 비례한다.
+    # 원소 단위 산술만 쓰므로 SymPy 식과 float 모두에 사용할 수 있다. 반환값은 리스트
+    n = len(parents)
+    parents = [int(parent) for parent in parents]
+    order = tree_order(parents) if order is None else [int(body) for body in order]
+    # H[k][i]는 i가 k 자신이거나 조상인 원소만 사용한다
+    H = [[mass_matrix[k, i] for i in range(n)] for k in range(n)]
+    x = [forcing[k] for k in range(n)]
+
+    for k in reversed(order):
+        i = parents[k]
+        while i >= 0:
+            a = H[k][i] / H[k][k]
+            j = i
+            while j >= 0:
+                H[i][j] = H[i][j] - a * H[k][j]
+                j = parents[j]
+            H[k][i] = a
+            i = parents[i]
+
+    # L^T z = f (자식부터), D w = z, L x = w (부모부터)
+    for k in reversed(order):
+        i = parents[k]
+        while i >= 0:
+            x[i] = x[i] - H[k][i] * x[k]
+            i = parents[i]
+    for k in order:
+        x[k] = x[k] / H[k][k]
+    for k in order:
+        i = parents[k]
+        while i >= 0:
+            x[k] = x[k] - H[k][i] * x[i]
+            i = parents[i]
+    return x
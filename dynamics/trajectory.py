@@ -0,0 +1,178 @@
+# dynamics/trajectory.py
+import os
+import numpy as np
+
+# .npy 파일은 [t, 선택한 상태...] 열을 가진 2차원 배열, .h5/.hdf5 파일은 't'와 'y' 데이터셋
+HDF5_EXTENSIONS = ('.h5', '.hdf5')
+
+
+def _summary_path(path):
+    return f'{path}.summary.npz'
+
+
+class TrajectorySink:
+    # 적분 중 들어오는 궤적 조각을 파일에 바로 기록해 메모리 사용량을 일정하게 유지한다.
+    # decimation: k번째 샘플마다 기록, coordinates: 기록할 상태 인덱스 (None이면 전부)
+    # 최소/최대/RMS/최종 상태는 기록 여부와 무관하게 모든 샘플에 대해 온라인으로 누적한다.
+    # resume: 체크포인트에 저장한 state()를 주면 기존 파일을 열어 (필요하면 늘려서) 이어서 기록한다.
+    def __init__(self, path, num_samples, num_states, decimation=1, coordinates=None, resume=None):
+        if decimation < 1:
+            raise ValueError("decimation은 1 이상이어야 합니다.")
+        self.path = path
+        self.decimation = int(decimation)
+        self.coordinates = np.arange(num_states) if coordinates is None else np.asarray(coordinates, dtype=int)
+        if self.coordinates.size and (self.coordinates.min() < 0 or self.coordinates.max() >= num_states):
+            raise ValueError(f"기록할 좌표 인덱스는 0..{num_states - 1} 범위여야 합니다.")
+        self.num_outputs = (num_samples + self.decimation - 1) // self.decimation
+        width = len(self.coordinates)
+
+        self._h5file = None
+        if path.endswith(HDF5_EXTENSIONS):
+            import h5py
+            if resume is None:
+                # 연장 실행에서 늘릴 수 있도록 행 수는 제한 없이 만든다
+                self._h5file = h5py.File(path, 'w')
+                chunk_rows = max(1, min(self.num_outputs, 4096))
+                self._t = self._h5file.create_dataset('t', shape=(self.num_outputs,), dtype=float,
+                                                      chunks=(chunk_rows,), maxshape=(None,))
+                self._y = self._h5file.create_dataset('y', shape=(self.num_outputs, width), dtype=float,
+                                                      chunks=(chunk_rows, max(1, width)), maxshape=(None, width))
+            else:
+                self._h5file = h5py.File(path, 'r+')
+                if 'summary' in self._h5file:
+                    del self._h5file['summary']
+                self._t, self._y = self._h5file['t'], self._h5file['y']
+                if self._y.shape[1] != width:
+                    raise ValueError(f"{path}: 기록된 열 수가 현재 설정과 다릅니다.")
+                if self._t.shape[0] < self.num_outputs:
+                    self._t.resize((self.num_outputs,))
+                    self._y.resize((self.num_outputs, width))
+        elif resume is None:
+            self._data = np.lib.format.open_memmap(path, mode='w+', dtype=float,
+                                                   shape=(self.num_outputs, width + 1))
+        else:
+            self._data = _open_resized(path, self.num_outputs, width + 1)
+
+        self.samples_seen = 0
+        self.outputs_written = 0
+        self.minimum = np.full(width, np.inf)
+        self.maximum = np.full(width, -np.inf)
+        self._sum_squares = np.zeros(width)
+        self.final_state = None
+        self.final_time = None
+        if resume is not None:
+            self.samples_seen = int(resume['samples_seen'])
+            self.outputs_written = int(resume['outputs_written'])
+            self.minimum = np.asarray(resume['minimum'], dtype=float)
+            self.maximum = np.asarray(resume['maximum'], dtype=float)
+            self._sum_squares = np.asarray(resume['sum_squares'], dtype=float)
+            self.final_state = resume.get('final_state')
+            self.final_time = resume.get('final_time')
+
+    def write(self, t, y):
+        y = np.asarray(y)
+        if len(t) == 0:
+            return
+        selected = y[:, self.coordinates]
+        self.minimum = np.minimum(self.minimum, selected.min(axis=0))
+        self.maximum = np.maximum(self.maximum, selected.max(axis=0))
+        self._sum_squares += np.einsum('ij,ij->j', selected, selected)
+        self.final_state = y[-1].copy()
+        self.final_time = float(t[-1])
+
+        # 전체 샘플 번호가 decimation의 배수인 행만 기록
+        first = (-self.samples_seen) % self.decimation
+        rows = slice(first, None, self.decimation)
+        kept_t = np.asarray(t)[rows]
+        kept_y = selected[rows]
+        start, stop = self.outputs_written, self.outputs_written + len(kept_t)
+        if self._h5file is not None:
+            self._t[start:stop] = kept_t
+            self._y[start:stop] = kept_y
+        else:
+            self._data[start:stop, 0] = kept_t
+            self._data[start:stop, 1:] = kept_y
+        self.outputs_written = stop
+        self.samples_seen += len(t)
+
+    def flush(self):
+        if self._h5file is not None:
+            self._h5file.flush()
+        else:
+            self._data.flush()
+
+    def state(self):
+        # 체크포인트용 누적 상태 (flush 후 호출하면 파일 내용과 일치)
+        return {'samples_seen': self.samples_seen, 'outputs_written': self.outputs_written,
+                'minimum': self.minimum, 'maximum': self.maximum, 'sum_squares': self._sum_squares,
+                'final_state': self.final_state, 'final_time': self.final_time}
+
+    @property
+    def rms(self):
+        return np.sqrt(self._sum_squares / max(self.samples_seen, 1))
+
+    def summary(self):
+        return {
+            'coordinates': self.coordinates,
+            'decimation': self.decimation,
+            'samples': self.samples_seen,
+            'outputs': self.outputs_written,
+            'min': self.minimum,
+            'max': self.maximum,
+            'rms': self.rms,
+            'final_time': self.final_time,
+            'final_state': self.final_state,
+        }
+
+    def close(self):
+        summary = self.summary()
+        if self._h5file is not None:
+            group = self._h5file.create_group('summary')
+            for key, value in summary.items():
+                group.create_dataset(key, data=np.nan if value is None else value)
+            self._h5file.close()
+            self._h5file = None
+        else:
+            self._data.flush()
+            del self._data
+            np.savez(_summary_path(self.path), **{key: np.nan if value is None else value
+                                                  for key, value in summary.items()})
+
+    def open(self):
+        # 기록이 끝난 뒤 결과를 복사 없이 다시 연다
+        return open_trajectory(self.path)
+
+
+def _open_resized(path, rows, columns):
+    # 기존 .npy 결과를 읽기/쓰기로 연다. 행이 모자라면 더 큰 파일에 복사해 교체 (연장 실행)
+    data = np.load(path, mmap_mode='r+')
+    if data.ndim != 2 or data.shape[1] != columns:
+        raise ValueError(f"{path}: 기록된 열 수가 현재 설정과 다릅니다.")
+    if data.shape[0] >= rows:
+        return data
+    temporary = f'{path}.resize.npy'
+    resized = np.lib.format.open_memmap(temporary, mode='w+', dtype=float, shape=(rows, columns))
+    resized[:data.shape[0]] = data
+    resized.flush()
+    del data, resized
+    os.replace(temporary, path)
+    return np.load(path, mmap_mode='r+')
+
+
+def open_trajectory(path):
+    # (t, y, summary)를 반환. .npy는 읽기 전용 메모리 맵, HDF5는 h5py 데이터셋
+    if path.endswith(HDF5_EXTENSIONS):
+        import h5py
+        h5file = h5py.File(path, 'r')
+        summary = {key: dataset[()] for key, dataset in h5file['summary'].items()}
+        # 종료 이벤트로 일찍 끝난 실행은 기록된 행까지만 반환
+        outputs = int(summary.get('outputs', h5file['t'].shape[0]))
+        return h5file['t'][:outputs], h5file['y'][:outputs], summary
+
+    data = np.load(path, mmap_mode='r')
+    summary = {}
+    if os.path.exists(_summary_path(path)):
+        with np.load(_summary_path(path)) as archive:
+            summary = {key: archive[key] for key in archive.files}
+    outputs = int(summary.get('outputs', data.shape[0]))
+    return data[:outputs, 0], data[:outputs, 1:], summary
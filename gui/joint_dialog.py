@@ -1,4 +1,5 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QFormLayout, QComboBox
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QFormLayout, QComboBox,
+                               QMessageBox)
 from PySide6.QtCore import QPointF
 
 class JointDialog(QDialog):
@@ -27,6 +28,14 @@ class JointDialog(QDialog):
         form_layout.addRow("Joint Position X:", self.position_x_input)
         form_layout.addRow("Joint Position Y:", self.position_y_input)
 
+        # Optional range of the child body's angle relative to its parent
+        self.lower_limit_input = QLineEdit("")
+        self.lower_limit_input.setPlaceholderText("No limit")
+        self.upper_limit_input = QLineEdit("")
+        self.upper_limit_input.setPlaceholderText("No limit")
+        form_layout.addRow("Lower Limit (rad):", self.lower_limit_input)
+        form_layout.addRow("Upper Limit (rad):", self.upper_limit_input)
+
         layout.addLayout(form_layout)
 
         # OK and Cancel buttons
@@ -43,6 +52,18 @@ class JointDialog(QDialog):
         self.ok_button.clicked.connect(self.accept)
         self.cancel_button.clicked.connect(self.reject)
 
+    def accept(self):
+        # Check the inputs here so that invalid values keep the dialog open
+        try:
+            self.get_joint_position()
+            lower, upper = self.get_joint_limits()
+            if lower is not None and upper is not None and lower > upper:
+                raise ValueError(f"Lower limit {lower} is greater than upper limit {upper}.")
+        except ValueError as e:
+            QMessageBox.critical(self, "Invalid Joint", str(e))
+            return
+        super().accept()
+
     def get_joint_position(self):
         x = float(self.position_x_input.text())
         y = float(self.position_y_input.text())
@@ -50,3 +71,9 @@ class JointDialog(QDialog):
 
     def get_joint_type(self):
         return self.joint_type_combo.currentText()
+
+    def get_joint_limits(self):
+        # (lower, upper) in radians, None for a side left empty
+        lower = self.lower_limit_input.text().strip()
+        upper = self.upper_limit_input.text().strip()
+        return (float(lower) if lower else None), (float(upper) if upper else None)
@@ -1,10 +1,14 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton
+import numpy as np
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox,
+                               QFileDialog, QMessageBox)
+from dynamics.signals import ExpressionSignal, TabulatedSignal, INTERPOLATIONS
 
 class LoadDialog(QDialog):
     def __init__(self, joint, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Apply Load")
         self.joint = joint
+        self.signal = None
 
         layout = QVBoxLayout()
 
@@ -15,6 +19,24 @@ class LoadDialog(QDialog):
         layout.addWidget(QLabel("Torque (Nm):"))
         layout.addWidget(self.torque_input)
 
+        # Optional time-varying part, added to the constant torque: an expression in t or a sampled table
+        self.signal_type = QComboBox()
+        self.signal_type.addItems(["None", "Expression", "Table"])
+        layout.addWidget(QLabel("Time-varying torque:"))
+        layout.addWidget(self.signal_type)
+        self.expression_input = QLineEdit("sin(2 * pi * t)")
+        layout.addWidget(self.expression_input)
+        table_layout = QHBoxLayout()
+        self.table_button = QPushButton("Load table...")
+        self.table_label = QLabel("No table loaded")
+        self.interpolation = QComboBox()
+        self.interpolation.addItems(INTERPOLATIONS)
+        table_layout.addWidget(self.table_button)
+        table_layout.addWidget(self.table_label)
+        table_layout.addWidget(self.interpolation)
+        layout.addLayout(table_layout)
+        self.table = None
+
         # OK and Cancel buttons
         buttons_layout = QVBoxLayout()
         self.ok_button = QPushButton("OK")
@@ -26,8 +48,53 @@ class LoadDialog(QDialog):
 
         self.setLayout(layout)
 
+        self.signal_type.currentTextChanged.connect(self.update_signal_inputs)
+        self.table_button.clicked.connect(self.load_table)
         self.ok_button.clicked.connect(self.accept)
         self.cancel_button.clicked.connect(self.reject)
+        self.update_signal_inputs(self.signal_type.currentText())
+
+    def update_signal_inputs(self, kind):
+        self.expression_input.setEnabled(kind == "Expression")
+        for widget in (self.table_button, self.table_label, self.interpolation):
+            widget.setEnabled(kind == "Table")
+
+    def load_table(self):
+        # Two columns (time, torque), comma or whitespace separated
+        path, _ = QFileDialog.getOpenFileName(self, "Load Torque Table", "", "Tables (*.csv *.txt *.npy)")
+        if not path:
+            return
+        try:
+            table = np.load(path) if path.endswith('.npy') else np.loadtxt(
+                path, delimiter=',' if path.endswith('.csv') else None)
+            if table.ndim != 2 or table.shape[1] != 2:
+                raise ValueError("expected two columns (time, torque)")
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Load Table Failed", str(e))
+            return
+        self.table = table
+        self.table_label.setText(f"{len(table)} samples")
+
+    def accept(self):
+        # Build the signal here so that invalid input keeps the dialog open
+        try:
+            float(self.torque_input.text())
+            kind = self.signal_type.currentText()
+            if kind == "Expression":
+                self.signal = ExpressionSignal(self.expression_input.text())
+            elif kind == "Table":
+                if self.table is None:
+                    raise ValueError("No table loaded.")
+                self.signal = TabulatedSignal(self.table[:, 0], self.table[:, 1], self.interpolation.currentText())
+            else:
+                self.signal = None
+        except ValueError as e:
+            QMessageBox.critical(self, "Invalid Load", str(e))
+            return
+        super().accept()
 
     def get_torque(self):
         return float(self.torque_input.text())
+
+    def get_signal(self):
+        return self.signal
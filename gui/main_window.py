@@ -1,7 +1,16 @@
-from PySide6.QtWidgets import QMainWindow, QPushButton, QGraphicsView, QVBoxLayout, QWidget, QToolBar, QStatusBar
-from PySide6.QtCore import Qt
+import threading
+from PySide6.QtWidgets import QMainWindow, QPushButton, QGraphicsView, QVBoxLayout, QWidget, QToolBar, QStatusBar, QDockWidget, QFileDialog, QLabel, QPlainTextEdit
+from PySide6.QtCore import Qt, QThread, QTimer
+from PySide6.QtGui import QFontDatabase
 from visualization.workspace import Workspace
 
+# Modules the first simulation needs; imported on a background thread once the window is up
+PREWARM_MODULES = ('scipy.integrate', 'scipy.linalg', 'sympy.physics.mechanics', 'networkx', 'dynamics.simulation')
+# Modal results of linearized runs: frequencies listed in the status bar, and modes/bodies listed in the report
+STATUS_FREQUENCIES = 4
+REPORT_MODES = 8
+REPORT_BODIES = 50
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -13,15 +22,24 @@ class MainWindow(QMainWindow):
         self.addToolBar(toolbar)
 
         # Add buttons
+        self.open_button = QPushButton("Open")
+        self.save_button = QPushButton("Save")
         self.body_button = QPushButton("Body")
         self.joint_button = QPushButton("Joint")
         self.load_button = QPushButton("Load")
+        self.select_button = QPushButton("Select")
         self.run_button = QPushButton("Run")
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
 
+        toolbar.addWidget(self.open_button)
+        toolbar.addWidget(self.save_button)
         toolbar.addWidget(self.body_button)
         toolbar.addWidget(self.joint_button)
         toolbar.addWidget(self.load_button)
+        toolbar.addWidget(self.select_button)
         toolbar.addWidget(self.run_button)
+        toolbar.addWidget(self.cancel_button)
 
         # Initialize workspace
         self.workspace = Workspace()
@@ -32,25 +50,251 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Select a mode to begin.")
 
+        # Live plot of the running simulation (pyqtgraph is loaded on first use or by prewarm)
+        self.plotter = None
+        self.plot_dock = QDockWidget("Simulation Results", self)
+        self.plot_dock.setWidget(QLabel("No simulation results yet."))
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.plot_dock)
+
+        # Animated playback of the last finished run (created on first use)
+        self.playback = None
+        self.playback_dock = None
+
+        # Stage timings, solver counters and profiler output of the last run (tabbed with the plot, created on first use)
+        self.report_view = None
+        self.report_dock = None
+        self.modal_report = None
+
+        # Background simulation state
+        self.simulation_thread = None
+        self.simulation_worker = None
+
         # Connect signals
+        self.open_button.clicked.connect(self.open_model)
+        self.save_button.clicked.connect(self.save_model)
         self.body_button.clicked.connect(lambda: self.workspace.set_mode('body'))
         self.joint_button.clicked.connect(lambda: self.workspace.set_mode('joint'))
         self.load_button.clicked.connect(lambda: self.workspace.set_mode('load'))
+        self.select_button.clicked.connect(lambda: self.workspace.set_mode('select'))
         self.run_button.clicked.connect(self.run_simulation)
+        self.cancel_button.clicked.connect(self.cancel_simulation)
 
         # Connect Workspace signals to status bar
         self.workspace.status_message.connect(self.update_status_bar)
 
+    def prewarm(self):
+        # Called after the window is shown: import the heavy numerical stack off the GUI thread,
+        # then build the plot widget once the event loop is idle
+        threading.Thread(target=_import_modules, args=(PREWARM_MODULES,), name='prewarm', daemon=True).start()
+        QTimer.singleShot(0, self.ensure_plotter)
+
+    def ensure_plotter(self):
+        if self.plotter is None:
+            from visualization.plotter import LivePlotter
+            self.plotter = LivePlotter()
+            self.plot_dock.setWidget(self.plotter)
+        return self.plotter
+
+    def ensure_playback(self):
+        if self.playback is None:
+            from visualization.playback import ChainPlayback
+            self.playback = ChainPlayback()
+            self.playback_dock = QDockWidget("Playback", self)
+            self.playback_dock.setWidget(self.playback)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.playback_dock)
+        return self.playback
+
+    def ensure_report(self):
+        if self.report_view is None:
+            self.report_view = QPlainTextEdit()
+            self.report_view.setReadOnly(True)
+            self.report_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+            self.report_dock = QDockWidget("Run Report", self)
+            self.report_dock.setWidget(self.report_view)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.report_dock)
+            self.tabifyDockWidget(self.plot_dock, self.report_dock)
+            self.plot_dock.raise_()
+        return self.report_view
+
     def update_status_bar(self, message):
         self.status_bar.showMessage(message)
 
+    def open_model(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Model", "", "Model Files (*.json *.npz)")
+        if not path:
+            return
+        from dynamics.model import load_model
+        try:
+            self.workspace.load_model(load_model(path))
+        except Exception as e:
+            self.update_status_bar(f"Could not open model: {e}")
+
+    def save_model(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Model", "", "Model JSON (*.json);;Model Archive (*.npz)")
+        if not path:
+            return
+        from dynamics.model import Model, save_model
+        try:
+            model = Model.from_items(self.workspace.bodies, self.workspace.joints, self.workspace.loads)
+            save_model(model, path)
+            self.update_status_bar(f"Model saved to {path}.")
+        except Exception as e:
+            self.update_status_bar(f"Could not save model: {e}")
+
     def run_simulation(self):
+        if self.simulation_thread is not None:
+            self.update_status_bar("A simulation is already running.")
+            return
         # Open simulation settings dialog
         from gui.simulation_settings_dialog import SimulationSettingsDialog
         dialog = SimulationSettingsDialog(self)
         if dialog.exec():
             settings = dialog.get_settings()
-            # Pass settings to simulation module
+            # Pass settings to simulation module (snapshot the model lists so editing does not race the worker)
             from dynamics.simulation import Simulation
-            simulation = Simulation(settings, self.workspace.bodies, self.workspace.joints, self.workspace.loads)
-            simulation.run()
+            from gui.simulation_worker import SimulationWorker
+            try:
+                simulation = Simulation(settings, list(self.workspace.bodies), list(self.workspace.joints),
+                                        list(self.workspace.loads))
+            except Exception as e:
+                self.update_status_bar(f"Could not start simulation: {e}")
+                return
+            self.ensure_plotter().reset(simulation.model.num_bodies, simulation.num_samples())
+
+            # Run derivation and integration off the GUI thread
+            self.simulation_thread = QThread(self)
+            self.simulation_worker = SimulationWorker(simulation)
+            self.simulation_worker.moveToThread(self.simulation_thread)
+            self.simulation_thread.started.connect(self.simulation_worker.run)
+            self.simulation_worker.status.connect(self.update_status_bar)
+            self.simulation_worker.stage.connect(self.on_simulation_stage)
+            self.simulation_worker.metrics.connect(self.on_simulation_metrics)
+            self.simulation_worker.chunk.connect(self.on_simulation_chunk)
+            self.simulation_worker.finished.connect(self.on_simulation_finished)
+            self.simulation_worker.failed.connect(self.on_simulation_failed)
+            self.simulation_worker.cancelled.connect(self.on_simulation_cancelled)
+            self.simulation_thread.finished.connect(self.on_simulation_thread_finished)
+
+            self.run_button.setEnabled(False)
+            self.cancel_button.setEnabled(True)
+            self.simulation_thread.start()
+
+    def cancel_simulation(self):
+        if self.simulation_worker is not None:
+            self.simulation_worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.update_status_bar("Canceling simulation...")
+
+    def on_simulation_chunk(self, t, solution):
+        self.plotter.append(t, solution)
+        duration = self.simulation_worker.simulation.duration
+        self.update_status_bar(f"Integrating: t = {t[-1]:.2f} / {duration:.2f} s")
+
+    def on_simulation_stage(self, name, seconds):
+        # Per-chunk stages would flood the status bar; chunk progress is reported separately
+        if name not in ('integration', 'output', 'checkpoint'):
+            self.update_status_bar(f"{name}: {seconds:.3f} s")
+
+    def on_simulation_metrics(self, metrics):
+        # Per-stage timings, solver counters and the profile (if one was requested) go to the Run Report tab;
+        # the status bar keeps the one-line summary
+        report = metrics.report()
+        if self.modal_report is not None:
+            report = f"{self.modal_report}\n\n{report}"
+            self.modal_report = None
+        self.ensure_report().setPlainText(report)
+
+    def on_simulation_finished(self, t, solution, modes):
+        # The thread must always be told to quit, or no further run can start
+        try:
+            self.show_simulation_results(t, solution, modes)
+        finally:
+            self.simulation_thread.quit()
+
+    def show_simulation_results(self, t, solution, modes):
+        simulation = self.simulation_worker.simulation
+        # Playback needs every joint angle; runs that record a subset of coordinates are plotted only
+        if simulation.record_coordinates is None and len(t):
+            self.ensure_playback().load(t, solution, simulation.model.bodies['length'],
+                                        parents=simulation.tree.parents)
+            self.playback_dock.show()
+        # Linearized runs (modes computed by the worker): natural frequencies in the status bar,
+        # frequencies, damping ratios and mode shapes at the top of the Run Report
+        modal = ''
+        if isinstance(modes, Exception):
+            modal = f"; modal analysis failed: {modes}"
+        elif modes is not None:
+            self.modal_report = _modal_report(modes)
+            frequencies = ', '.join(f'{f:.3f}' for f in modes['frequencies'][:STATUS_FREQUENCIES])
+            more = ', ...' if len(modes['frequencies']) > STATUS_FREQUENCIES else ''
+            modal = f"; natural frequencies {frequencies}{more} Hz" if frequencies else "; no oscillatory modes"
+        if self.simulation_worker.simulation.output_path:
+            self.update_status_bar(f"Simulation finished ({len(t)} samples written to "
+                                   f"{self.simulation_worker.simulation.output_path}{modal}).")
+        elif simulation.result_source is not None:
+            self.update_status_bar(f"Simulation finished ({len(t)} samples from the "
+                                   f"{simulation.result_source} result cache{modal}).")
+        else:
+            counters = simulation.metrics.counters
+            self.update_status_bar(f"Simulation finished ({len(t)} samples, "
+                                   f"{simulation.metrics.stage_time('total'):.2f} s, "
+                                   f"{counters.get('rhs_calls', 0)} RHS calls, {counters.get('steps', 0)} steps"
+                                   f"{modal}; details in Run Report).")
+
+    def on_simulation_failed(self, message):
+        self.update_status_bar(f"Simulation failed: {message}")
+        self.simulation_thread.quit()
+
+    def on_simulation_cancelled(self):
+        simulation = self.simulation_worker.simulation
+        if simulation.checkpoint_path:
+            self.update_status_bar(f"Simulation canceled (checkpoint saved to {simulation.checkpoint_path}).")
+        else:
+            self.update_status_bar("Simulation canceled.")
+        self.simulation_thread.quit()
+
+    def on_simulation_thread_finished(self):
+        self.simulation_worker.deleteLater()
+        self.simulation_thread.deleteLater()
+        self.simulation_worker = None
+        self.simulation_thread = None
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def closeEvent(self, event):
+        # Stop a running simulation before the window (and its thread) is destroyed
+        if self.simulation_thread is not None:
+            self.simulation_worker.cancel()
+            self.simulation_thread.quit()
+            self.simulation_thread.wait()
+        super().closeEvent(event)
+
+
+def _modal_report(modes):
+    # Text table of Simulation.modal_analysis(): one row per mode, then mode shapes (one row per body)
+    frequencies, damping, shapes = modes['frequencies'], modes['damping_ratios'], modes['shapes']
+    lines = ['natural modes (linearized model):', f"  {'mode':>4} {'frequency [Hz]':>15} {'damping ratio':>14}"]
+    for i, (frequency, ratio) in enumerate(zip(frequencies, damping)):
+        lines.append(f"  {i + 1:4d} {frequency:15.4f} {ratio:14.4f}")
+    if not len(frequencies):
+        lines.append('  (no oscillatory modes)')
+        return '\n'.join(lines)
+    num_modes = min(len(frequencies), REPORT_MODES)
+    lines.append('mode shapes (joint angles, largest component = 1):')
+    lines.append(f"  {'body':>4} " + ' '.join(f"{f'mode {k + 1}':>9}" for k in range(num_modes)))
+    for body, row in enumerate(shapes[:REPORT_BODIES, :num_modes]):
+        lines.append(f"  {body + 1:4d} " + ' '.join(f'{value:9.4f}' for value in row))
+    if len(shapes) > REPORT_BODIES or len(frequencies) > num_modes:
+        lines.append(f"  (showing {min(len(shapes), REPORT_BODIES)} of {len(shapes)} bodies and "
+                     f"{num_modes} of {len(frequencies)} modes)")
+    return '\n'.join(lines)
+
+
+def _import_modules(names):
+    import importlib
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            # A missing optional dependency is reported when the simulation actually needs it
+            pass
@@ -1,4 +1,5 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QFormLayout
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QFormLayout, QComboBox,
+                               QCheckBox)
 
 class SimulationSettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -11,6 +12,57 @@ class SimulationSettingsDialog(QDialog):
         self.duration_input = QLineEdit("10.0")
         form_layout.addRow("Time Step:", self.time_step_input)
         form_layout.addRow("Duration:", self.duration_input)
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItems(["symbolic", "articulated"])
+        form_layout.addRow("Engine:", self.engine_combo)
+        self.eom_form_combo = QComboBox()
+        self.eom_form_combo.addItems(["rhs", "mass_matrix"])
+        form_layout.addRow("EOM Form:", self.eom_form_combo)
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItems(["lambdify", "cython"])
+        form_layout.addRow("RHS Backend:", self.backend_combo)
+        self.solver_combo = QComboBox()
+        self.solver_combo.addItems(["odeint", "RK45", "DOP853", "Radau", "BDF", "LSODA"])
+        form_layout.addRow("Solver:", self.solver_combo)
+        # Small-amplitude runs: propagate a model linearized about the hanging equilibrium instead of integrating
+        self.linearization_combo = QComboBox()
+        self.linearization_combo.addItems(["off", "expm", "modal"])
+        form_layout.addRow("Linearization:", self.linearization_combo)
+        # Optional profiler around the whole run; the report appears in the Run Report tab when it finishes
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(["off", "cprofile", "sampling"])
+        form_layout.addRow("Profiler:", self.profile_combo)
+
+        # Optional terminal event: stop once any joint angle reaches this magnitude
+        self.stop_angle_input = QLineEdit("")
+        self.stop_angle_input.setPlaceholderText("No stop condition")
+        form_layout.addRow("Stop Angle (rad):", self.stop_angle_input)
+
+        # Optional contacts: a floor line below the ground joint and collisions between links
+        self.floor_height_input = QLineEdit("")
+        self.floor_height_input.setPlaceholderText("No floor")
+        self.self_collision_checkbox = QCheckBox("Link collisions")
+        form_layout.addRow("Floor Height:", self.floor_height_input)
+        form_layout.addRow("", self.self_collision_checkbox)
+
+        # Optional streamed output file (.npy memory map or .h5) and its decimation
+        self.output_path_input = QLineEdit("")
+        self.output_path_input.setPlaceholderText("Keep results in memory")
+        self.decimation_input = QLineEdit("1")
+        form_layout.addRow("Output File:", self.output_path_input)
+        form_layout.addRow("Output Decimation:", self.decimation_input)
+
+        # Optional checkpoint file written once a minute (and on cancel), and whether to continue from it
+        self.checkpoint_path_input = QLineEdit("")
+        self.checkpoint_path_input.setPlaceholderText("No checkpoints")
+        self.resume_checkbox = QCheckBox("Resume from checkpoint")
+        form_layout.addRow("Checkpoint File:", self.checkpoint_path_input)
+        form_layout.addRow("", self.resume_checkbox)
+
+        # Re-running an unchanged model with the same settings reuses the stored trajectory
+        self.result_cache_checkbox = QCheckBox("Reuse cached results")
+        self.result_cache_checkbox.setChecked(True)
+        form_layout.addRow("", self.result_cache_checkbox)
 
         layout.addLayout(form_layout)
 
@@ -30,4 +82,27 @@ class SimulationSettingsDialog(QDialog):
     def get_settings(self):
         time_step = float(self.time_step_input.text())
         duration = float(self.duration_input.text())
-        return {'time_step': time_step, 'duration': duration}
+        engine = self.engine_combo.currentText()
+        eom_form = self.eom_form_combo.currentText()
+        backend = self.backend_combo.currentText()
+        output_path = self.output_path_input.text().strip()
+        decimation = int(self.decimation_input.text())
+        solver = self.solver_combo.currentText()
+        stop_angle = self.stop_angle_input.text().strip()
+        stop_angle = float(stop_angle) if stop_angle else None
+        floor_height = self.floor_height_input.text().strip()
+        floor_height = float(floor_height) if floor_height else None
+        self_collision = self.self_collision_checkbox.isChecked()
+        profile = self.profile_combo.currentText()
+        profile = None if profile == 'off' else profile
+        linearization = self.linearization_combo.currentText()
+        linearization = None if linearization == 'off' else linearization
+        checkpoint_path = self.checkpoint_path_input.text().strip()
+        resume = self.resume_checkbox.isChecked() and bool(checkpoint_path)
+        result_cache = self.result_cache_checkbox.isChecked()
+        return {'time_step': time_step, 'duration': duration, 'engine': engine,
+                'eom_form': eom_form, 'backend': backend,
+                'output_path': output_path, 'decimation': decimation,
+                'solver': solver, 'stop_angle': stop_angle, 'profile': profile,
+                'checkpoint_path': checkpoint_path, 'resume': resume, 'linearization': linearization,
+                'result_cache': result_cache, 'floor_height': floor_height, 'self_collision': self_collision}
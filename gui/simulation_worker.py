@@ -0,0 +1,55 @@
+import threading
+import traceback
+from PySide6.QtCore import QObject, Signal, Slot
+from dynamics.simulation import SimulationCancelled
+
+
+class SimulationWorker(QObject):
+    # QThread에서 Simulation.solve를 실행하고 진행 상황을 시그널로 전달.
+    # stage(이름, 초)는 단계가 끝날 때마다, metrics(SimulationMetrics)는 실행이 끝나면 (실패/취소 포함) 한 번.
+    # finished(t, solution, modes): modes는 선형화 실행의 modal_analysis() 결과 (실패하면 그 예외, 아니면 None).
+    # 결과 캐시에서 온 실행은 선형 모델을 다시 만들어야 하므로 GUI 스레드가 아니라 여기서 계산한다
+    status = Signal(str)
+    stage = Signal(str, float)
+    metrics = Signal(object)
+    chunk = Signal(object, object)
+    finished = Signal(object, object, object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, simulation):
+        super().__init__()
+        self.simulation = simulation
+        self.cancel_event = threading.Event()
+        simulation.metrics.listeners.append(self.stage.emit)
+
+    @Slot()
+    def run(self):
+        try:
+            self._run()
+        finally:
+            self.metrics.emit(self.simulation.metrics)
+
+    def _run(self):
+        try:
+            t, solution = self.simulation.solve(on_chunk=self.chunk.emit, on_status=self.status.emit,
+                                                cancel_event=self.cancel_event)
+        except SimulationCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+            return
+        modes = None
+        if self.simulation.linearization is not None:
+            try:
+                modes = self.simulation.modal_analysis()
+            except Exception as e:
+                traceback.print_exc()
+                modes = e
+        self.finished.emit(t, solution, modes)
+
+    def cancel(self):
+        # 스레드 안전: 적분기는 다음 우변 평가에서 이 플래그를 확인한다
+        self.cancel_event.set()
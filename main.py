@@ -1,11 +1,16 @@
+import os
 import sys
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
 from gui.main_window import MainWindow
 
 def main():
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    # Load SymPy/SciPy and the plot widget in the background after the first paint (MBD_PREWARM=0 disables)
+    if os.environ.get('MBD_PREWARM', '1') != '0':
+        QTimer.singleShot(0, window.prewarm)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
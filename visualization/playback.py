@@ -0,0 +1,115 @@
+import time
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QLabel
+
+from dynamics.kinematics import chain_points, frame_indices, tree_segments
+
+DISPLAY_FPS = 60.0
+# 바디가 이보다 많으면 조인트 심볼을 그리지 않는다 (선 하나만 갱신)
+MAX_SYMBOL_BODIES = 50
+
+
+class ChainPlayback(QWidget):
+    # 시뮬레이션 결과로 체인을 애니메이션한다.
+    # 화면 주사율에 맞춰 솎아낸 프레임의 링크 끝점을 load()에서 한 번에 계산해 두고,
+    # 재생 중에는 미리 계산된 (n + 1, 2) 배열 하나를 곡선에 넘기기만 한다.
+    # 가지가 있는 트리는 바디마다 (시작점, 끝점) 쌍을 선분으로 그린다.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.view = pg.PlotWidget()
+        self.view.setAspectLocked(True)
+        self.view.showGrid(x=True, y=True)
+        self.chain_curve = self.view.plot(pen=pg.mkPen('w', width=2))
+
+        self.play_button = QPushButton("Play")
+        self.slider = QSlider(Qt.Horizontal)
+        self.time_label = QLabel("t = 0.00 s")
+        controls = QHBoxLayout()
+        controls.addWidget(self.play_button)
+        controls.addWidget(self.slider)
+        controls.addWidget(self.time_label)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.view)
+        layout.addLayout(controls)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(1000 / DISPLAY_FPS))
+        self.timer.timeout.connect(self.advance)
+        self.play_button.clicked.connect(self.toggle)
+        self.slider.valueChanged.connect(self.show_frame)
+        # 슬라이더를 잡으면 재생을 멈추고 그 위치부터 탐색
+        self.slider.sliderPressed.connect(self.stop)
+
+        self.fps = DISPLAY_FPS
+        self.times = np.zeros(0)
+        self.points = np.zeros((0, 1, 2), dtype=np.float32)
+        self.segments = None
+        self._play_origin = (0.0, 0)
+
+    def load(self, t, solution, lengths, fps=DISPLAY_FPS, speed=1.0, parents=None):
+        # t, solution은 메모리 배열, 메모리 맵 또는 h5py 데이터셋. 필요한 행만 읽는다.
+        # parents: 트리의 부모 배열 (생략하면 직렬 체인)
+        self.stop()
+        self.fps = fps
+        num_bodies = len(lengths)
+        indices = frame_indices(t, fps, speed)
+        self.times = np.asarray(t[indices], dtype=float)
+        self.points = chain_points(np.asarray(solution[indices])[:, :num_bodies], lengths, parents=parents)
+        serial = parents is None or np.array_equal(parents, np.arange(-1, num_bodies - 1))
+        self.segments = None if serial else tree_segments(parents)
+
+        if num_bodies <= MAX_SYMBOL_BODIES:
+            self.chain_curve.setSymbol('o')
+            self.chain_curve.setSymbolSize(6)
+        else:
+            self.chain_curve.setSymbol(None)
+        # 체인이 닿을 수 있는 범위로 축을 고정 (재생 중 자동 범위 계산 비용 제거)
+        reach = float(np.sum(np.abs(lengths))) or 1.0
+        self.view.disableAutoRange()
+        self.view.setRange(xRange=(-reach, reach), yRange=(-reach, reach), padding=0.05)
+
+        self.slider.blockSignals(True)
+        self.slider.setRange(0, max(len(self.times) - 1, 0))
+        self.slider.setValue(0)
+        self.slider.blockSignals(False)
+        if len(self.times):
+            self.show_frame(0)
+
+    def show_frame(self, index):
+        frame = self.points[index]
+        if self.segments is None:
+            self.chain_curve.setData(frame[:, 0], frame[:, 1])
+        else:
+            frame = frame[self.segments]
+            self.chain_curve.setData(frame[:, 0], frame[:, 1], connect='pairs')
+        self.time_label.setText(f"t = {self.times[index]:.2f} s")
+
+    def toggle(self):
+        if self.timer.isActive():
+            self.stop()
+        else:
+            self.play()
+
+    def play(self):
+        if not len(self.times):
+            return
+        if self.slider.value() >= len(self.times) - 1:
+            self.slider.setValue(0)
+        self._play_origin = (time.perf_counter(), self.slider.value())
+        self.timer.start()
+        self.play_button.setText("Pause")
+
+    def stop(self):
+        self.timer.stop()
+        self.play_button.setText("Play")
+
+    def advance(self):
+        # 벽시계 기준으로 프레임을 고르므로 그리기가 밀려도 재생 속도는 유지된다
+        start_time, start_frame = self._play_origin
+        index = start_frame + int((time.perf_counter() - start_time) * self.fps)
+        if index >= len(self.times) - 1:
+            index = len(self.times) - 1
+            self.stop()
+        self.slider.setValue(index)
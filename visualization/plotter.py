@@ -0,0 +1,48 @@
+import numpy as np
+import pyqtgraph as pg
+
+# 링크가 많은 체인에서도 GUI가 느려지지 않도록 그리는 좌표 수를 제한
+MAX_CURVES = 20
+# 긴 시뮬레이션에서도 메모리가 일정하도록 곡선당 최대 점 수 (초과 시 균등 간격으로 솎아냄)
+MAX_POINTS = 10000
+
+
+class LivePlotter(pg.PlotWidget):
+    # 시뮬레이션 중 전달되는 부분 궤적을 누적해 일반화 좌표를 그린다
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setLabel('bottom', '시간 (초)')
+        self.setLabel('left', '일반화 좌표 (라디안)')
+        self.showGrid(x=True, y=True)
+        self.addLegend()
+        self.curves = []
+        self.t = np.empty(0)
+        self.values = np.empty((0, 0))
+        self.count = 0
+        self.stride = 1
+        self.samples_seen = 0
+
+    def reset(self, num_coordinates, num_samples):
+        self.clear()
+        self.curves = [self.plot(pen=pg.intColor(i, hues=max(num_coordinates, 1)), name=f'θ{i+1}')
+                       for i in range(min(num_coordinates, MAX_CURVES))]
+        self.stride = max(1, -(-num_samples // MAX_POINTS))
+        num_points = -(-num_samples // self.stride)
+        self.t = np.empty(num_points)
+        self.values = np.empty((num_points, len(self.curves)))
+        self.count = 0
+        self.samples_seen = 0
+
+    def append(self, t, solution):
+        # 전체 샘플 번호가 stride의 배수인 행만 보관
+        first = (-self.samples_seen) % self.stride
+        self.samples_seen += len(t)
+        t = t[first::self.stride]
+        solution = solution[first::self.stride]
+        stop = min(self.count + len(t), len(self.t))
+        size = stop - self.count
+        self.t[self.count:stop] = t[:size]
+        self.values[self.count:stop] = solution[:size, :len(self.curves)]
+        self.count = stop
+        for i, curve in enumerate(self.curves):
+            curve.setData(self.t[:self.count], self.values[:self.count, i])
@@ -0,0 +1,63 @@
+import math
+
+
+class SpatialGrid:
+    # Uniform hash grid over 2D points (body centers, joint positions) for picking in large scenes.
+    # Insert/remove are O(1); nearest() and query_rect() only visit the cells the query overlaps.
+    # Objects are tracked by identity, so unhashable dataclasses (Body, Joint) can be stored.
+    def __init__(self, cell_size=50.0):
+        self.cell_size = float(cell_size)
+        self.cells = {}      # (i, j) -> {id(obj): (obj, x, y)}
+        self.positions = {}  # id(obj) -> cell
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, obj):
+        return id(obj) in self.positions
+
+    def cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, obj, x, y):
+        if id(obj) in self.positions:
+            self.remove(obj)
+        cell = self.cell(x, y)
+        self.cells.setdefault(cell, {})[id(obj)] = (obj, x, y)
+        self.positions[id(obj)] = cell
+
+    def remove(self, obj):
+        cell = self.positions.pop(id(obj))
+        bucket = self.cells[cell]
+        del bucket[id(obj)]
+        if not bucket:
+            del self.cells[cell]
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+
+    def nearest(self, x, y, radius):
+        # Closest object within radius of (x, y), or None
+        best, best_distance = None, radius * radius
+        for bucket in self._buckets(x - radius, y - radius, x + radius, y + radius):
+            for obj, px, py in bucket.values():
+                distance = (px - x)**2 + (py - y)**2
+                if distance < best_distance:
+                    best, best_distance = obj, distance
+        return best
+
+    def query_rect(self, x1, y1, x2, y2):
+        # All objects whose point lies inside the axis-aligned rectangle
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        return [obj for bucket in self._buckets(x1, y1, x2, y2)
+                for obj, px, py in bucket.values() if x1 <= px <= x2 and y1 <= py <= y2]
+
+    def _buckets(self, x1, y1, x2, y2):
+        i1, j1 = self.cell(x1, y1)
+        i2, j2 = self.cell(x2, y2)
+        # Large regions: walking the occupied cells is cheaper than walking every covered cell
+        if (i2 - i1 + 1) * (j2 - j1 + 1) > len(self.cells):
+            return [bucket for (i, j), bucket in self.cells.items() if i1 <= i <= i2 and j1 <= j <= j2]
+        return [self.cells[i, j] for i in range(i1, i2 + 1) for j in range(j1, j2 + 1) if (i, j) in self.cells]
@@ -1,10 +1,24 @@
-from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsEllipseItem
-from PySide6.QtCore import Qt, QPointF, Signal
-from PySide6.QtGui import QPen, QBrush
+import math
+from contextlib import contextmanager
+from PySide6.QtWidgets import QApplication, QGraphicsView, QGraphicsScene, QGraphicsEllipseItem, QMenu
+from PySide6.QtCore import Qt, QPointF, QRectF, Signal, QEventLoop
+from PySide6.QtGui import QPen, QBrush, QPainterPath, QPolygonF
 from dataclasses import dataclass
 from dynamics.body import Body
 from dynamics.joint import Joint
 from dynamics.load import Load
+from visualization.spatial_index import SpatialGrid
+
+# Bulk loads create scene items this many bodies at a time; each batch becomes one item group
+# (consecutive links are close together, so the scene index can cull whole batches)
+LOAD_BATCH_SIZE = 1000
+# Target number of items per BSP leaf when the scene index is rebuilt after a bulk load
+ITEMS_PER_BSP_LEAF = 16
+# Level of detail: below this view scale, models with at least LOD_MIN_BODIES bodies hide
+# their markers and draw every link as part of one merged path item
+LOD_SCALE = 0.5
+LOD_MIN_BODIES = 500
+ZOOM_STEP = 1.15
 
 
 @dataclass
@@ -20,13 +34,65 @@ class Workspace(QGraphicsView):
         super().__init__()
         self.scene = QGraphicsScene()
         self.setScene(self.scene)
-        self.current_mode = None  # 'body', 'joint', 'load'
+        self.current_mode = None  # 'body', 'joint', 'load', 'select'
         self.temp_points = []
-        self.bodies = []
-        self.joints = []
-        self.loads = []
+        # Model objects keyed by id() (insertion ordered) so removal is O(1); bodies/joints/loads are list views
+        self.body_items = {}  # id(BodyItem) -> BodyItem
+        self.joint_items = {}  # id(Joint) -> Joint
+        self.joint_loads = {}  # id(Joint) -> Load (one load per joint)
         self.selected_bodies_for_joint = []
         self.selected_joint_for_load = None
+        self.temp_markers = []
+        # Spatial indexes over body centers and joint positions, and graphics item -> model object
+        self.body_index = SpatialGrid()
+        self.joint_index = SpatialGrid()
+        self.item_owners = {}
+        self.body_joints = {}  # id(Body) -> {id(Joint): Joint} attached to it
+        self.body_markers = {}  # id(BodyItem) -> center marker
+        # Shared pens and brushes (one allocation per scene instead of one per item)
+        self.link_pen = QPen(Qt.black)
+        self.body_marker_pen, self.body_marker_brush = QPen(Qt.blue), QBrush(Qt.blue)
+        self.joint_marker_pen, self.joint_marker_brush = QPen(Qt.darkGreen), QBrush(Qt.darkGreen)
+        self.load_brush = QBrush(Qt.red)
+        # Markers and links are kept in item groups so level of detail can hide them with a few calls
+        self.detail_groups = {}  # group -> number of items still in it
+        self.item_groups = {}  # marker or link -> its group
+        # Zoomed-out view of large models: one path with every link, built lazily when the model changes
+        self.overview_mode = False
+        self.overview_item = None
+        self.overview_dirty = True
+        self.batch_edits = 0
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        # Select mode: click or drag a rectangle, then Delete (or the context menu) removes the selection
+        self.selection = {}  # id(owner) -> (BodyItem or Joint, highlight marker)
+        self.rubber_band_rect = None
+        self.rubberBandChanged.connect(self.on_rubber_band_changed)
+
+    @property
+    def bodies(self):
+        return list(self.body_items.values())
+
+    @bodies.setter
+    def bodies(self, body_items):
+        self.body_items = {id(body_item): body_item for body_item in body_items}
+
+    @property
+    def joints(self):
+        return list(self.joint_items.values())
+
+    @joints.setter
+    def joints(self, joints):
+        self.joint_items = {id(joint): joint for joint in joints}
+
+    @property
+    def loads(self):
+        return list(self.joint_loads.values())
+
+    @loads.setter
+    def loads(self, loads):
+        self.joint_loads = {id(load.joint): load for load in loads}
 
     def create_body_mode(self):
         self.current_mode = 'body'
@@ -45,19 +111,53 @@ class Workspace(QGraphicsView):
         if self.current_mode == 'body':
             self.temp_points.append(pos)
             # Draw temporary points
-            self.scene.addEllipse(pos.x() - 5, pos.y() - 5, 10, 10, QPen(Qt.black), QBrush(Qt.red))
+            self.temp_markers.append(
+                self.scene.addEllipse(pos.x() - 5, pos.y() - 5, 10, 10, QPen(Qt.black), QBrush(Qt.red)))
             if len(self.temp_points) == 2:
                 self.create_body(self.temp_points[0], self.temp_points[1])
                 self.temp_points = []
+                self.temp_markers = []
             else:
                 self.status_message.emit("Body Mode: Click the second point to complete the body.")
         elif self.current_mode == 'joint':
             self.select_bodies_for_joint(pos)
         elif self.current_mode == 'load':
             self.select_joint_for_load(pos)
+        elif self.current_mode == 'select':
+            if not event.modifiers() & Qt.ShiftModifier:
+                self.clear_selection()
+            owner = self.pick(pos)
+            if owner is not None:
+                self.select([owner])
+            # Starts the rubber band
+            super().mousePressEvent(event)
         else:
             super().mousePressEvent(event)
 
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Delete, Qt.Key_Backspace) and self.selection:
+            self.delete_selection()
+        elif event.key() == Qt.Key_Escape and self.selection:
+            self.clear_selection()
+            self.status_message.emit("Selection cleared.")
+        else:
+            super().keyPressEvent(event)
+
+    def contextMenuEvent(self, event):
+        # Delete the selection, or the body/joint under the cursor when nothing is selected
+        item = self.itemAt(event.pos())
+        if not self.selection and self.owner_of(item) is None:
+            super().contextMenuEvent(event)
+            return
+        menu = QMenu(self)
+        delete_action = menu.addAction("Delete Selection" if self.selection else "Delete")
+        if menu.exec(event.globalPos()) is delete_action:
+            if self.selection:
+                self.delete_selection()
+            else:
+                self.remove_item(item)
+                self.status_message.emit("Item deleted.")
+
 
     def create_body(self, point1, point2):
         # Calculate center
@@ -66,7 +166,7 @@ class Workspace(QGraphicsView):
         center = QPointF(center_x, center_y)
 
         # Add center marker
-        marker = self.scene.addEllipse(center_x - 3, center_y - 3, 6, 6, QPen(Qt.blue), QBrush(Qt.blue))
+        marker = self.scene.addEllipse(center_x - 3, center_y - 3, 6, 6, self.body_marker_pen, self.body_marker_brush)
 
         # Open dialog to input mass and inertia
         from gui.body_dialog import BodyDialog
@@ -76,58 +176,28 @@ class Workspace(QGraphicsView):
             # Create Body object
             body = Body(point1, point2, center, mass, inertia)
             # Create graphical representation
-            line = self.scene.addLine(point1.x(), point1.y(), point2.x(), point2.y(), QPen(Qt.black))
+            line = self.scene.addLine(point1.x(), point1.y(), point2.x(), point2.y(), self.link_pen)
             body_item = BodyItem(body, line)
-            self.bodies.append(body_item)
-            # Optionally, store marker
+            self.body_items[id(body_item)] = body_item
+            self.register_body(body_item, marker)
+            self.add_detail_group([line, marker])
+            self.model_changed()
             self.status_message.emit("Body created successfully. You can create more bodies or switch modes.")
         else:
             # If canceled, remove temporary points and marker
             self.scene.removeItem(marker)
             # Remove the two temporary points
-            for item in self.scene.items():
-                if isinstance(item, QGraphicsEllipseItem) and item.rect().width() == 10:
-                    self.scene.removeItem(item)
+            for item in self.temp_markers:
+                self.scene.removeItem(item)
+            self.temp_markers = []
             self.status_message.emit("Body creation canceled.")
 
 
     def select_bodies_for_joint(self, pos):
         # Determine if click is near any body center
-        clicked_body = None
         threshold = 10  # pixels
-        for body_item in self.bodies:
-            if self.distance(body_item.body.center, pos) < threshold:
-                clicked_body = body_item.body
-                break
-        if clicked_body and clicked_body not in self.selected_bodies_for_joint:
-            self.selected_bodies_for_joint.append(clicked_body)
-            # Highlight selected body
-            marker = self.scene.addEllipse(
-                clicked_body.center.x() - 6, clicked_body.center.y() - 6, 12, 12,
-                QPen(Qt.green), QBrush(Qt.NoBrush)
-            )
-            clicked_body.selection_marker = marker
-            if len(self.selected_bodies_for_joint) == 2:
-                # Create joint between the two bodies
-                self.create_joint(self.selected_bodies_for_joint[0], self.selected_bodies_for_joint[1])
-                # Clear selections
-                self.clear_joint_selection()
-                self.status_message.emit("Joint created successfully.")
-            else:
-                self.status_message.emit("Joint Mode: Select another body to create a joint.")
-        else:
-            self.status_message.emit("Joint Mode: Click near a body center to select.")
-
-
-
-    def select_bodies_for_joint(self, pos):
-        # Determine if click is near any body center
-        clicked_body = None
-        threshold = 10  # pixels
-        for body_item in self.bodies:
-            if self.distance(body_item.body.center, pos) < threshold:
-                clicked_body = body_item.body
-                break
+        body_item = self.body_index.nearest(pos.x(), pos.y(), threshold)
+        clicked_body = body_item.body if body_item is not None else None
         if clicked_body and clicked_body not in self.selected_bodies_for_joint:
             self.selected_bodies_for_joint.append(clicked_body)
             # Highlight selected body
@@ -164,15 +234,15 @@ class Workspace(QGraphicsView):
         if dialog.exec():
             joint_position = dialog.get_joint_position()
             joint_type = dialog.get_joint_type()
+            lower_limit, upper_limit = dialog.get_joint_limits()
             # Create Joint object
-            joint = Joint(body1, body2, joint_position, joint_type)
-            self.joints.append(joint)
+            joint = Joint(body1, body2, joint_position, joint_type,
+                          lower_limit=lower_limit, upper_limit=upper_limit)
+            self.joint_items[id(joint)] = joint
             # Draw joint on workspace
-            joint_marker = self.scene.addEllipse(
-                joint_position.x() - 3, joint_position.y() - 3, 6, 6,
-                QPen(Qt.darkGreen), QBrush(Qt.darkGreen)
-            )
-            joint.graphics = joint_marker
+            joint.graphics = self.add_joint_marker(joint)
+            self.register_joint(joint)
+            self.add_detail_group([joint.graphics])
             self.status_message.emit("Joint successfully created.")
         else:
             # User cancelled joint creation
@@ -189,20 +259,17 @@ class Workspace(QGraphicsView):
 
     def select_joint_for_load(self, pos):
         # Determine if click is near any joint
-        clicked_joint = None
         threshold = 10  # pixels
-        for joint in self.joints:
-            if self.distance(joint.position, pos) < threshold:
-                clicked_joint = joint
-                break
+        clicked_joint = self.joint_index.nearest(pos.x(), pos.y(), threshold)
         if clicked_joint:
             # Open LoadDialog to specify torque
             from gui.load_dialog import LoadDialog
             dialog = LoadDialog(clicked_joint)
             if dialog.exec():
                 torque = dialog.get_torque()
-                # Apply torque to joint
+                # Apply torque to joint (one load per joint; a new load replaces the previous one)
                 clicked_joint.torque = torque
+                self.joint_loads[id(clicked_joint)] = Load(clicked_joint, torque, dialog.get_signal())
                 # Visualize the load
                 self.visualize_load_on_joint(clicked_joint)
                 self.status_message.emit(f"Applied torque of {torque} Nm to the selected joint.")
@@ -213,20 +280,294 @@ class Workspace(QGraphicsView):
 
     def visualize_load_on_joint(self, joint):
         # Change the joint marker color to indicate a load is applied
-        joint.graphics.setBrush(QBrush(Qt.red))
+        joint.graphics.setBrush(self.load_brush)
         self.status_message.emit("Load visualized on the joint.")
 
 
 
+    def load_model(self, model):
+        # Replace the current scene with the bodies, joints and loads of a dynamics.model.Model
+        self.scene.clear()
+        self.overview_item = None
+        self.overview_mode = False
+        self.detail_groups = {}
+        self.item_groups = {}
+        self.temp_points = []
+        self.temp_markers = []
+        self.selected_bodies_for_joint = []
+        self.selected_joint_for_load = None
+        self.selection = {}
+        self.rubber_band_rect = None
+        self.body_index.clear()
+        self.joint_index.clear()
+        self.item_owners.clear()
+        self.body_joints.clear()
+        self.body_markers.clear()
+        bodies, joints, loads = model.to_items()
+        self.bodies, self.joints, self.loads = bodies, joints, loads
+        total = max(len(bodies), len(joints))
+        with self.bulk_update():
+            for start in range(0, total, LOAD_BATCH_SIZE):
+                stop = start + LOAD_BATCH_SIZE
+                batch = []
+                for body_item in bodies[start:stop]:
+                    body = body_item.body
+                    center = body.center
+                    marker = self.scene.addEllipse(center.x() - 3, center.y() - 3, 6, 6,
+                                                   self.body_marker_pen, self.body_marker_brush)
+                    body_item.graphics = self.scene.addLine(body.point1.x(), body.point1.y(),
+                                                            body.point2.x(), body.point2.y(), self.link_pen)
+                    self.register_body(body_item, marker)
+                    batch += (body_item.graphics, marker)
+                for joint in joints[start:stop]:
+                    joint.graphics = self.add_joint_marker(joint)
+                    if joint.torque or id(joint) in self.joint_loads:
+                        joint.graphics.setBrush(self.load_brush)
+                    self.register_joint(joint)
+                    batch.append(joint.graphics)
+                self.add_detail_group(batch)
+                if stop < total:
+                    # Let the status bar repaint between batches; clicks wait until the model is in place
+                    self.status_message.emit(f"Loading model: {stop} / {total}...")
+                    QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+        self.status_message.emit(f"Loaded model with {len(bodies)} bodies and {len(joints)} joints.")
+
+    @contextmanager
+    def bulk_update(self):
+        # Suspend repaints and scene indexing while many items are added, then build the index once
+        # with a BSP depth sized for the scene (Qt otherwise re-balances the tree as items arrive)
+        self.viewport().setUpdatesEnabled(False)
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        try:
+            yield
+        finally:
+            num_items = 2 * len(self.body_items) + len(self.joint_items)
+            self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+            self.scene.setBspTreeDepth(bsp_tree_depth(num_items))
+            self.overview_dirty = True
+            self.update_level_of_detail()
+            self.viewport().setUpdatesEnabled(True)
+            self.viewport().update()
+
+    def add_joint_marker(self, joint):
+        position = joint.position
+        return self.scene.addEllipse(position.x() - 3, position.y() - 3, 6, 6,
+                                     self.joint_marker_pen, self.joint_marker_brush)
+
+    def add_detail_group(self, items):
+        group = self.scene.createItemGroup(items)
+        group.setVisible(not self.overview_mode)
+        self.detail_groups[group] = len(items)
+        for item in items:
+            self.item_groups[item] = group
+
+    def remove_graphics(self, item):
+        # Take a marker or link out of the scene; its group goes too once the last item has left it
+        group = self.item_groups.pop(item, None)
+        self.scene.removeItem(item)
+        if group is not None:
+            self.detail_groups[group] -= 1
+            if not self.detail_groups[group]:
+                del self.detail_groups[group]
+                self.scene.removeItem(group)
+
+    def wheelEvent(self, event):
+        # Zoom around the cursor, one step per wheel notch
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom(ZOOM_STEP ** steps)
+
+    def zoom(self, factor):
+        self.scale(factor, factor)
+        self.update_level_of_detail()
+
+    def update_level_of_detail(self):
+        # Switch between per-item drawing and the merged overview when the zoom crosses LOD_SCALE
+        overview = len(self.body_items) >= LOD_MIN_BODIES and self.transform().m11() < LOD_SCALE
+        if overview:
+            self.refresh_overview()
+        if overview != self.overview_mode:
+            self.overview_mode = overview
+            self.set_details_visible(not overview)
+            if self.overview_item is not None:
+                self.overview_item.setVisible(overview)
+
+    def refresh_overview(self):
+        if not self.overview_dirty and self.overview_item is not None:
+            return
+        # One open polyline per run of links that share endpoints (a plain chain is a single polyline)
+        path = QPainterPath()
+        run = []
+        for body_item in self.body_items.values():
+            body = body_item.body
+            if not run or run[-1] != body.point1:
+                if len(run) > 1:
+                    path.addPolygon(QPolygonF(run))
+                run = [body.point1]
+            run.append(body.point2)
+        if len(run) > 1:
+            path.addPolygon(QPolygonF(run))
+        if self.overview_item is None:
+            self.overview_item = self.scene.addPath(path, self.link_pen)
+            self.overview_item.setVisible(self.overview_mode)
+        else:
+            self.overview_item.setPath(path)
+        self.overview_dirty = False
+
+    def set_details_visible(self, visible):
+        for group in self.detail_groups:
+            group.setVisible(visible)
+
+    def model_changed(self):
+        # Links were added or removed: rebuild the merged path (once per batch of edits) so it never
+        # shows deleted links, then re-check the level of detail against the new body count
+        self.overview_dirty = True
+        if self.batch_edits:
+            return
+        if self.overview_item is not None:
+            self.refresh_overview()
+        self.update_level_of_detail()
+
+    @contextmanager
+    def batch_edit(self):
+        self.batch_edits += 1
+        try:
+            yield
+        finally:
+            self.batch_edits -= 1
+            if not self.batch_edits and self.overview_dirty:
+                self.model_changed()
+
+    def register_body(self, body_item, marker=None):
+        center = body_item.body.center
+        self.body_index.insert(body_item, center.x(), center.y())
+        self.item_owners[body_item.graphics] = body_item
+        if marker is not None:
+            self.item_owners[marker] = body_item
+            self.body_markers[id(body_item)] = marker
+
+    def register_joint(self, joint):
+        self.joint_index.insert(joint, joint.position.x(), joint.position.y())
+        self.item_owners[joint.graphics] = joint
+        self.body_joints.setdefault(id(joint.body1), {})[id(joint)] = joint
+        self.body_joints.setdefault(id(joint.body2), {})[id(joint)] = joint
+
+    def owner_of(self, graphics_item):
+        # Model object (BodyItem or Joint) drawn by a scene item, or None
+        return self.item_owners.get(graphics_item)
+
+    def items_in_rect(self, rect):
+        # Bodies (by center) and joints (by position) inside a scene-coordinate QRectF
+        corners = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        return self.body_index.query_rect(*corners), self.joint_index.query_rect(*corners)
+
+    def pick(self, pos, threshold=10):
+        # Joint or body (by center) nearest to a scene position, joints first
+        joint = self.joint_index.nearest(pos.x(), pos.y(), threshold)
+        return joint if joint is not None else self.body_index.nearest(pos.x(), pos.y(), threshold)
+
+    def on_rubber_band_changed(self, rect, from_point, to_point):
+        # Qt reports a null rectangle when the drag ends; select what the last rectangle covered
+        if not rect.isNull():
+            self.rubber_band_rect = QRectF(from_point, to_point)
+        elif self.rubber_band_rect is not None:
+            bodies, joints = self.items_in_rect(self.rubber_band_rect)
+            self.rubber_band_rect = None
+            self.select(bodies + joints)
+
+    def select(self, owners):
+        pen, brush = QPen(Qt.green), QBrush(Qt.NoBrush)
+        for owner in owners:
+            if id(owner) in self.selection:
+                continue
+            position = owner.body.center if isinstance(owner, BodyItem) else owner.position
+            marker = self.scene.addEllipse(position.x() - 6, position.y() - 6, 12, 12, pen, brush)
+            self.selection[id(owner)] = (owner, marker)
+        num_bodies = sum(isinstance(owner, BodyItem) for owner, _ in self.selection.values())
+        self.status_message.emit(f"Selected {num_bodies} bodies and {len(self.selection) - num_bodies} joints. "
+                                 "Press Delete to remove them.")
+
+    def deselect(self, owner):
+        entry = self.selection.pop(id(owner), None)
+        if entry is not None:
+            self.scene.removeItem(entry[1])
+
+    def clear_selection(self):
+        for _, marker in self.selection.values():
+            self.scene.removeItem(marker)
+        self.selection = {}
+
+    def delete_selection(self):
+        # Bodies take their attached joints (and loads) with them
+        owners = [owner for owner, _ in self.selection.values()]
+        self.clear_selection()
+        num_bodies, num_joints = len(self.body_items), len(self.joint_items)
+        with self.batch_edit():
+            for owner in owners:
+                if isinstance(owner, BodyItem):
+                    if id(owner) in self.body_items:
+                        self.remove_body(owner)
+                elif id(owner) in self.joint_items:
+                    self.remove_joint(owner)
+        self.status_message.emit(f"Deleted {num_bodies - len(self.body_items)} bodies and "
+                                 f"{num_joints - len(self.joint_items)} joints.")
+
+    def remove_joint(self, joint):
+        self.deselect(joint)
+        self.joint_index.remove(joint)
+        self.item_owners.pop(joint.graphics, None)
+        for body_id in (id(joint.body1), id(joint.body2)):
+            self.body_joints.get(body_id, {}).pop(id(joint), None)
+        self.joint_loads.pop(id(joint), None)
+        del self.joint_items[id(joint)]
+        if joint.graphics is not None:
+            self.remove_graphics(joint.graphics)
+
+    def remove_body(self, body_item):
+        # Removing a body also removes the joints (and their loads) attached to it
+        if any(body is body_item.body for body in self.selected_bodies_for_joint):
+            self.clear_joint_selection()
+        self.deselect(body_item)
+        for joint in list(self.body_joints.pop(id(body_item.body), {}).values()):
+            self.remove_joint(joint)
+        self.body_index.remove(body_item)
+        self.item_owners.pop(body_item.graphics, None)
+        marker = self.body_markers.pop(id(body_item), None)
+        if marker is not None:
+            self.item_owners.pop(marker, None)
+            self.remove_graphics(marker)
+        del self.body_items[id(body_item)]
+        if body_item.graphics is not None:
+            self.remove_graphics(body_item.graphics)
+        self.model_changed()
+
+    def remove_item(self, graphics_item):
+        owner = self.owner_of(graphics_item)
+        if isinstance(owner, BodyItem):
+            self.remove_body(owner)
+        elif owner is not None:
+            self.remove_joint(owner)
+
     def set_mode(self, mode):
         self.current_mode = mode
         self.temp_points = []
+        self.clear_selection()
+        self.setDragMode(QGraphicsView.RubberBandDrag if mode == 'select' else QGraphicsView.NoDrag)
         if mode == 'body':
             self.status_message.emit("Body Mode: Click two points to create a body.")
         elif mode == 'joint':
             self.status_message.emit("Joint Mode: Click on two bodies to create a joint.")
         elif mode == 'load':
             self.status_message.emit("Load Mode: Click on a joint to apply torque.")
+        elif mode == 'select':
+            self.status_message.emit("Select Mode: Click or drag a rectangle to select; press Delete to remove.")
         else:
             self.status_message.emit("Select a mode to begin.")
 
+
+def bsp_tree_depth(num_items):
+    # Small scenes keep Qt's automatic depth; large ones get about ITEMS_PER_BSP_LEAF items per leaf
+    # (each level halves the leaf area, alternating x and y)
+    if num_items < LOD_MIN_BODIES:
+        return 0
+    return min(16, max(1, math.ceil(math.log2(num_items / ITEMS_PER_BSP_LEAF))))